@@ -0,0 +1,54 @@
+"""store mask polygons in config entries
+
+Revision ID: c41d7e93a5f0
+Revises: 6b2e4f1c8a3d
+Create Date: 2026-10-18 09:30:47.208611
+
+"""
+from collections import defaultdict
+from struct import pack
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c41d7e93a5f0'
+down_revision: Union[str, None] = '6b2e4f1c8a3d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('object_analysis_config', sa.Column('mask_polygons', sa.LargeBinary(), nullable=True))
+
+    # each existing mask is a single polygon with one row per vertex. Service inserted vertices one by one
+    # in vertex order, each row in its own transaction, so 'created_at' (transaction start time) records
+    # vertex order. 'ctid' only breaks ties between equal timestamps, rows with the same timestamp are
+    # assumed to be in heap order (order they were inserted in), which holds as rows were never updated.
+    connection = op.get_bind()
+    rows = connection.execute(sa.text(
+        "SELECT object_analysis_config_uuid, pixel_width, pixel_height FROM frame_mask "
+        "ORDER BY object_analysis_config_uuid, created_at, ctid"
+    ))
+    vertices: dict = defaultdict(list)
+    for config_id, pixel_width, pixel_height in rows:
+        vertices[config_id].extend((pixel_width, pixel_height))
+
+    # same layout as 'PolygonListType': little-endian int32 vertex count followed by (width, height) pairs
+    masks = [
+        {"config_id": config_id, "mask_polygons": pack(f"<{len(coordinates) + 1}i", len(coordinates) // 2, *coordinates)}
+        for config_id, coordinates in vertices.items()
+    ]
+    if masks:
+        connection.execute(
+            sa.text("UPDATE object_analysis_config SET mask_polygons = :mask_polygons WHERE uuid = :config_id"),
+            masks
+        )
+
+    op.drop_table('frame_mask')
+
+
+def downgrade() -> None:
+    raise NotImplementedError("Downgrades are not allowed")
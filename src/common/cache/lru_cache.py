@@ -0,0 +1,103 @@
+from collections import OrderedDict
+from time import monotonic
+from typing import Callable, Generic, Hashable, Optional, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class LRUCache(Generic[K, V]):
+    """
+    In-memory cache bounded by total size of entries, least recently used entries are evicted
+    first. Entries optionally expire after time-to-live. Size of an entry is given by 'sizeof'
+    (defaults to 1 per entry, i.e. cache is bounded by number of entries).
+
+    Cache is not thread-safe, it's meant to be used from the event loop.
+    """
+
+    def __init__(self, max_size: int, sizeof: Optional[Callable[[V], int]] = None, ttl: Optional[float] = None):
+        """
+        Initialize LRU cache.
+
+        :param max_size: maximum total size of entries
+        :type max_size: int
+        :param sizeof: function returning size of an entry, defaults to 1 per entry
+        :type sizeof: Optional[Callable[[V], int]], optional
+        :param ttl: seconds after which entry expires, defaults to never
+        :type ttl: Optional[float], optional
+        """
+        if max_size < 0:
+            raise ValueError("max_size_must_not_be_negative")
+
+        self._max_size = max_size
+        self._sizeof = sizeof or (lambda _: 1)
+        self._ttl = ttl
+        self._entries: OrderedDict[K, tuple[V, int, float]] = OrderedDict()
+        self._size = 0
+
+        # metrics
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def get(self, key: K) -> Optional[V]:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        value, _, expires_at = entry
+        if expires_at < monotonic():
+            self._remove(key)
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key: K, value: V) -> None:
+        if key in self._entries:
+            self._remove(key)
+
+        size = self._sizeof(value)
+        if size > self._max_size:
+            # entry would evict everything else and still not fit
+            return
+
+        expires_at = monotonic() + self._ttl if self._ttl is not None else float("inf")
+        self._entries[key] = (value, size, expires_at)
+        self._size += size
+
+        while self._size > self._max_size:
+            oldest_key = next(iter(self._entries))
+            self._remove(oldest_key)
+            self.evictions += 1
+
+    def invalidate(self, key: K) -> None:
+        if key in self._entries:
+            self._remove(key)
+
+    def invalidate_where(self, predicate: Callable[[K], bool]) -> None:
+        for key in [key for key in self._entries if predicate(key)]:
+            self._remove(key)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._size = 0
+
+    def _remove(self, key: K) -> None:
+        _, size, _ = self._entries.pop(key)
+        self._size -= size
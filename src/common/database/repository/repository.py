@@ -136,6 +136,18 @@ class Repository(ABC, Generic[T]):
 
         return await self.get_one(result)
 
+    @staticmethod
+    async def _insert_many(session: AsyncSession, db_model: Type[Base], values: Sequence[Dict[str, Any]]) -> Sequence[Any]:
+        """
+        Insert rows of any model within a session, so that subclasses can write several tables
+        in a single transaction. Transaction is not committed.
+        """
+        scalars = await session.scalars(
+            insert(db_model).returning(db_model, sort_by_parameter_order=True),
+            [dict(entity_values) for entity_values in values]
+        )
+        return scalars.all()
+
     def _parse_sql_error(self, exc: IntegrityError) -> None:
         code = str(getattr(exc.orig, "pgcode", ""))
         message = str(getattr(exc.orig, "args", ""))
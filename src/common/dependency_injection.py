@@ -1,6 +1,7 @@
 from typing import Any
 
 from fastapi import Request, params
+from starlette.requests import HTTPConnection
 from starlette import datastructures
 from typing_extensions import Annotated, Doc
 
@@ -26,8 +27,9 @@ def Injects(  # noqa: N802
         ),
     ] = True,
 ) -> Any:
-    def _inject_from_state(request: Request) -> Any:
-        return getattr(request.state, dependency)
+    # HTTP connection covers both HTTP requests and WebSockets
+    def _inject_from_state(connection: HTTPConnection) -> Any:
+        return getattr(connection.state, dependency)
 
     return params.Depends(dependency=_inject_from_state, use_cache=use_cache)
 
@@ -1,4 +1,5 @@
 from uuid import UUID
+from typing import Optional
 from os import environ
 from datetime import datetime, timedelta, timezone
 from hashlib import sha256
@@ -34,12 +35,46 @@ async def authenticate(
     api_key_repository: APIKeyRepository = Injects("api_key_repository"),
     jwt_repository: JWTRepository = Injects("jwt_repository"),
 ) -> UUID:
+    return await authenticate_credentials(
+        scopes=security_scopes.scopes,
+        api_key=api_key,
+        token=token,
+        api_key_repository=api_key_repository,
+        jwt_repository=jwt_repository
+    )
+
+
+async def authenticate_credentials(
+    scopes: list[str],
+    api_key: Optional[str],
+    token: Optional[str],
+    api_key_repository: APIKeyRepository,
+    jwt_repository: JWTRepository,
+) -> UUID:
+    """
+    Resolve account from API key or access token. Used directly where credentials don't come
+    from request headers (e.g. WebSocket streams).
+
+    :param scopes: Scopes required from the credentials, empty list requires none
+    :type scopes: list[str]
+    :param api_key: API key, checked before the access token
+    :type api_key: Optional[str]
+    :param token: Access token (JWT)
+    :type token: Optional[str]
+    :param api_key_repository: Repository of API keys
+    :type api_key_repository: APIKeyRepository
+    :param jwt_repository: Repository of issued access tokens
+    :type jwt_repository: JWTRepository
+    :raises AccountUnAuthorizedException: If credentials are missing, invalid or lack the scopes
+    :return: Authenticated account ID
+    :rtype: UUID
+    """
     if api_key:
         try:
             hashed_key = get_api_key_hash(api_key)
             api_key_entity = await api_key_repository.get_by_hashed_key(hashed_key=hashed_key)
-            if security_scopes.scopes:  # if scopes are required, check if the API key has the required scopes
-                if not api_key_entity.scopes or not any(scope in api_key_entity.scopes.split(";") for scope in security_scopes.scopes):
+            if scopes:  # if scopes are required, check if the API key has the required scopes
+                if not api_key_entity.scopes or not any(scope in api_key_entity.scopes.split(";") for scope in scopes):
                     raise AccountUnAuthorizedException()
             # if scopes are not required, we can use the API key
             return api_key_entity.account_id
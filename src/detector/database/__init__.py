@@ -1,2 +1,2 @@
-from .model import ObjectAnalysisConfig, FrameMask, Object, Account, APIKey, File
-from .repository import BaseRepository, ObjectAnalysisConfigRepository, FrameMaskRepository, ObjectRepository, AccountRepository, APIKeyRepository, JWTRepository, FileRegisterRepository
\ No newline at end of file
+from .model import ObjectAnalysisConfig, Object, Account, APIKey, File
+from .repository import BaseRepository, ObjectAnalysisConfigRepository, AccountRepository, APIKeyRepository, JWTRepository, FileRegisterRepository
\ No newline at end of file
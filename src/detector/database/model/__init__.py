@@ -1,5 +1,4 @@
 from common.database import Base
-from .frame_mask import FrameMask
 from .object import Object
 from .object_analysis_config import ObjectAnalysisConfig
 from .file import File
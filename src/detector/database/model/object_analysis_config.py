@@ -1,8 +1,14 @@
-from sqlalchemy.orm import Mapped, mapped_column
+from typing import Optional
+from sqlalchemy.orm import Mapped, mapped_column, relationship
 from uuid import UUID
+from numpy import ndarray
 
 from common.database import Base
 
+# local imports
+from .object import Object
+from .polygon_list_type import PolygonListType
+
 
 class ObjectAnalysisConfig(Base):
     __tablename__ = "object_analysis_config"
@@ -25,6 +31,20 @@ class ObjectAnalysisConfig(Base):
     confidence: Mapped[float] = mapped_column(
         "confidence", nullable=False
     )
+    tile_size: Mapped[Optional[int]] = mapped_column(
+        "tile_size", nullable=True
+    )
+    tile_overlap: Mapped[float] = mapped_column(
+        "tile_overlap", nullable=False, server_default="0.2"
+    )
+    mask_polygons: Mapped[Optional[list[ndarray]]] = mapped_column(
+        "mask_polygons", PolygonListType(), nullable=True
+    )
+    # children are only available when loaded eagerly, sessions are closed before entities are used;
+    # database deletes them together with the configuration
+    objects: Mapped[list[Object]] = relationship(
+        lazy="raise", passive_deletes=True
+    )
 
     def __repr__(self) -> str:
         return f"ObjectAnalysisConfig(account={self.account_id},image_resolution_width={self.image_resolution_width},image_resolution_height={self.image_resolution_height},confidence={self.confidence})"
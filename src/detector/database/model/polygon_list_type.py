@@ -0,0 +1,46 @@
+from typing import Any, Optional
+from numpy import ndarray, asarray, frombuffer, int32
+
+from sqlalchemy import LargeBinary
+from sqlalchemy.types import TypeDecorator
+
+# little-endian int32, same layout is written by the migration which introduced the column
+_VERTEX_DTYPE = "<i4"
+
+
+class PolygonListType(TypeDecorator):
+    """
+    Stores list of polygons as packed int32 values in a single binary column: for each polygon
+    number of vertices followed by (width, height) pairs of its vertices. Polygons are loaded
+    as (vertices, 2) int32 arrays without building an object per vertex.
+    """
+
+    impl = LargeBinary
+    cache_ok = True
+
+    def process_bind_param(self, value: Optional[list[ndarray]], dialect: Any) -> Optional[bytes]:
+        if not value:
+            return None
+
+        packed: list[bytes] = []
+        for polygon in value:
+            vertices = asarray(polygon, dtype=_VERTEX_DTYPE).reshape(-1, 2)
+            packed.append(asarray([len(vertices)], dtype=_VERTEX_DTYPE).tobytes())
+            packed.append(vertices.tobytes())
+
+        return b"".join(packed)
+
+    def process_result_value(self, value: Optional[bytes], dialect: Any) -> Optional[list[ndarray]]:
+        if value is None:
+            return None
+
+        # arrays are read-only views into the loaded value
+        values = frombuffer(value, dtype=_VERTEX_DTYPE).astype(int32, copy=False)
+        polygons: list[ndarray] = []
+        position = 0
+        while position < values.size:
+            vertex_count = int(values[position])
+            polygons.append(values[position + 1:position + 1 + 2 * vertex_count].reshape(vertex_count, 2))
+            position += 1 + 2 * vertex_count
+
+        return polygons
@@ -1,7 +1,5 @@
 from .base_repository import BaseRepository
 from .object_analysis_config import ObjectAnalysisConfigRepository
-from .frame_mask import FrameMaskRepository
-from .object import ObjectRepository
 from .account_repository import AccountRepository
 from .api_key_repository import APIKeyRepository
 from .jwt_repository import JWTRepository
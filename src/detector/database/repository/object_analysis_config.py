@@ -1,11 +1,16 @@
 from uuid import UUID
-from typing import Sequence
+from typing import Any, Dict, Sequence
 
-from sqlalchemy import select
+from sqlalchemy import delete, insert, select, update
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+from sqlalchemy.orm.attributes import set_committed_value
+
+from common.exception import NotFoundException
 
 # local imports
-from ..model import ObjectAnalysisConfig
+from ..model import ObjectAnalysisConfig, Object
 from .base_repository import BaseRepository
 
 
@@ -14,6 +19,91 @@ class ObjectAnalysisConfigRepository(BaseRepository[ObjectAnalysisConfig]):
     def __init__(self, engine):
         super().__init__(engine, ObjectAnalysisConfig)
 
+    async def create_with_children(
+        self,
+        values: Dict[str, Any],
+        objects: Sequence[Dict[str, Any]]
+    ) -> ObjectAnalysisConfig:
+        """
+        Insert a new entity together with its objects in a single transaction, objects are
+        inserted with one multi-row statement.
+
+        :param values: Entity fields mapping
+        :type values: Dict[str, Any]
+        :param objects: Fields mapping of each object
+        :type objects: Sequence[Dict[str, Any]]
+        :return: Inserted entity with 'objects' loaded
+        :rtype: ObjectAnalysisConfig
+        """
+        async with self._get_session(expire_on_commit=False) as session:
+            try:
+                entity = await session.scalar(insert(self._model).values(values).returning(self._model))
+                await self._insert_children(session=session, entity=entity, objects=objects)
+                await session.commit()
+            except IntegrityError as error:
+                self._parse_sql_error(error)
+
+        return entity
+
+    async def replace_with_children(
+        self,
+        entity_id: UUID,
+        values: Dict[str, Any],
+        objects: Sequence[Dict[str, Any]]
+    ) -> ObjectAnalysisConfig:
+        """
+        Update an entity and replace all of its objects in a single transaction, either all
+        changes are stored or none.
+
+        :param entity_id: UUID of the entity to be updated
+        :type entity_id: UUID
+        :param values: Entity fields mapping that will be updated
+        :type values: Dict[str, Any]
+        :param objects: Fields mapping of each new object
+        :type objects: Sequence[Dict[str, Any]]
+        :raises NotFoundException: If entity with specified UUID does not exist
+        :return: Updated entity with 'objects' loaded
+        :rtype: ObjectAnalysisConfig
+        """
+        async with self._get_session(expire_on_commit=False) as session:
+            try:
+                entity = await session.scalar(
+                    update(self._model).where(self._model.id == entity_id).values(values).returning(self._model)
+                )
+                if entity is None:
+                    raise NotFoundException(key_name="uuid", table_name=self._model.__tablename__, entity_id=entity_id)
+
+                await session.execute(delete(Object).where(Object.object_analysis_config == entity_id))
+                await self._insert_children(session=session, entity=entity, objects=objects)
+                await session.commit()
+            except IntegrityError as error:
+                self._parse_sql_error(error)
+
+        return entity
+
+    async def get_one_with_children(self, entity_id: UUID) -> ObjectAnalysisConfig:
+        """
+        Fetch single entity together with its objects. Objects are loaded in the same session
+        (single connection) instead of a separate repository call.
+
+        :param entity_id: Entity UUID to filter with
+        :type entity_id: UUID
+        :raises NotFoundException: If entity with specified UUID does not exist
+        :return: Entity (row) with 'objects' loaded
+        :rtype: ObjectAnalysisConfig
+        """
+        async with self._get_session() as session:
+            query = select(self._model).where(self._model.id == entity_id).options(
+                selectinload(self._model.objects)
+            )
+            scalars = await session.scalars(query)
+            result = scalars.unique().first()
+
+            if result is None:
+                raise NotFoundException(key_name="uuid", table_name=self._model.__tablename__, entity_id=entity_id)
+
+        return result
+
     async def get_all_for_account_id(self, account_id: UUID) -> Sequence[ObjectAnalysisConfig]:
         """
         Fetch all entities from the database which have a reference (foreign key)
@@ -31,6 +121,41 @@ class ObjectAnalysisConfigRepository(BaseRepository[ObjectAnalysisConfig]):
 
         return result
     
+    async def get_all_for_account_id_with_children(self, account_id: UUID) -> Sequence[ObjectAnalysisConfig]:
+        """
+        Fetch all entities of the account together with their objects. Objects of all entities
+        are fetched at once with 'IN (...)' queries and grouped in memory, so number of queries
+        doesn't grow with number of entities.
+
+        :param account_id: Account ID to filter with
+        :type account_id: UUID
+        :return: List of entities (rows) with 'objects' loaded
+        :rtype: Sequence[ObjectAnalysisConfig]
+        """
+        async with self._get_session() as session:
+            query = select(self._model).where(self._model.account_id==account_id).options(
+                selectinload(self._model.objects)
+            )
+            scalars = await session.scalars(query)
+            result = scalars.unique().all()
+
+        return result
+    
+    async def _insert_children(
+        self,
+        session: AsyncSession,
+        entity: ObjectAnalysisConfig,
+        objects: Sequence[Dict[str, Any]]
+    ) -> None:
+        inserted_objects = await self._insert_many(
+            session=session,
+            db_model=Object,
+            values=[{**object, "object_analysis_config": entity.id} for object in objects]
+        ) if objects else []
+
+        # objects are attached as loaded, without marking the entity as modified
+        set_committed_value(entity, "objects", list(inserted_objects))
+
     async def delete(self, entity_id: UUID) -> None:
         """
         Delete single entity in database
@@ -1 +1,19 @@
-from .cnn_detector.yolov8.yolov8_detector import YoloDetector
\ No newline at end of file
+from importlib import import_module
+
+# detector backends are imported on first access so that only the backend in use loads its dependencies
+# (e.g. ONNX runtime backend does not load torch and ultralytics)
+_DETECTORS = {
+    "YoloDetector": ".cnn_detector.yolov8.yolov8_detector",
+    "YoloOnnxDetector": ".cnn_detector.yolov8.yolov8_onnx_detector",
+    "quantize_onnx_model": ".cnn_detector.yolov8.onnx_quantization",
+    "ProcessPoolDetector": ".process_pool.process_pool_detector",
+}
+
+__all__ = list(_DETECTORS)
+
+
+def __getattr__(name: str):
+    if name not in _DETECTORS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    return getattr(import_module(_DETECTORS[name], __name__), name)
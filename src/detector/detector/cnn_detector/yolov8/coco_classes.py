@@ -0,0 +1,29 @@
+from numpy import array
+
+# local imports
+from ....model.enum import ObjectEnum
+
+# class names of the COCO dataset YOLOv8 models are pre-trained on, in model output order
+CLASS_NAMES = [
+    "person", "bicycle", "car", "motorbike", "aeroplane", "bus", "train", "truck", "boat",
+    "traffic light", "fire hydrant", "stop sign", "parking meter", "bench", "bird", "cat",
+    "dog", "horse", "sheep", "cow", "elephant", "bear", "zebra", "giraffe", "backpack", "umbrella",
+    "handbag", "tie", "suitcase", "frisbee", "skis", "snowboard", "sports ball", "kite", "baseball bat",
+    "baseball glove", "skateboard", "surfboard", "tennis racket", "bottle", "wine glass", "cup",
+    "fork", "knife", "spoon", "bowl", "banana", "apple", "sandwich", "orange", "broccoli",
+    "carrot", "hot dog", "pizza", "donut", "cake", "chair", "sofa", "pottedplant", "bed",
+    "diningtable", "toilet", "tvmonitor", "laptop", "mouse", "remote", "keyboard", "cell phone",
+    "microwave", "oven", "toaster", "sink", "refrigerator", "book", "clock", "vase", "scissors",
+    "teddy bear", "hair drier", "toothbrush"
+]
+
+OBJECTS = list(ObjectEnum)
+_OBJECT_VALUES = [object.value for object in OBJECTS]
+
+# class index -> index in OBJECTS lookup table, '-1' for classes which are not of interest
+CLASS_TO_OBJECT_INDEX = array([
+    _OBJECT_VALUES.index(class_name) if class_name in _OBJECT_VALUES else -1
+    for class_name in CLASS_NAMES
+])
+
+OBJECT_TO_CLASS_INDEX = {object: CLASS_NAMES.index(object.value) for object in OBJECTS}
@@ -0,0 +1,39 @@
+from argparse import ArgumentParser
+from pathlib import Path
+
+WEIGHTS_DIRECTORY = Path(__file__).parent.resolve() / "yolo-Weights"
+
+
+def export_onnx_model(weights_path: str | Path = WEIGHTS_DIRECTORY / "yolov8n.pt", image_size: int = 640) -> Path:
+    """
+    Export YOLOv8 PyTorch weights to ONNX graph. Exported graph is stored next to the weights
+    file with '.onnx' suffix. Export works offline as long as weights file exists locally.
+
+    :param weights_path: path to PyTorch weights, defaults to 'yolov8n.pt' in 'yolo-Weights' directory
+    :type weights_path: str | Path, optional
+    :param image_size: model input size in pixels, defaults to 640
+    :type image_size: int, optional
+    :raises FileNotFoundError: If weights file does not exist
+    :return: path to exported ONNX graph
+    :rtype: Path
+    """
+    weights_path = Path(weights_path)
+    if not weights_path.is_file():
+        raise FileNotFoundError(f"weights_file_not_found: {weights_path}")
+
+    # imported here so that ONNX runtime backend does not load torch unless export is needed
+    from ultralytics import YOLO
+
+    # dynamic axes allow running batches of images in single forward pass
+    exported_path = YOLO(str(weights_path)).export(format="onnx", imgsz=image_size, dynamic=True, simplify=False)
+
+    return Path(exported_path)
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(description="Export YOLOv8 weights to ONNX graph")
+    parser.add_argument("--weights", default=str(WEIGHTS_DIRECTORY / "yolov8n.pt"), help="path to PyTorch weights")
+    parser.add_argument("--image-size", type=int, default=640, help="model input size in pixels")
+    arguments = parser.parse_args()
+
+    print(export_onnx_model(weights_path=arguments.weights, image_size=arguments.image_size))
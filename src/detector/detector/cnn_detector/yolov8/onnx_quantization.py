@@ -0,0 +1,155 @@
+from argparse import ArgumentParser
+from enum import Enum
+from pathlib import Path
+from typing import Iterator, Optional
+from cv2 import imread, IMREAD_COLOR
+from cv2.dnn import blobFromImage
+
+from onnx import load as load_onnx_model
+from onnxruntime.quantization import CalibrationDataReader, QuantFormat, QuantType, quantize_dynamic, quantize_static
+from onnxruntime.quantization.shape_inference import quant_pre_process
+
+# local imports
+from .onnx_export import WEIGHTS_DIRECTORY, export_onnx_model
+from .yolov8_onnx_detector import letterbox
+
+CALIBRATION_IMAGE_SUFFIXES = (".jpg", ".jpeg", ".png", ".bmp")
+
+
+class QuantizationMode(str, Enum):
+    DYNAMIC = "dynamic"
+    STATIC = "static"
+
+
+def list_images(directory: str | Path) -> list[Path]:
+    """
+    List images in directory (non-recursive) sorted by name.
+
+    :param directory: directory with images
+    :type directory: str | Path
+    :return: image paths
+    :rtype: list[Path]
+    """
+    return sorted(path for path in Path(directory).iterdir() if path.suffix.lower() in CALIBRATION_IMAGE_SUFFIXES)
+
+
+class ImageFolderCalibrationReader(CalibrationDataReader):
+    """
+    Feeds images from local folder to static quantization calibration, pre-processed the same
+    way as 'YoloOnnxDetector' does it at inference time.
+    """
+
+    def __init__(self, directory: str | Path, input_name: str, input_size: int = 640, max_images: Optional[int] = None):
+        image_paths = list_images(directory)
+        if not image_paths:
+            raise FileNotFoundError(f"calibration_images_not_found: {directory}")
+
+        self._image_paths = image_paths[:max_images]
+        self._input_name = input_name
+        self._input_size = input_size
+        self._inputs: Optional[Iterator[dict]] = None
+
+    def get_next(self) -> Optional[dict]:
+        if self._inputs is None:
+            self._inputs = self._read_inputs()
+
+        return next(self._inputs, None)
+
+    def rewind(self) -> None:
+        self._inputs = None
+
+    def _read_inputs(self) -> Iterator[dict]:
+        for image_path in self._image_paths:
+            image = imread(str(image_path), IMREAD_COLOR)
+            if image is None:  # skip unreadable files
+                continue
+
+            padded, _, _ = letterbox(image=image, input_size=self._input_size)
+            yield {self._input_name: blobFromImage(padded, scalefactor=1 / 255, swapRB=True)}
+
+
+def quantize_onnx_model(
+    mode: QuantizationMode = QuantizationMode.DYNAMIC,
+    model_path: str | Path = WEIGHTS_DIRECTORY / "yolov8n.onnx",
+    calibration_directory: Optional[str | Path] = None,
+    max_calibration_images: Optional[int] = 200,
+    overwrite: bool = False
+) -> Path:
+    """
+    Quantize YOLOv8 ONNX graph to INT8. Dynamic quantization only converts weights, static
+    quantization also converts activations using ranges calibrated on images from local folder.
+    Quantized graph is stored next to the FP32 graph, FP32 graph is exported first if missing.
+
+    :param mode: quantization mode, defaults to dynamic
+    :type mode: QuantizationMode, optional
+    :param model_path: path to FP32 ONNX graph, defaults to 'yolov8n.onnx' in 'yolo-Weights' directory
+    :type model_path: str | Path, optional
+    :param calibration_directory: folder with sample images, required for static quantization
+    :type calibration_directory: Optional[str | Path], optional
+    :param max_calibration_images: maximum number of images used for calibration, defaults to 200
+    :type max_calibration_images: Optional[int], optional
+    :param overwrite: quantize again even if quantized graph exists, defaults to False
+    :type overwrite: bool, optional
+    :raises ValueError: If calibration directory is not given for static quantization
+    :return: path to quantized ONNX graph
+    :rtype: Path
+    """
+    mode = QuantizationMode(mode)
+    model_path = Path(model_path)
+    output_path = model_path.with_name(f"{model_path.stem}_int8_{mode.value}.onnx")
+    if output_path.is_file() and not overwrite:
+        return output_path
+
+    if mode == QuantizationMode.STATIC and calibration_directory is None:
+        raise ValueError("calibration_directory_required")
+
+    if not model_path.is_file():
+        model_path = export_onnx_model(weights_path=model_path.with_suffix(".pt"))
+
+    # shape inference and graph optimization before quantization improve accuracy of quantized graph
+    preprocessed_path = model_path.with_name(f"{model_path.stem}_preprocessed.onnx")
+    quant_pre_process(str(model_path), str(preprocessed_path))
+
+    try:
+        if mode == QuantizationMode.DYNAMIC:
+            # ConvInteger on CPU only supports unsigned weights
+            quantize_dynamic(str(preprocessed_path), str(output_path), weight_type=QuantType.QUInt8)
+        else:
+            model = load_onnx_model(str(preprocessed_path))
+            input_name = model.graph.input[0].name
+            input_size = model.graph.input[0].type.tensor_type.shape.dim[2].dim_value or 640
+            quantize_static(
+                str(preprocessed_path),
+                str(output_path),
+                calibration_data_reader=ImageFolderCalibrationReader(
+                    directory=calibration_directory,
+                    input_name=input_name,
+                    input_size=input_size,
+                    max_images=max_calibration_images
+                ),
+                quant_format=QuantFormat.QDQ,
+                per_channel=True,
+                activation_type=QuantType.QUInt8,
+                weight_type=QuantType.QInt8,
+            )
+    finally:
+        preprocessed_path.unlink(missing_ok=True)
+
+    return output_path
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(description="Quantize YOLOv8 ONNX graph to INT8")
+    parser.add_argument("--mode", choices=[mode.value for mode in QuantizationMode], default=QuantizationMode.DYNAMIC.value)
+    parser.add_argument("--model", default=str(WEIGHTS_DIRECTORY / "yolov8n.onnx"), help="path to FP32 ONNX graph")
+    parser.add_argument("--calibration-dir", default=None, help="folder with sample images, required for static mode")
+    parser.add_argument("--max-calibration-images", type=int, default=200)
+    arguments = parser.parse_args()
+
+    print(quantize_onnx_model(
+        mode=arguments.mode,
+        model_path=arguments.model,
+        calibration_directory=arguments.calibration_dir,
+        max_calibration_images=arguments.max_calibration_images,
+        overwrite=True
+    ))
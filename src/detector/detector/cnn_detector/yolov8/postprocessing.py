@@ -0,0 +1,78 @@
+from numpy import ndarray, zeros, bincount, ceil, int64
+
+# local imports
+from ....model.enum import ObjectEnum
+from ....model.dto import ObjectBoundingBoxDto, PixelCoordinateDto
+from ....exception import AnalyzerException
+from .coco_classes import CLASS_NAMES, OBJECTS, CLASS_TO_OBJECT_INDEX
+
+
+def filter_boxes(
+    class_indices: ndarray,
+    confidences: ndarray,
+    xyxy: ndarray,
+    objects: list[ObjectEnum],
+    confidence: float
+) -> tuple[ndarray, ndarray, ndarray]:
+    """
+    Keep only boxes of requested objects which have high enough confidence.
+
+    :param class_indices: COCO class index of every box
+    :type class_indices: ndarray
+    :param confidences: confidence of every box (0...1.0)
+    :type confidences: ndarray
+    :param xyxy: corner coordinates of every box
+    :type xyxy: ndarray
+    :param objects: objects of interest
+    :type objects: list[ObjectEnum]
+    :param confidence: confidence level, boxes below it are dropped
+    :type confidence: float
+    :raises AnalyzerException: If class index is not a known COCO class
+    :return: index in OBJECTS, confidence and corner coordinates of kept boxes
+    :rtype: tuple[ndarray, ndarray, ndarray]
+    """
+    class_indices = class_indices.astype(int64)
+    if (class_indices >= len(CLASS_NAMES)).any():
+        raise AnalyzerException(detail="detector_failure_class_index_out_of_range")
+
+    # extra trailing 'False' makes '-1' (class not of interest) map to not requested
+    requested = zeros(len(OBJECTS) + 1, dtype=bool)
+    requested[[OBJECTS.index(object) for object in objects]] = True
+
+    object_indices = CLASS_TO_OBJECT_INDEX[class_indices]
+    keep = requested[object_indices] & (confidences >= confidence)
+
+    return object_indices[keep], confidences[keep], xyxy[keep]
+
+
+def count_objects(object_indices: ndarray, objects: list[ObjectEnum]) -> dict[ObjectEnum, int]:
+    counts = bincount(object_indices, minlength=len(OBJECTS))
+
+    return {object: int(counts[OBJECTS.index(object)]) for object in objects}
+
+
+def group_bounding_boxes(
+    object_indices: ndarray,
+    confidences: ndarray,
+    xyxy: ndarray,
+    objects: list[ObjectEnum]
+) -> dict[ObjectEnum, list[ObjectBoundingBoxDto]]:
+    # default return value
+    detection_results: dict[ObjectEnum, list[ObjectBoundingBoxDto]] = {
+        object: [] for object in objects
+    }
+
+    # values are already validated so DTOs are constructed without validation
+    confidence_percentages = ceil(confidences * 100).astype(int64).tolist()
+    for object_index, box_confidence, (x1, y1, x2, y2) in zip(object_indices.tolist(), confidence_percentages, xyxy.astype(int64).tolist()):
+        object_enum = OBJECTS[object_index]
+        detection_results[object_enum].append(
+            ObjectBoundingBoxDto.model_construct(
+                object_type=object_enum,
+                confidence=box_confidence,
+                top_left=PixelCoordinateDto.model_construct(width=x1, height=y1),
+                bottom_right=PixelCoordinateDto.model_construct(width=x2, height=y2)
+            )
+        )
+
+    return detection_results
@@ -0,0 +1,121 @@
+from argparse import ArgumentParser
+from json import dumps
+from pathlib import Path
+from time import perf_counter
+from typing import Optional
+from numpy import ndarray
+from cv2 import imread, IMREAD_COLOR
+
+# local imports
+from ....interface import AbstractObjectDetector
+from ....model.enum import ObjectEnum
+from .onnx_export import WEIGHTS_DIRECTORY
+from .onnx_quantization import QuantizationMode, list_images, quantize_onnx_model
+from .yolov8_detector import YoloDetector
+from .yolov8_onnx_detector import YoloOnnxDetector
+
+
+def _count_all(
+    detector: AbstractObjectDetector,
+    images: list[ndarray],
+    objects: list[ObjectEnum],
+    confidence: Optional[int],
+    batch_size: int
+) -> tuple[list[dict[ObjectEnum, int]], float]:
+    counts: list[dict[ObjectEnum, int]] = []
+    started_at = perf_counter()
+    for start in range(0, len(images), batch_size):
+        batch = images[start:start + batch_size]
+        batch_results = detector.detect_batch(images=batch, objects=[objects] * len(batch), confidences=[confidence] * len(batch))
+        counts += [{object: len(boxes) for object, boxes in results.items()} for results in batch_results]
+    elapsed_time = perf_counter() - started_at
+
+    return counts, len(images) / elapsed_time
+
+
+def build_quantization_report(
+    image_directory: str | Path,
+    mode: QuantizationMode = QuantizationMode.DYNAMIC,
+    calibration_directory: Optional[str | Path] = None,
+    confidence: Optional[int] = None,
+    batch_size: int = 1
+) -> dict:
+    """
+    Compare per-class counts of INT8 quantized ONNX detector against FP32 'YoloDetector' on the
+    same images and measure throughput (images/sec) of both. First pass of each detector is
+    a warm-up and is not measured.
+
+    :param image_directory: folder with evaluation images
+    :type image_directory: str | Path
+    :param mode: quantization mode, defaults to dynamic
+    :type mode: QuantizationMode, optional
+    :param calibration_directory: folder with calibration images for static mode, defaults to evaluation images
+    :type calibration_directory: Optional[str | Path], optional
+    :param confidence: confidence level used by both detectors, defaults to detector default
+    :type confidence: Optional[int], optional
+    :param batch_size: images per forward pass, defaults to 1
+    :type batch_size: int, optional
+    :return: report with per-class agreement and throughput
+    :rtype: dict
+    """
+    images = [image for image in (imread(str(path), IMREAD_COLOR) for path in list_images(image_directory)) if image is not None]
+    if not images:
+        raise FileNotFoundError(f"images_not_found: {image_directory}")
+
+    objects = list(ObjectEnum)
+    quantized_model_path = quantize_onnx_model(mode=mode, calibration_directory=calibration_directory or image_directory)
+    detectors: dict[str, AbstractObjectDetector] = {
+        "fp32_yolo": YoloDetector(model_path=str(WEIGHTS_DIRECTORY / "yolov8n.pt")),
+        f"int8_{QuantizationMode(mode).value}_onnx": YoloOnnxDetector(model_path=str(quantized_model_path)),
+    }
+
+    counts: dict[str, list[dict[ObjectEnum, int]]] = {}
+    throughput: dict[str, float] = {}
+    for name, detector in detectors.items():
+        _count_all(detector=detector, images=images[:batch_size], objects=objects, confidence=confidence, batch_size=batch_size)
+        counts[name], throughput[name] = _count_all(
+            detector=detector, images=images, objects=objects, confidence=confidence, batch_size=batch_size
+        )
+
+    reference_counts, quantized_counts = counts.values()
+    per_class = {}
+    for object in objects:
+        differences = [abs(reference[object] - quantized[object]) for reference, quantized in zip(reference_counts, quantized_counts)]
+        per_class[object.value] = {
+            "reference_total": sum(reference[object] for reference in reference_counts),
+            "quantized_total": sum(quantized[object] for quantized in quantized_counts),
+            "exact_agreement": sum(1 for difference in differences if difference == 0) / len(images),
+            "mean_absolute_error": sum(differences) / len(images),
+        }
+
+    reference_name, quantized_name = detectors
+    return {
+        "images": len(images),
+        "batch_size": batch_size,
+        "quantized_model": str(quantized_model_path),
+        "per_class": per_class,
+        "exact_agreement": sum(1 for reference, quantized in zip(reference_counts, quantized_counts) if reference == quantized) / len(images),
+        "images_per_second": throughput,
+        "speedup": throughput[quantized_name] / throughput[reference_name],
+    }
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(description="Compare INT8 quantized detector against FP32 YOLOv8 detector")
+    parser.add_argument("images", help="folder with evaluation images")
+    parser.add_argument("--mode", choices=[mode.value for mode in QuantizationMode], default=QuantizationMode.DYNAMIC.value)
+    parser.add_argument("--calibration-dir", default=None, help="folder with calibration images, defaults to evaluation images")
+    parser.add_argument("--confidence", type=float, default=None)
+    parser.add_argument("--batch-size", type=int, default=1)
+    arguments = parser.parse_args()
+
+    print(dumps(
+        build_quantization_report(
+            image_directory=arguments.images,
+            mode=arguments.mode,
+            calibration_directory=arguments.calibration_dir,
+            confidence=arguments.confidence,
+            batch_size=arguments.batch_size
+        ),
+        indent=2
+    ))
@@ -1,16 +1,17 @@
 from typing import Optional
 from pathlib import Path
+from threading import local
 from numpy import ndarray
-from math import ceil
 
 from ultralytics import YOLO 
-from ultralytics.engine.results import Boxes, Results
+from ultralytics.engine.results import Results
 
 # local imports
 from ....interface import AbstractObjectDetector
 from ....model.enum import ObjectEnum
-from ....model.dto import ObjectBoundingBoxDto, PixelCoordinateDto
-from ....exception import AnalyzerException
+from ....model.dto import ObjectBoundingBoxDto
+from .coco_classes import CLASS_NAMES, OBJECT_TO_CLASS_INDEX
+from .postprocessing import filter_boxes, count_objects, group_bounding_boxes
 
 
 class YoloDetector(AbstractObjectDetector):
@@ -18,18 +19,7 @@ class YoloDetector(AbstractObjectDetector):
     This detector is implemented using the YOLOv8 based on instructions
     found on https://medium.com/@martin.jurado.p/my-first-ai-project-with-yolo-real-time-object-detection-bc8669c583ab
     '''
-    CLASS_NAMES = [
-        "person", "bicycle", "car", "motorbike", "aeroplane", "bus", "train", "truck", "boat",
-        "traffic light", "fire hydrant", "stop sign", "parking meter", "bench", "bird", "cat",
-        "dog", "horse", "sheep", "cow", "elephant", "bear", "zebra", "giraffe", "backpack", "umbrella",
-        "handbag", "tie", "suitcase", "frisbee", "skis", "snowboard", "sports ball", "kite", "baseball bat",
-        "baseball glove", "skateboard", "surfboard", "tennis racket", "bottle", "wine glass", "cup",
-        "fork", "knife", "spoon", "bowl", "banana", "apple", "sandwich", "orange", "broccoli",
-        "carrot", "hot dog", "pizza", "donut", "cake", "chair", "sofa", "pottedplant", "bed",
-        "diningtable", "toilet", "tvmonitor", "laptop", "mouse", "remote", "keyboard", "cell phone",
-        "microwave", "oven", "toaster", "sink", "refrigerator", "book", "clock", "vase", "scissors",
-        "teddy bear", "hair drier", "toothbrush"
-    ]
+    CLASS_NAMES = CLASS_NAMES
 
     def __init__(
             self, 
@@ -44,85 +34,72 @@ class YoloDetector(AbstractObjectDetector):
         :param confidence: default confidence level for detection, defaults 85%
         :type confidence: int, optional
         """
-        self._model = YOLO(model_path)
+        self._model_path = model_path
         self._confidence = confidence
-    
-    def _filter_and_sort_boxes(self, boxes: list[Boxes], objects: list[ObjectEnum], confidence: Optional[int] = None) -> dict[str, list[Boxes]]:
-        # if confidence not specified then use default
-        conf_level = confidence if confidence else self._confidence
+        # YOLO predictor is not thread-safe so every inference thread gets its own model instance
+        self._thread_local = local()
+        self._thread_local.model = YOLO(model_path)
 
-        # filter out only specified objects
-        object_names = [object.value for object in objects]
-        filtered_results = {object_name: [] for object_name in object_names}
-        for box in boxes:
-            try:
-                class_name = self.CLASS_NAMES[int(box.cls[0])]
-            except IndexError:
-                raise AnalyzerException("detector_failure_class_index_out_of_range")
-            
-            if class_name in object_names and box.conf[0] >= conf_level:
-                filtered_results[class_name].append(box)
-
-        return filtered_results
-    
     def count(self, image: ndarray, objects: list[ObjectEnum], confidence: Optional[int] = None) -> dict[ObjectEnum, int]:
         # infer objects from the image
-        results: Results = self._model(image, stream=False)[0]
+        results: Results = self._predict(images=image, objects=[objects], confidences=[confidence])[0]
 
-        # filter out only specified objects
-        filtered_results = self._filter_and_sort_boxes(
-            boxes=results.boxes, 
-            objects=objects, 
-            confidence=confidence
-        )
-        
-        # default return value
-        counting_results: dict[ObjectEnum, int] = {
-            object: 0 for object in objects
-        }
-
-        # count objects from results
-        for class_name, boxes in filtered_results.items():
-            object_enum = ObjectEnum(class_name)
-            counting_results[object_enum] += len(boxes)
-
-        return counting_results
+        object_indices, _, _ = self._filter_boxes(results=results, objects=objects, confidence=confidence)
+
+        return count_objects(object_indices=object_indices, objects=objects)
     
     def detect(self, image: ndarray, objects: list[ObjectEnum], confidence: Optional[int] = None) -> dict[ObjectEnum, list[ObjectBoundingBoxDto]]:
         # infer objects from the image
-        results: Results= self._model(image, stream=False)[0]
+        results: Results = self._predict(images=image, objects=[objects], confidences=[confidence])[0]
+
+        return self._group_bounding_boxes(results=results, objects=objects, confidence=confidence)
+
+    def detect_batch(
+        self,
+        images: list[ndarray],
+        objects: list[list[ObjectEnum]],
+        confidences: list[Optional[int]]
+    ) -> list[dict[ObjectEnum, list[ObjectBoundingBoxDto]]]:
+        # infer objects from all images in single forward pass
+        batch_results = self._predict(images=images, objects=objects, confidences=confidences)
+
+        return [
+            self._group_bounding_boxes(results=results, objects=image_objects, confidence=confidence)
+            for results, image_objects, confidence in zip(batch_results, objects, confidences)
+        ]
 
-        # filter out only specified objects
-        filtered_results = self._filter_and_sort_boxes(
-            boxes=results.boxes, 
-            objects=objects, 
-            confidence=confidence
+    def _get_model(self) -> YOLO:
+        model = getattr(self._thread_local, "model", None)
+        if model is None:
+            model = YOLO(self._model_path)
+            self._thread_local.model = model
+
+        return model
+
+    def _predict(self, images: ndarray | list[ndarray], objects: list[list[ObjectEnum]], confidences: list[Optional[int]]) -> list[Results]:
+        # let the model drop classes and low confidence boxes before NMS, exact per-image
+        # filtering is still done afterwards as the batch shares these arguments
+        class_indices = sorted({OBJECT_TO_CLASS_INDEX[object] for image_objects in objects for object in image_objects})
+        conf_level = min(confidence if confidence else self._confidence for confidence in confidences)
+
+        return self._get_model()(images, stream=False, verbose=False, classes=class_indices, conf=conf_level)
+
+    def _filter_boxes(self, results: Results, objects: list[ObjectEnum], confidence: Optional[int] = None) -> tuple[ndarray, ndarray, ndarray]:
+        # if confidence not specified then use default
+        conf_level = confidence if confidence else self._confidence
+
+        # single device -> host transfer, columns: x1, y1, x2, y2, confidence, class
+        boxes = results.boxes.data.cpu().numpy()
+
+        return filter_boxes(
+            class_indices=boxes[:, 5],
+            confidences=boxes[:, 4],
+            xyxy=boxes[:, :4],
+            objects=objects,
+            confidence=conf_level
         )
 
-        # default return value
-        detection_results: dict[ObjectEnum, list[ObjectBoundingBoxDto]] = {
-            object: [] for object in objects
-        }
-
-        # group bounding boxes by object type
-        for class_name, boxes in filtered_results.items():
-            object_enum = ObjectEnum(class_name)
-
-            for box in boxes:
-                x1, y1, x2, y2 = box.xyxy[0]
-                detection_results[object_enum] += [
-                    ObjectBoundingBoxDto(
-                        object_type=object_enum,
-                        confidence=ceil((box.conf[0]*100)),
-                        top_left=PixelCoordinateDto(
-                            width=int(x1),
-                            height=int(y1)
-                        ),
-                        bottom_right=PixelCoordinateDto(
-                            width=int(x2),
-                            height=int(y2)
-                        )
-                    )
-                ]
-            
-        return detection_results
\ No newline at end of file
+    def _group_bounding_boxes(self, results: Results, objects: list[ObjectEnum], confidence: Optional[int] = None) -> dict[ObjectEnum, list[ObjectBoundingBoxDto]]:
+        object_indices, box_confidences, xyxy = self._filter_boxes(results=results, objects=objects, confidence=confidence)
+
+        return group_bounding_boxes(object_indices=object_indices, confidences=box_confidences, xyxy=xyxy, objects=objects)
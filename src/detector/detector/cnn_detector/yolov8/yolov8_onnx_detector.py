@@ -0,0 +1,181 @@
+from typing import Optional
+from pathlib import Path
+from numpy import ndarray, argmax, array, clip, concatenate, empty, float32, int64, isin, take_along_axis
+from cv2 import resize, copyMakeBorder, INTER_LINEAR, BORDER_CONSTANT
+from cv2.dnn import blobFromImages, NMSBoxesBatched
+
+from onnxruntime import InferenceSession, SessionOptions, GraphOptimizationLevel
+
+# local imports
+from ....interface import AbstractObjectDetector
+from ....model.enum import ObjectEnum
+from ....model.dto import ObjectBoundingBoxDto
+from .coco_classes import CLASS_TO_OBJECT_INDEX, OBJECT_TO_CLASS_INDEX
+from .postprocessing import count_objects, group_bounding_boxes
+from .onnx_export import WEIGHTS_DIRECTORY, export_onnx_model
+
+# letterbox padding color used by YOLOv8 during training
+_PADDING_COLOR = (114, 114, 114)
+
+
+def letterbox(image: ndarray, input_size: int) -> tuple[ndarray, float, tuple[int, int]]:
+    """
+    Resize image keeping aspect ratio and pad it to square model input, same as 'ultralytics' LetterBox.
+
+    :param image: BGR image
+    :type image: ndarray
+    :param input_size: model input size in pixels
+    :type input_size: int
+    :return: padded image, resize scale and (left, top) padding
+    :rtype: tuple[ndarray, float, tuple[int, int]]
+    """
+    height, width = image.shape[:2]
+    scale = min(input_size / height, input_size / width)
+    resized_width, resized_height = round(width * scale), round(height * scale)
+    if (resized_width, resized_height) != (width, height):
+        image = resize(image, (resized_width, resized_height), interpolation=INTER_LINEAR)
+
+    padding_width = (input_size - resized_width) / 2
+    padding_height = (input_size - resized_height) / 2
+    top, bottom = round(padding_height - 0.1), round(padding_height + 0.1)
+    left, right = round(padding_width - 0.1), round(padding_width + 0.1)
+    padded = copyMakeBorder(image, top, bottom, left, right, BORDER_CONSTANT, value=_PADDING_COLOR)
+
+    return padded, scale, (left, top)
+
+
+class YoloOnnxDetector(AbstractObjectDetector):
+    """
+    YOLOv8 detector running exported ONNX graph on ONNX Runtime CPU execution provider. Pre-processing
+    (letterbox, normalization), class filtering and NMS are done here to match 'YoloDetector' results
+    without loading torch and ultralytics.
+    """
+
+    def __init__(
+        self,
+        model_path: str = str(WEIGHTS_DIRECTORY / "yolov8n.onnx"),
+        confidence: int = 0.85,
+        iou_threshold: float = 0.7,
+        intra_op_threads: int = 0
+    ):
+        """
+        Initialize ONNX runtime YOLO object detector. If ONNX graph does not exist it is exported
+        from PyTorch weights with the same name in the same directory.
+
+        :param model_path: path to ONNX graph, defaults to 'yolov8n.onnx' in 'yolo-Weights' directory
+        :type model_path: str, optional
+        :param confidence: default confidence level for detection, defaults 85%
+        :type confidence: int, optional
+        :param iou_threshold: IoU threshold for NMS, defaults to 0.7 (same as 'ultralytics')
+        :type iou_threshold: float, optional
+        :param intra_op_threads: number of threads used by single inference, defaults to 0 (runtime decides)
+        :type intra_op_threads: int, optional
+        """
+        if not Path(model_path).is_file():
+            model_path = str(export_onnx_model(weights_path=Path(model_path).with_suffix(".pt")))
+
+        session_options = SessionOptions()
+        session_options.graph_optimization_level = GraphOptimizationLevel.ORT_ENABLE_ALL
+        session_options.intra_op_num_threads = intra_op_threads
+        self._session = InferenceSession(model_path, sess_options=session_options, providers=["CPUExecutionProvider"])
+
+        model_input = self._session.get_inputs()[0]
+        self._input_name = model_input.name
+        # static input dimensions are integers, dynamic ones are names (strings)
+        batch_size, _, height, _ = model_input.shape
+        self._input_size = height if isinstance(height, int) else 640
+        self._supports_batches = not isinstance(batch_size, int) or batch_size > 1
+
+        self._confidence = confidence
+        self._iou_threshold = iou_threshold
+
+    def count(self, image: ndarray, objects: list[ObjectEnum], confidence: Optional[int] = None) -> dict[ObjectEnum, int]:
+        object_indices, _, _ = self._infer(images=[image], objects=[objects], confidences=[confidence])[0]
+
+        return count_objects(object_indices=object_indices, objects=objects)
+
+    def detect(self, image: ndarray, objects: list[ObjectEnum], confidence: Optional[int] = None) -> dict[ObjectEnum, list[ObjectBoundingBoxDto]]:
+        return self.detect_batch(images=[image], objects=[objects], confidences=[confidence])[0]
+
+    def detect_batch(
+        self,
+        images: list[ndarray],
+        objects: list[list[ObjectEnum]],
+        confidences: list[Optional[int]]
+    ) -> list[dict[ObjectEnum, list[ObjectBoundingBoxDto]]]:
+        return [
+            group_bounding_boxes(object_indices=object_indices, confidences=box_confidences, xyxy=xyxy, objects=image_objects)
+            for (object_indices, box_confidences, xyxy), image_objects in zip(
+                self._infer(images=images, objects=objects, confidences=confidences), objects
+            )
+        ]
+
+    def _infer(
+        self,
+        images: list[ndarray],
+        objects: list[list[ObjectEnum]],
+        confidences: list[Optional[int]]
+    ) -> list[tuple[ndarray, ndarray, ndarray]]:
+        letterboxed = [letterbox(image=image, input_size=self._input_size) for image in images]
+        # BGR -> RGB, HWC -> CHW, scale to 0...1 and stack into single float32 tensor
+        blob = blobFromImages([padded for padded, _, _ in letterboxed], scalefactor=1 / 255, swapRB=True)
+
+        if self._supports_batches:
+            predictions = self._session.run(None, {self._input_name: blob})[0]
+        else:
+            predictions = concatenate([self._session.run(None, {self._input_name: blob[i:i + 1]})[0] for i in range(len(images))])
+
+        return [
+            self._postprocess(
+                predictions=image_predictions,
+                objects=image_objects,
+                confidence=confidence if confidence else self._confidence,
+                scale=scale,
+                padding=padding,
+                image_shape=image.shape
+            )
+            for image_predictions, image_objects, confidence, (_, scale, padding), image in zip(
+                predictions, objects, confidences, letterboxed, images
+            )
+        ]
+
+    def _postprocess(
+        self,
+        predictions: ndarray,
+        objects: list[ObjectEnum],
+        confidence: float,
+        scale: float,
+        padding: tuple[int, int],
+        image_shape: tuple[int, ...]
+    ) -> tuple[ndarray, ndarray, ndarray]:
+        # predictions: (4 + classes, anchors) -> rows of cx, cy, w, h, class scores
+        predictions = predictions.T
+        class_indices = array([OBJECT_TO_CLASS_INDEX[object] for object in objects], dtype=int64)
+        if class_indices.size == 0:
+            return empty(0, dtype=int64), empty(0, dtype=float32), empty((0, 4), dtype=float32)
+
+        # best class per anchor (same as non multi-label NMS), then keep only requested classes
+        class_scores = predictions[:, 4:]
+        best_class = argmax(class_scores, axis=1)
+        box_confidences = take_along_axis(class_scores, best_class[:, None], axis=1)[:, 0]
+        keep = isin(best_class, class_indices) & (box_confidences >= confidence)
+
+        boxes = predictions[keep, :4]
+        box_confidences = box_confidences[keep]
+        box_classes = best_class[keep]
+
+        # class aware NMS on top-left based boxes
+        xywh = boxes.copy()
+        xywh[:, :2] -= xywh[:, 2:] / 2
+        kept_indices = NMSBoxesBatched(xywh.tolist(), box_confidences.tolist(), box_classes.tolist(), confidence, self._iou_threshold) if len(xywh) else []
+        kept_indices = array(kept_indices, dtype=int64).reshape(-1)
+
+        # undo letterbox and clip to image boundaries
+        xyxy = concatenate([xywh[kept_indices, :2], xywh[kept_indices, :2] + xywh[kept_indices, 2:]], axis=1)
+        xyxy[:, [0, 2]] -= padding[0]
+        xyxy[:, [1, 3]] -= padding[1]
+        xyxy /= scale
+        xyxy[:, [0, 2]] = clip(xyxy[:, [0, 2]], 0, image_shape[1])
+        xyxy[:, [1, 3]] = clip(xyxy[:, [1, 3]], 0, image_shape[0])
+
+        return CLASS_TO_OBJECT_INDEX[box_classes[kept_indices]], box_confidences[kept_indices], xyxy.astype(float32)
@@ -0,0 +1,493 @@
+from os import cpu_count
+from queue import Queue, Empty
+from threading import Condition, Lock, Thread
+from itertools import count as id_counter
+from concurrent.futures import Future, TimeoutError
+from multiprocessing import get_context
+from multiprocessing.connection import Connection, wait
+from multiprocessing.queues import Queue as ProcessQueue
+from typing import Any, Optional, Type
+from numpy import ndarray, array, float32
+
+# local imports
+from ...interface import AbstractObjectDetector
+from ...model.enum import ObjectEnum
+from ...model.dto import ObjectBoundingBoxDto, PixelCoordinateDto
+from ...exception import AnalyzerException
+from .shared_frame_ring_buffer import SharedFrameRingBuffer
+
+# packed detection result columns: object index, confidence, x1, y1, x2, y2
+_RESULT_COLUMNS = 6
+# slot index used for frames which do not fit into shared memory slot and are sent pickled
+_INLINE_FRAME_SLOT = -1
+# seconds result collector waits for worker results before checking whether pool is closing
+_COLLECTOR_POLL_INTERVAL = 1.0
+
+
+def _pack_detection_results(detection_results: dict[ObjectEnum, list[ObjectBoundingBoxDto]], objects: list[ObjectEnum]) -> ndarray:
+    rows = [
+        [object_index, box.confidence, box.top_left.width, box.top_left.height, box.bottom_right.width, box.bottom_right.height]
+        for object_index, object_enum in enumerate(objects)
+        for box in detection_results.get(object_enum, [])
+    ]
+
+    return array(rows, dtype=float32).reshape(-1, _RESULT_COLUMNS)
+
+
+def _unpack_detection_results(packed_results: ndarray, objects: list[ObjectEnum]) -> dict[ObjectEnum, list[ObjectBoundingBoxDto]]:
+    detection_results: dict[ObjectEnum, list[ObjectBoundingBoxDto]] = {
+        object: [] for object in objects
+    }
+
+    for object_index, confidence, x1, y1, x2, y2 in packed_results.tolist():
+        object_enum = objects[int(object_index)]
+        detection_results[object_enum].append(
+            ObjectBoundingBoxDto(
+                object_type=object_enum,
+                confidence=int(confidence),
+                top_left=PixelCoordinateDto(width=int(x1), height=int(y1)),
+                bottom_right=PixelCoordinateDto(width=int(x2), height=int(y2))
+            )
+        )
+
+    return detection_results
+
+
+class _PendingTask:
+    __slots__ = ("future", "slots", "objects", "frames", "worker")
+
+    def __init__(self, future: Future, slots: list[int], objects: list[list[ObjectEnum]], frames: list[tuple]):
+        self.future = future
+        self.slots = slots
+        self.objects = objects
+        # frames are handed over to worker on dispatch, worker index is set at the same time
+        self.frames: Optional[list[tuple]] = frames
+        self.worker: Optional[int] = None
+
+
+def _run_worker(
+    task_queue: ProcessQueue,
+    result_connection: Connection,
+    detector_class: Type[AbstractObjectDetector],
+    detector_kwargs: dict[str, Any],
+    buffer_name: str,
+    slot_count: int,
+    slot_size: int,
+    torch_threads: int
+) -> None:
+    # limit intra-op threads so that workers do not compete for the same cores
+    try:
+        from torch import set_num_threads
+        set_num_threads(torch_threads)
+    except ImportError:  # detector does not run on torch
+        pass
+
+    detector = detector_class(**detector_kwargs)
+    ring_buffer = SharedFrameRingBuffer(slot_count=slot_count, slot_size=slot_size, name=buffer_name)
+
+    try:
+        while True:
+            task = task_queue.get()
+            if task is None:  # shutdown signal
+                break
+
+            task_id, frames = task
+            try:
+                images = [
+                    frame if slot == _INLINE_FRAME_SLOT else ring_buffer.read(slot=slot, shape=shape, data_type=data_type)
+                    for slot, shape, data_type, frame, _, _ in frames
+                ]
+                objects = [frame_objects for _, _, _, _, frame_objects, _ in frames]
+                batch_results = detector.detect_batch(
+                    images=images,
+                    objects=objects,
+                    confidences=[confidence for _, _, _, _, _, confidence in frames],
+                )
+                packed_results = [
+                    _pack_detection_results(detection_results=results, objects=frame_objects)
+                    for results, frame_objects in zip(batch_results, objects)
+                ]
+                result_connection.send((task_id, packed_results, None))
+            except Exception as err:  # pylint: disable=broad-exception-caught
+                result_connection.send((task_id, None, repr(err)))
+    finally:
+        ring_buffer.close()
+        result_connection.close()
+
+
+class ProcessPoolDetector(AbstractObjectDetector):
+    """
+    Runs detection in a pool of worker processes, each holding its own detector instance, to
+    make use of all cores despite the GIL. Frames are passed to workers through shared memory
+    ring buffer slots instead of being pickled and detections are returned as compact arrays.
+
+    Every detection batch is handled by a single worker as one forward pass, multiple batches
+    submitted concurrently (e.g. from multiple executor threads) are dispatched to idle workers.
+    Each worker has its own task queue and result pipe, so pool always knows which tasks a worker
+    holds: tasks of a crashed worker fail right away and shared memory slots are only reused
+    once the worker which reads them returned its result or exited.
+    """
+
+    def __init__(
+        self,
+        detector_class: Type[AbstractObjectDetector],
+        detector_kwargs: Optional[dict[str, Any]] = None,
+        workers: int = 4,
+        slot_count: int = 16,
+        slot_size: int = 8 * 1024 * 1024,
+        torch_threads: Optional[int] = None,
+        task_timeout: float = 60.0
+    ):
+        """
+        Initialize worker processes and shared memory frame transport.
+
+        :param detector_class: Detector class instantiated in every worker process
+        :type detector_class: Type[AbstractObjectDetector]
+        :param detector_kwargs: Arguments for detector class, defaults to no arguments
+        :type detector_kwargs: Optional[dict[str, Any]], optional
+        :param workers: number of worker processes, defaults to 4
+        :type workers: int, optional
+        :param slot_count: number of frame slots in shared memory, defaults to 16
+        :type slot_count: int, optional
+        :param slot_size: size of frame slot in bytes, larger frames are pickled, defaults to 8MB
+        :type slot_size: int, optional
+        :param torch_threads: torch threads per worker, defaults to CPU cores split evenly between workers
+        :type torch_threads: Optional[int], optional
+        :param task_timeout: seconds to wait for free shared memory slots and for worker result,
+            worker which exceeds it is restarted, defaults to 60
+        :type task_timeout: float, optional
+        """
+        if workers < 1:
+            raise ValueError("workers_must_be_positive")
+
+        self._task_timeout = task_timeout
+        self._ring_buffer = SharedFrameRingBuffer(slot_count=slot_count, slot_size=slot_size)
+        self._free_slots: Queue[int] = Queue()
+        for slot in range(slot_count):
+            self._free_slots.put(slot)
+        self._slot_allocation_lock = Lock()
+
+        # guards pending tasks and workers, notified whenever a worker becomes idle
+        self._state_lock = Lock()
+        self._worker_idle = Condition(self._state_lock)
+        self._task_ids = id_counter()
+        self._pending_tasks: dict[int, _PendingTask] = {}
+        self._closing = False
+
+        # 'spawn' avoids inheriting torch thread pools and locks of the parent process
+        self._context = get_context("spawn")
+        self._worker_kwargs = {
+            "detector_class": detector_class,
+            "detector_kwargs": detector_kwargs or {},
+            "buffer_name": self._ring_buffer.name,
+            "slot_count": slot_count,
+            "slot_size": slot_size,
+            "torch_threads": torch_threads or max(1, (cpu_count() or 1) // workers),
+        }
+        self._workers: list[Any] = [None] * workers
+        self._task_queues: list[Any] = [None] * workers
+        self._result_connections: list[Any] = [None] * workers
+        # ids of tasks handed over to each worker, in the order worker takes them
+        self._worker_tasks: list[list[int]] = [[] for _ in range(workers)]
+        for index in range(workers):
+            self._start_worker(index)
+
+        self._dispatch_queue: Queue[Optional[int]] = Queue()
+        self._task_dispatcher = Thread(target=self._dispatch_tasks, name="detector-task-dispatcher", daemon=True)
+        self._task_dispatcher.start()
+        self._result_collector = Thread(target=self._collect_results, name="detector-result-collector", daemon=True)
+        self._result_collector.start()
+
+    @property
+    def workers(self) -> int:
+        return len(self._workers)
+
+    def count(self, image: ndarray, objects: list[ObjectEnum], confidence: Optional[int] = None) -> dict[ObjectEnum, int]:
+        detection_results = self.detect(image=image, objects=objects, confidence=confidence)
+
+        return {object_enum: len(boxes) for object_enum, boxes in detection_results.items()}
+
+    def detect(self, image: ndarray, objects: list[ObjectEnum], confidence: Optional[int] = None) -> dict[ObjectEnum, list[ObjectBoundingBoxDto]]:
+        return self.detect_batch(images=[image], objects=[objects], confidences=[confidence])[0]
+
+    def detect_batch(
+        self,
+        images: list[ndarray],
+        objects: list[list[ObjectEnum]],
+        confidences: list[Optional[int]]
+    ) -> list[dict[ObjectEnum, list[ObjectBoundingBoxDto]]]:
+        # batch can't hold more frames than there are slots in shared memory
+        chunk_size = self._ring_buffer.slot_count
+        futures = [
+            self._submit(
+                images=images[start:start + chunk_size],
+                objects=objects[start:start + chunk_size],
+                confidences=confidences[start:start + chunk_size]
+            )
+            for start in range(0, len(images), chunk_size)
+        ]
+
+        return self._wait_for_results(futures)
+
+    def warm_up(
+        self,
+        images: list[ndarray],
+        objects: list[list[ObjectEnum]],
+        confidences: list[Optional[int]]
+    ) -> None:
+        # warm-up tasks are handed over to every worker directly instead of to the first idle one
+        chunk_size = self._ring_buffer.slot_count
+        futures = [
+            self._submit(
+                images=images[start:start + chunk_size],
+                objects=objects[start:start + chunk_size],
+                confidences=confidences[start:start + chunk_size],
+                worker=worker
+            )
+            for worker in range(self.workers)
+            for start in range(0, len(images), chunk_size)
+        ]
+        self._wait_for_results(futures)
+
+    def close(self) -> None:
+        with self._worker_idle:
+            self._closing = True
+            self._worker_idle.notify_all()
+        self._dispatch_queue.put(None)
+        self._task_dispatcher.join()
+
+        for task_queue in self._task_queues:
+            task_queue.put(None)
+        for worker in self._workers:
+            worker.join(timeout=self._task_timeout)
+            if worker.is_alive():
+                worker.terminate()
+                worker.join()
+        self._result_collector.join()
+
+        with self._state_lock:
+            for pending_task in self._pending_tasks.values():
+                if not pending_task.future.done():
+                    pending_task.future.set_exception(AnalyzerException(detail="detector_stopped"))
+            self._pending_tasks.clear()
+
+        for task_queue in self._task_queues:
+            task_queue.close()
+        for result_connection in self._result_connections:
+            result_connection.close()
+        self._ring_buffer.close()
+        self._ring_buffer.unlink()
+
+    def _start_worker(self, index: int) -> None:
+        # worker gets fresh queue and pipe, ones of a killed worker may be left in inconsistent state
+        task_queue = self._context.Queue()
+        result_reader, result_writer = self._context.Pipe(duplex=False)
+        worker = self._context.Process(
+            target=_run_worker,
+            kwargs={**self._worker_kwargs, "task_queue": task_queue, "result_connection": result_writer},
+            daemon=True
+        )
+        worker.start()
+        # only worker holds writing end, so reader sees end of file once worker exits
+        result_writer.close()
+
+        self._workers[index] = worker
+        self._task_queues[index] = task_queue
+        self._result_connections[index] = result_reader
+        self._worker_tasks[index] = []
+
+    def _replace_worker(self, index: int) -> None:
+        # results sent right before worker exited are still waiting in the pipe
+        result_connection = self._result_connections[index]
+        while True:
+            try:
+                if not result_connection.poll():
+                    break
+                task_id, packed_results, error = result_connection.recv()
+            except (EOFError, OSError):
+                break
+            self._complete_task(worker=index, task_id=task_id, packed_results=packed_results, error=error)
+
+        with self._worker_idle:
+            self._workers[index].join()
+            task_queue = self._task_queues[index]
+            # nobody will read tasks left in the queue, don't wait for them to be flushed
+            task_queue.cancel_join_thread()
+            task_queue.close()
+            result_connection.close()
+
+            # worker is gone, so its tasks fail right away and their slots can be reused
+            failed_tasks = [
+                self._pending_tasks.pop(task_id)
+                for task_id in self._worker_tasks[index]
+                if task_id in self._pending_tasks
+            ]
+            self._worker_tasks[index] = []
+            if not self._closing:
+                self._start_worker(index)
+            self._worker_idle.notify_all()
+
+        for pending_task in failed_tasks:
+            self._release_slots(pending_task.slots)
+            if not pending_task.future.done():
+                pending_task.future.set_exception(AnalyzerException(detail="detector_worker_failure"))
+
+    def _allocate_slots(self, slot_count: int) -> list[int]:
+        # allocate all slots for the batch at once so concurrent batches can't deadlock each other
+        slots: list[int] = []
+        with self._slot_allocation_lock:
+            try:
+                for _ in range(slot_count):
+                    slots.append(self._free_slots.get(timeout=self._task_timeout))
+            except Empty:
+                self._release_slots(slots)
+                raise AnalyzerException(detail="detector_shared_memory_exhausted")
+
+        return slots
+
+    def _release_slots(self, slots: list[int]) -> None:
+        for slot in slots:
+            self._free_slots.put(slot)
+
+    def _wait_for_results(self, futures: list[tuple[int, Future]]) -> list[dict[ObjectEnum, list[ObjectBoundingBoxDto]]]:
+        detection_results: list[dict[ObjectEnum, list[ObjectBoundingBoxDto]]] = []
+        for _, future in futures:
+            try:
+                detection_results += future.result(timeout=self._task_timeout)
+            except TimeoutError:
+                self._abandon_tasks(task_ids=[task_id for task_id, _ in futures])
+                raise AnalyzerException(detail="detector_worker_timeout")
+
+        return detection_results
+
+    def _abandon_tasks(self, task_ids: list[int]) -> None:
+        with self._state_lock:
+            for task_id in task_ids:
+                pending_task = self._pending_tasks.get(task_id)
+                if pending_task is None:  # task already completed
+                    continue
+
+                pending_task.future.cancel()
+                if pending_task.worker is None:
+                    # task was not dispatched yet, so no worker reads its slots
+                    del self._pending_tasks[task_id]
+                    self._release_slots(pending_task.slots)
+                else:
+                    # worker may still read task's slots, they are released once the stuck worker is replaced
+                    self._workers[pending_task.worker].terminate()
+
+    def _submit(
+        self,
+        images: list[ndarray],
+        objects: list[list[ObjectEnum]],
+        confidences: list[Optional[int]],
+        worker: Optional[int] = None
+    ) -> tuple[int, Future]:
+        shared_frame_count = sum(1 for image in images if self._ring_buffer.fits(image))
+        slots = self._allocate_slots(slot_count=shared_frame_count)
+
+        frames = []
+        free_slots = iter(slots)
+        for image, image_objects, confidence in zip(images, objects, confidences):
+            if self._ring_buffer.fits(image):
+                slot = next(free_slots)
+                self._ring_buffer.write(slot=slot, frame=image)
+                frames.append((slot, image.shape, image.dtype.str, None, image_objects, confidence))
+            else:
+                # frame too large for shared memory slot, fall back to pickling it
+                frames.append((_INLINE_FRAME_SLOT, image.shape, image.dtype.str, image, image_objects, confidence))
+
+        future = Future()
+        task_id = next(self._task_ids)
+        with self._state_lock:
+            if self._closing:
+                self._release_slots(slots)
+                raise AnalyzerException(detail="detector_stopped")
+
+            self._pending_tasks[task_id] = _PendingTask(future=future, slots=slots, objects=objects, frames=frames)
+            if worker is not None:
+                self._assign_task(worker=worker, task_id=task_id)
+        if worker is None:
+            self._dispatch_queue.put(task_id)
+
+        return task_id, future
+
+    def _assign_task(self, worker: int, task_id: int) -> None:
+        # called with state lock held
+        pending_task = self._pending_tasks[task_id]
+        pending_task.worker = worker
+        self._worker_tasks[worker].append(task_id)
+        self._task_queues[worker].put((task_id, pending_task.frames))
+        pending_task.frames = None
+
+    def _find_idle_worker(self) -> Optional[int]:
+        # called with state lock held
+        for index, worker in enumerate(self._workers):
+            if not self._worker_tasks[index] and worker.is_alive():
+                return index
+
+        return None
+
+    def _dispatch_tasks(self) -> None:
+        while True:
+            task_id = self._dispatch_queue.get()
+            if task_id is None:  # shutdown signal
+                break
+
+            with self._worker_idle:
+                worker = self._find_idle_worker()
+                while worker is None and not self._closing:
+                    self._worker_idle.wait()
+                    worker = self._find_idle_worker()
+                if self._closing:
+                    break
+
+                # task which timed out before it was dispatched was already dropped
+                if task_id in self._pending_tasks:
+                    self._assign_task(worker=worker, task_id=task_id)
+
+    def _collect_results(self) -> None:
+        while True:
+            with self._state_lock:
+                if self._closing:
+                    break
+                result_connections = {connection: index for index, connection in enumerate(self._result_connections)}
+                sentinels = {worker.sentinel: index for index, worker in enumerate(self._workers)}
+
+            ready = wait([*result_connections, *sentinels], timeout=_COLLECTOR_POLL_INTERVAL)
+            for ready_object in ready:
+                if ready_object not in result_connections:
+                    continue
+                try:
+                    task_id, packed_results, error = ready_object.recv()
+                except (EOFError, OSError):  # worker exited, handled through its sentinel
+                    continue
+                self._complete_task(worker=result_connections[ready_object], task_id=task_id, packed_results=packed_results, error=error)
+
+            for ready_object in ready:
+                if ready_object in sentinels:
+                    # crashed or stuck worker is replaced so that pool keeps its size
+                    self._replace_worker(sentinels[ready_object])
+
+    def _complete_task(self, worker: int, task_id: int, packed_results: Optional[list[ndarray]], error: Optional[str]) -> None:
+        with self._worker_idle:
+            pending_task = self._pending_tasks.pop(task_id, None)
+            if task_id in self._worker_tasks[worker]:
+                self._worker_tasks[worker].remove(task_id)
+                self._worker_idle.notify_all()
+        if pending_task is None:
+            return
+
+        # worker is done reading frames so slots can be reused
+        self._release_slots(pending_task.slots)
+
+        if pending_task.future.done():  # task timed out, nobody waits for its results
+            return
+        if error is not None:
+            pending_task.future.set_exception(AnalyzerException(detail="detector_worker_failure"))
+            return
+
+        pending_task.future.set_result([
+            _unpack_detection_results(packed_results=results, objects=frame_objects)
+            for results, frame_objects in zip(packed_results, pending_task.objects)
+        ])
@@ -0,0 +1,60 @@
+from typing import Optional
+from multiprocessing.shared_memory import SharedMemory
+from numpy import ndarray, dtype, copyto, prod
+
+
+class SharedFrameRingBuffer:
+    """
+    Fixed number of equally sized frame slots in a single shared memory block. Frames are
+    written into a slot by producer process and read as zero-copy array views by consumer
+    process, only slot index, shape and dtype have to be passed between processes.
+
+    Buffer does not track which slots are in use, slot allocation is managed by the owner.
+    """
+
+    def __init__(self, slot_count: int, slot_size: int, name: Optional[str] = None):
+        """
+        Create new shared memory ring buffer or attach to an existing one.
+
+        :param slot_count: number of frame slots
+        :type slot_count: int
+        :param slot_size: size of single slot in bytes
+        :type slot_size: int
+        :param name: name of existing shared memory block to attach to, defaults to creating a new block
+        :type name: Optional[str], optional
+        """
+        self._slot_count = slot_count
+        self._slot_size = slot_size
+        self._shared_memory = SharedMemory(name=name, create=name is None, size=slot_count * slot_size)
+
+    @property
+    def name(self) -> str:
+        return self._shared_memory.name
+
+    @property
+    def slot_count(self) -> int:
+        return self._slot_count
+
+    def fits(self, frame: ndarray) -> bool:
+        return frame.nbytes <= self._slot_size
+
+    def write(self, slot: int, frame: ndarray) -> None:
+        copyto(self._view(slot=slot, shape=frame.shape, data_type=frame.dtype), frame)
+
+    def read(self, slot: int, shape: tuple[int, ...], data_type: str) -> ndarray:
+        return self._view(slot=slot, shape=shape, data_type=dtype(data_type))
+
+    def close(self) -> None:
+        self._shared_memory.close()
+
+    def unlink(self) -> None:
+        self._shared_memory.unlink()
+
+    def _view(self, slot: int, shape: tuple[int, ...], data_type: dtype) -> ndarray:
+        if not 0 <= slot < self._slot_count:
+            raise IndexError("ring_buffer_slot_out_of_range")
+
+        if int(prod(shape)) * data_type.itemsize > self._slot_size:
+            raise ValueError("frame_does_not_fit_ring_buffer_slot")
+
+        return ndarray(shape=shape, dtype=data_type, buffer=self._shared_memory.buf, offset=slot * self._slot_size)
@@ -1,3 +1,5 @@
+from asyncio import Task, CancelledError, create_task, to_thread
+from concurrent.futures import ThreadPoolExecutor
 from types import TracebackType
 from typing import Optional, Type
 
@@ -7,16 +9,21 @@ from sqlalchemy.ext.asyncio import AsyncEngine
 from common.initializer import State, Initializer
 
 # local imports
-from .interface import AbstractImageAnalyzer, AbstractAnalyzeImageConfigManager, AbstractBlobStorageClient, AbstractFileStorage, AbstractImageProcessor
-from .service import ImageAnalyzer, ImageProcessor, AnalyzeObjectConfigManager, AuthenticationManager, BlobStorageClient, FileStorage
-from .detector import YoloDetector
-from .database import ObjectAnalysisConfigRepository, FrameMaskRepository, ObjectRepository, AccountRepository, APIKeyRepository, JWTRepository, FileRegisterRepository
+from .interface import AbstractObjectDetector, AbstractImageAnalyzer, AbstractAnalyzeImageConfigManager, AbstractBlobStorageClient, AbstractFileStorage, AbstractImageProcessor, AbstractDetectionScheduler, AbstractDetectorWarmUp, AbstractMaskCache, AbstractResultCache, AbstractConfigCache
+from .service import ImageAnalyzer, ImageProcessor, AnalyzeObjectConfigManager, AuthenticationManager, BlobStorageClient, FileStorage, DetectionBatchScheduler, DetectorWarmUp, MaskCache, ResultCache, ConfigCache
+from . import detector as detectors
+from .database import ObjectAnalysisConfigRepository, AccountRepository, APIKeyRepository, JWTRepository, FileRegisterRepository
 
 
 class ServiceState(State):
     # services
     image_processor: AbstractImageProcessor
     image_analyzer: AbstractImageAnalyzer
+    detection_scheduler: AbstractDetectionScheduler
+    detector_warm_up: AbstractDetectorWarmUp
+    mask_cache: AbstractMaskCache
+    result_cache: Optional[AbstractResultCache]
+    config_cache: Optional[AbstractConfigCache]
     analyze_object_config_manager: AbstractAnalyzeImageConfigManager
     authentication_manager: AuthenticationManager
     blob_storage_client: AbstractBlobStorageClient
@@ -34,6 +41,10 @@ class ServiceState(State):
 class DetectorServiceInitializer(Initializer):
     def __init__(self, app: FastAPI) -> None:
         super().__init__(app=app)
+        self._object_detector: Optional[AbstractObjectDetector] = None
+        self._inference_executor: Optional[ThreadPoolExecutor] = None
+        self._detection_scheduler: Optional[DetectionBatchScheduler] = None
+        self._warm_up_task: Optional[Task] = None
 
     async def __aenter__(self) -> ServiceState:
         state = await super().__aenter__()
@@ -48,8 +59,6 @@ class DetectorServiceInitializer(Initializer):
         # initialize repositories
         file_register_repository= FileRegisterRepository(engine=db_engine)
         analysis_config_repository = ObjectAnalysisConfigRepository(engine=db_engine)
-        frame_mask_repository = FrameMaskRepository(engine=db_engine)
-        object_repository = ObjectRepository(engine=db_engine)
         account_repository = AccountRepository(engine=db_engine)
         api_key_repository = APIKeyRepository(engine=db_engine)
         jwt_repository = JWTRepository(engine=db_engine)
@@ -57,22 +66,115 @@ class DetectorServiceInitializer(Initializer):
         # initialize services/tools
         detector_used = state.config.require_config("DETECTOR_USED")
         if detector_used == "YOLOV8":
-            detector = YoloDetector(confidence=0.8)
+            detector = detectors.YoloDetector(confidence=0.8)
+        elif detector_used == "ONNX":
+            detector = detectors.YoloOnnxDetector(
+                confidence=0.8,
+                intra_op_threads=state.config.get_int("DETECTOR_ONNX_THREADS", 0),
+            )
+        elif detector_used == "ONNX_INT8":
+            # quantized graph is created on first start unless it was prepared offline
+            quantized_model_path = await to_thread(
+                detectors.quantize_onnx_model,
+                mode=state.config.get_config("DETECTOR_QUANTIZATION_MODE", "dynamic"),
+                calibration_directory=state.config.get_config("DETECTOR_CALIBRATION_DIR", "") or None,
+            )
+            detector = detectors.YoloOnnxDetector(
+                model_path=str(quantized_model_path),
+                confidence=0.8,
+                intra_op_threads=state.config.get_int("DETECTOR_ONNX_THREADS", 0),
+            )
+        elif detector_used == "YOLOV8_MULTIPROCESS":
+            detector = detectors.ProcessPoolDetector(
+                detector_class=detectors.YoloDetector,
+                detector_kwargs={"confidence": 0.8},
+                workers=state.config.get_int("DETECTOR_PROCESS_WORKERS", 4),
+                slot_count=state.config.get_int("DETECTOR_SHARED_MEMORY_SLOTS", 16),
+                slot_size=state.config.get_int("DETECTOR_SHARED_MEMORY_SLOT_SIZE_MB", 8) * 1024 * 1024,
+            )
         else:
             raise ValueError("no_detector_specified")
+        self._object_detector = detector
+
+        # inference runs in dedicated bounded executor to keep event loop responsive
+        inference_workers = state.config.get_int("DETECTOR_INFERENCE_WORKERS", 2)
+        if isinstance(detector, detectors.ProcessPoolDetector):
+            # every worker process needs its own executor thread and batch in flight to be kept busy
+            inference_workers = detector.workers
+        max_batch_size = state.config.get_int("DETECTOR_BATCH_MAX_SIZE", 8)
+        self._inference_executor = ThreadPoolExecutor(max_workers=inference_workers, thread_name_prefix="inference")
+        self._detection_scheduler = DetectionBatchScheduler(
+            object_detector=detector,
+            executor=self._inference_executor,
+            max_batch_size=max_batch_size,
+            max_wait_time=state.config.get_int("DETECTOR_BATCH_MAX_WAIT_MS", 10) / 1000,
+            max_concurrent_batches=inference_workers,
+        )
+        await self._detection_scheduler.start()
+
+        # warm-up runs in background, service reports not ready until it finishes
+        detector_warm_up = DetectorWarmUp(
+            object_detector=detector,
+            executor=self._inference_executor,
+            executor_workers=inference_workers,
+            resolutions=[
+                tuple(int(size) for size in resolution.split("x"))
+                for resolution in state.config.get_list("DETECTOR_WARMUP_RESOLUTIONS", ",", ["1280x720"])
+            ],
+            batch_sizes=sorted({1, max_batch_size}),
+            iterations=state.config.get_int("DETECTOR_WARMUP_ITERATIONS", 2),
+            attempts=state.config.get_int("DETECTOR_WARMUP_ATTEMPTS", 3),
+            retry_delay=state.config.get_float("DETECTOR_WARMUP_RETRY_DELAY_S", 5.0),
+        )
+        self._warm_up_task = create_task(detector_warm_up.run())
         
         blob_storage_client = BlobStorageClient(config=state.config)
-        image_processor = ImageProcessor()
+        # JPEGs are decoded at reduced resolution as long as they stay at or above model input size
+        reduced_decode_min_size = state.config.get_int("DETECTOR_REDUCED_DECODE_MIN_SIZE", 640)
+        image_processor = ImageProcessor(reduced_decode_min_size=reduced_decode_min_size or None)
         file_storage = FileStorage(
             image_processor=image_processor,
             blob_storage_client=blob_storage_client,
             file_register_repository=file_register_repository
         )
-        image_analyzer = ImageAnalyzer(object_detector=detector, image_processor=image_processor)
+        mask_cache = MaskCache(
+            image_processor=image_processor,
+            max_size_bytes=state.config.get_int("MASK_CACHE_SIZE_MB", 256) * 1024 * 1024
+        )
+        # results of identical frames are reused, model ID keeps results of different models apart
+        result_cache_max_entries = state.config.get_int("RESULT_CACHE_MAX_ENTRIES", 10000)
+        result_cache = ResultCache(
+            model_id=f"{detector_used}:{state.config.get_config('DETECTOR_QUANTIZATION_MODE', '')}:{reduced_decode_min_size}",
+            max_entries=result_cache_max_entries,
+            ttl=state.config.get_float("RESULT_CACHE_TTL_S", 300.0),
+            disk_directory=state.config.get_config("RESULT_CACHE_DISK_DIR", "") or None,
+            max_disk_entries=state.config.get_int("RESULT_CACHE_MAX_DISK_ENTRIES", 100000),
+        ) if result_cache_max_entries > 0 else None
+        image_analyzer = ImageAnalyzer(
+            detection_scheduler=self._detection_scheduler,
+            image_processor=image_processor,
+            mask_cache=mask_cache,
+            result_cache=result_cache,
+            batch_max_images=state.config.get_int("BATCH_MAX_IMAGES", 32),
+            batch_max_in_flight_images=state.config.get_int("BATCH_MAX_IN_FLIGHT_IMAGES", 16),
+            video_max_in_flight_frames=state.config.get_int("VIDEO_MAX_IN_FLIGHT_FRAMES", 16),
+            stream_max_pending_frames=state.config.get_int("STREAM_MAX_PENDING_FRAMES", 1),
+            stream_change_threshold=state.config.get_float("STREAM_CHANGE_THRESHOLD", 0.0),
+            track_low_confidence=state.config.get_float("TRACKER_LOW_CONFIDENCE", 0.1),
+            track_max_lost=state.config.get_int("TRACKER_MAX_LOST", 30),
+            annotated_image_quality=state.config.get_int("ANNOTATED_IMAGE_QUALITY", 85),
+            annotated_image_max_size=state.config.get_int("ANNOTATED_IMAGE_MAX_SIZE", 1920)
+        )
+        # resolved configurations are kept per worker, TTL bounds staleness after changes made on other workers
+        config_cache_max_entries = state.config.get_int("CONFIG_CACHE_MAX_ENTRIES", 1000)
+        config_cache = ConfigCache(
+            max_entries=config_cache_max_entries,
+            ttl=state.config.get_float("CONFIG_CACHE_TTL_S", 60.0)
+        ) if config_cache_max_entries > 0 else None
         analyze_object_config_manager = AnalyzeObjectConfigManager(
-            frame_mask_repository=frame_mask_repository,
-            object_repository=object_repository,
-            object_analysis_config_repository=analysis_config_repository
+            object_analysis_config_repository=analysis_config_repository,
+            mask_cache=mask_cache,
+            config_cache=config_cache
         )
         authentication_manager = AuthenticationManager(
             config=state.config, 
@@ -85,6 +187,11 @@ class DetectorServiceInitializer(Initializer):
             **state,
             image_processor=image_processor,
             image_analyzer=image_analyzer,
+            detection_scheduler=self._detection_scheduler,
+            detector_warm_up=detector_warm_up,
+            mask_cache=mask_cache,
+            result_cache=result_cache,
+            config_cache=config_cache,
             analyze_object_config_manager=analyze_object_config_manager,
             authentication_manager=authentication_manager,
             blob_storage_client=blob_storage_client,
@@ -100,5 +207,18 @@ class DetectorServiceInitializer(Initializer):
     async def __aexit__(
         self, exc_type: Optional[Type[BaseException]], exc_val: Optional[BaseException], exc_tb: Optional[TracebackType]
     ) -> None:
+        if self._warm_up_task is not None:
+            self._warm_up_task.cancel()
+            try:
+                await self._warm_up_task
+            except CancelledError:
+                pass
+        if self._detection_scheduler is not None:
+            await self._detection_scheduler.stop()
+        if self._inference_executor is not None:
+            # wait for running forward passes without blocking the event loop
+            await to_thread(self._inference_executor.shutdown, wait=True, cancel_futures=True)
+        if self._object_detector is not None:
+            await to_thread(self._object_detector.close)
         await super().__aexit__(exc_type, exc_val, exc_tb)
         # self.logger.info("detector_service_stopped")
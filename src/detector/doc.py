@@ -7,3 +7,5 @@ class Tags(TagEnum):
     ACCOUNT = Tag(name="Account")
 
     IMAGE = Tag(name="Image")
+    VIDEO = Tag(name="Video")
+    STREAM = Tag(name="Stream")
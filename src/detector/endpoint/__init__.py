@@ -1,7 +1,7 @@
 from fastapi import APIRouter
 
-from . import health
-from .analyze import image as analyze_image
+from . import health, metrics
+from .analyze import image as analyze_image, video as analyze_video, stream as analyze_stream
 from .configure import (
     image as configure_image_analysis,
 )
@@ -12,7 +12,10 @@ main_router = APIRouter()
 
 # add endpoint routers
 main_router.include_router(analyze_image.router)
+main_router.include_router(analyze_video.router)
+main_router.include_router(analyze_stream.router)
 main_router.include_router(configure_image_analysis.router)
 main_router.include_router(health.router)
+main_router.include_router(metrics.router)
 main_router.include_router(account.router)
 main_router.include_router(authentication.router)
\ No newline at end of file
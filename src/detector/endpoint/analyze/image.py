@@ -1,5 +1,7 @@
-from typing import Annotated
+from typing import Annotated, AsyncIterator, Optional
+from numpy import ndarray
 from fastapi import APIRouter, UploadFile, Form, File, Security
+from fastapi.responses import StreamingResponse
 from uuid import UUID
 
 from common import Injects
@@ -8,9 +10,10 @@ from common import Injects
 from ...doc import Tags
 from ...authentication import authenticate
 from ...interface import AbstractImageAnalyzer, AbstractAnalyzeImageConfigManager
-from ...model.enum import AuthorizationScopeEnum
-from ...model.api import ObjectAnalysisConfigResponse, ObjectAnalysisConfigRequest, ObjectCountResponse, ObjectLocationResponse
+from ...model.enum import AuthorizationScopeEnum, ImageFormatEnum
+from ...model.api import ObjectAnalysisConfigResponse, ObjectAnalysisConfigRequest, ObjectCountResponse, ObjectLocationResponse, ObjectAnalysisResponse, ObjectCountBatchItemResponse, ObjectLocationBatchItemResponse
 from ...exception import AnalyzerException, AnalyzeBadRequestException, AnalyzeNotFoundException, ConfigureEntityNotFoundException, AccountUnAuthorizedException
+from .ndjson import to_ndjson
 
 router = APIRouter(tags=[Tags.ANALYZE, Tags.IMAGE], prefix="/v1/analyze/image")
 
@@ -65,4 +68,166 @@ async def locate_objects(
     except ConfigureEntityNotFoundException:
         raise AnalyzeNotFoundException(detail="configuration_entity_not_found")
     return await image_analyzer.locate_objects(file=file, object_analysis_config=analysis_config)
+
+
+@router.post(
+    path="/object/locate/annotated",
+    summary="Locate objects and return annotated image",
+    description="Locate objects in the provided image and return the image (JPEG or WebP) with bounding boxes and labels drawn on it. "
+        "Masked regions are blacked out. 'maxSize' returns a downscaled preview, size is also capped by the service.",
+    status_code=200,
+    response_class=StreamingResponse,
+    responses={
+        200: {"content": {"image/jpeg": {}, "image/webp": {}}},
+        400: {"model": AnalyzeBadRequestException.model},
+        401: {"model": AccountUnAuthorizedException.model},
+        404: {"model": AnalyzeNotFoundException.model},
+        500: {"model": AnalyzerException.model},
+    },
+)
+async def locate_objects_annotated(
+    file: Annotated[UploadFile, File(title="Detection image")],
+    account_id: UUID = Security(authenticate, scopes=[AuthorizationScopeEnum.ANALYZE.value]),
+    analysisConfigId: UUID = Form(UUID("3fa85f64-5717-4562-b3fc-2c963f66afa6"), title="Analysis configuration ID"),
+    imageFormat: ImageFormatEnum = Form(ImageFormatEnum.JPEG, title="Format of the annotated image"),
+    quality: Optional[int] = Form(None, ge=1, le=100, title="Encoding quality (1...100), defaults to service setting"),
+    maxSize: Optional[int] = Form(None, ge=16, title="Longer side of the annotated image in pixels, for downscaled preview"),
+    image_analyzer: AbstractImageAnalyzer = Injects("image_analyzer"),
+    analyze_object_config_manager: AbstractAnalyzeImageConfigManager[ObjectAnalysisConfigRequest, ObjectAnalysisConfigResponse] = Injects("analyze_object_config_manager"),
+) -> StreamingResponse:
+    try:
+        analysis_config = await analyze_object_config_manager.get_config(account_id=account_id, config_id=analysisConfigId)
+    except ConfigureEntityNotFoundException:
+        raise AnalyzeNotFoundException(detail="configuration_entity_not_found")
+    encoded_image = await image_analyzer.annotate_objects(
+        file=file,
+        object_analysis_config=analysis_config,
+        image_format=imageFormat,
+        quality=quality,
+        max_size=maxSize
+    )
+    return StreamingResponse(
+        _to_chunks(encoded_image.content),
+        media_type=encoded_image.media_type,
+        headers={"Content-Length": str(encoded_image.content.size)}
+    )
+
+
+@router.post(
+    path="/object/analyze",
+    summary="Count and locate objects",
+    description="Count and locate objects in the provided image with a single detection pass",
+    status_code=200,
+    responses={
+        400: {"model": AnalyzeBadRequestException.model},
+        401: {"model": AccountUnAuthorizedException.model},
+        404: {"model": AnalyzeNotFoundException.model},
+        500: {"model": AnalyzerException.model},
+    },
+)
+async def analyze_objects(
+    file: Annotated[UploadFile, File(title="Detection image")],
+    account_id: UUID = Security(authenticate, scopes=[AuthorizationScopeEnum.ANALYZE.value]),
+    analysisConfigId: UUID = Form(UUID("3fa85f64-5717-4562-b3fc-2c963f66afa6"), title="Analysis configuration ID"),
+    image_analyzer: AbstractImageAnalyzer = Injects("image_analyzer"),
+    analyze_object_config_manager: AbstractAnalyzeImageConfigManager[ObjectAnalysisConfigRequest, ObjectAnalysisConfigResponse] = Injects("analyze_object_config_manager"),
+) -> ObjectAnalysisResponse:
+    try:
+        analysis_config = await analyze_object_config_manager.get_config(account_id=account_id, config_id=analysisConfigId)
+    except ConfigureEntityNotFoundException:
+        raise AnalyzeNotFoundException(detail="configuration_entity_not_found")
+    return await image_analyzer.analyze_objects(file=file, object_analysis_config=analysis_config)
+
+
+@router.post(
+    path="/object/count/batch",
+    summary="Count objects on multiple images",
+    description="Count number of objects in each of the provided images, each image is analyzed with its own configuration. "
+        "Results are streamed as NDJSON (one JSON object per line) in order of completion, 'index' refers to image position in the request. "
+        "Number of images per request is limited by the service.",
+    status_code=200,
+    response_class=StreamingResponse,
+    responses={
+        200: {"model": ObjectCountBatchItemResponse, "content": {"application/x-ndjson": {}}},
+        400: {"model": AnalyzeBadRequestException.model},
+        401: {"model": AccountUnAuthorizedException.model},
+        404: {"model": AnalyzeNotFoundException.model},
+        500: {"model": AnalyzerException.model},
+    },
+)
+async def count_objects_batch(
+    files: Annotated[list[UploadFile], File(title="Detection images")],
+    analysisConfigIds: Annotated[list[UUID], Form(title="Analysis configuration ID for each image, in the same order as images")],
+    account_id: UUID = Security(authenticate, scopes=[AuthorizationScopeEnum.ANALYZE.value]),
+    image_analyzer: AbstractImageAnalyzer = Injects("image_analyzer"),
+    analyze_object_config_manager: AbstractAnalyzeImageConfigManager[ObjectAnalysisConfigRequest, ObjectAnalysisConfigResponse] = Injects("analyze_object_config_manager"),
+) -> StreamingResponse:
+    analysis_configs = await _get_batch_configs(
+        account_id=account_id,
+        config_ids=analysisConfigIds,
+        files=files,
+        analyze_object_config_manager=analyze_object_config_manager
+    )
+    results = await image_analyzer.count_objects_batch(files=files, object_analysis_configs=analysis_configs)
+    return StreamingResponse(to_ndjson(results), media_type="application/x-ndjson")
+
+
+@router.post(
+    path="/object/locate/batch",
+    summary="Locate objects on multiple images",
+    description="Locate objects in each of the provided images, each image is analyzed with its own configuration. "
+        "Results are streamed as NDJSON (one JSON object per line) in order of completion, 'index' refers to image position in the request. "
+        "Number of images per request is limited by the service.",
+    status_code=200,
+    response_class=StreamingResponse,
+    responses={
+        200: {"model": ObjectLocationBatchItemResponse, "content": {"application/x-ndjson": {}}},
+        400: {"model": AnalyzeBadRequestException.model},
+        401: {"model": AccountUnAuthorizedException.model},
+        404: {"model": AnalyzeNotFoundException.model},
+        500: {"model": AnalyzerException.model},
+    },
+)
+async def locate_objects_batch(
+    files: Annotated[list[UploadFile], File(title="Detection images")],
+    analysisConfigIds: Annotated[list[UUID], Form(title="Analysis configuration ID for each image, in the same order as images")],
+    account_id: UUID = Security(authenticate, scopes=[AuthorizationScopeEnum.ANALYZE.value]),
+    image_analyzer: AbstractImageAnalyzer = Injects("image_analyzer"),
+    analyze_object_config_manager: AbstractAnalyzeImageConfigManager[ObjectAnalysisConfigRequest, ObjectAnalysisConfigResponse] = Injects("analyze_object_config_manager"),
+) -> StreamingResponse:
+    analysis_configs = await _get_batch_configs(
+        account_id=account_id,
+        config_ids=analysisConfigIds,
+        files=files,
+        analyze_object_config_manager=analyze_object_config_manager
+    )
+    results = await image_analyzer.locate_objects_batch(files=files, object_analysis_configs=analysis_configs)
+    return StreamingResponse(to_ndjson(results), media_type="application/x-ndjson")
+
+
+async def _get_batch_configs(
+    account_id: UUID,
+    config_ids: list[UUID],
+    files: list[UploadFile],
+    analyze_object_config_manager: AbstractAnalyzeImageConfigManager[ObjectAnalysisConfigRequest, ObjectAnalysisConfigResponse],
+) -> list[ObjectAnalysisConfigResponse]:
+    if len(config_ids) != len(files):
+        raise AnalyzeBadRequestException(detail="analysis_config_ids_do_not_match_files")
+
+    # every distinct configuration is fetched only once
+    analysis_configs: dict[UUID, ObjectAnalysisConfigResponse] = {}
+    for config_id in dict.fromkeys(config_ids):
+        try:
+            analysis_configs[config_id] = await analyze_object_config_manager.get_config(account_id=account_id, config_id=config_id)
+        except ConfigureEntityNotFoundException:
+            raise AnalyzeNotFoundException(detail="configuration_entity_not_found")
+
+    return [analysis_configs[config_id] for config_id in config_ids]
+
+
+async def _to_chunks(content: ndarray, chunk_size: int = 64 * 1024) -> AsyncIterator[memoryview]:
+    # encoded image is sent in slices of its buffer, without copying it into bytes
+    buffer = memoryview(content)
+    for offset in range(0, len(buffer), chunk_size):
+        yield buffer[offset:offset + chunk_size]
 # endregion: image
\ No newline at end of file
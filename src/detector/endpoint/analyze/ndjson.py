@@ -0,0 +1,15 @@
+from typing import AsyncIterator
+from pydantic import BaseModel
+
+
+async def to_ndjson(results: AsyncIterator[BaseModel]) -> AsyncIterator[str]:
+    """
+    Serialize results to newline delimited JSON, one line per result, as they are produced.
+
+    :param results: Results to serialize
+    :type results: AsyncIterator[BaseModel]
+    :yield: JSON line of a single result
+    :rtype: AsyncIterator[str]
+    """
+    async for result in results:
+        yield result.model_dump_json(by_alias=True) + "\n"
@@ -0,0 +1,175 @@
+from asyncio import wait_for
+from contextlib import aclosing
+from functools import partial
+from typing import AsyncIterator, Optional
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect
+from pydantic import BaseModel, ValidationError
+from starlette.status import WS_1008_POLICY_VIOLATION
+
+from common import Injects
+from common.exception import HTTPException
+
+# local imports
+from ...doc import Tags
+from ...authentication import authenticate_credentials
+from ...database import APIKeyRepository, JWTRepository
+from ...interface import AbstractImageAnalyzer, AbstractAnalyzeImageConfigManager
+from ...model.enum import AuthorizationScopeEnum
+from ...model.api import ObjectAnalysisConfigResponse, ObjectAnalysisConfigRequest, StreamBindRequest, StreamBoundResponse
+from ...exception import ConfigureEntityNotFoundException
+
+router = APIRouter(tags=[Tags.ANALYZE, Tags.STREAM], prefix="/v1/analyze/stream")
+
+# seconds client has to send bind request after connecting
+BIND_TIMEOUT = 10.0
+
+# region: stream
+@router.websocket(path="/object/count")
+async def count_objects(
+    websocket: WebSocket,
+    image_analyzer: AbstractImageAnalyzer = Injects("image_analyzer"),
+    analyze_object_config_manager: AbstractAnalyzeImageConfigManager[ObjectAnalysisConfigRequest, ObjectAnalysisConfigResponse] = Injects("analyze_object_config_manager"),
+    api_key_repository: APIKeyRepository = Injects("api_key_repository"),
+    jwt_repository: JWTRepository = Injects("jwt_repository"),
+) -> None:
+    """
+    Count objects on frames of a continuous stream. First message (text) is 'StreamBindRequest',
+    which authenticates the client and binds analysis configuration for the whole connection.
+    Every following binary message is an encoded frame (JPEG or PNG), answered with a text
+    message 'StreamFrameCountResponse'. Frames are dropped when analysis falls behind.
+    """
+    bound_stream = await _bind_stream(
+        websocket=websocket,
+        analyze_object_config_manager=analyze_object_config_manager,
+        api_key_repository=api_key_repository,
+        jwt_repository=jwt_repository
+    )
+    if bound_stream is None:
+        return
+    bind_request, analysis_config = bound_stream
+
+    results = await image_analyzer.count_objects_stream(
+        receive_frame=partial(_receive_frame, websocket),
+        object_analysis_config=analysis_config,
+        change_threshold=bind_request.change_threshold
+    )
+    await _send_results(websocket=websocket, results=results)
+
+
+@router.websocket(path="/object/locate")
+async def locate_objects(
+    websocket: WebSocket,
+    image_analyzer: AbstractImageAnalyzer = Injects("image_analyzer"),
+    analyze_object_config_manager: AbstractAnalyzeImageConfigManager[ObjectAnalysisConfigRequest, ObjectAnalysisConfigResponse] = Injects("analyze_object_config_manager"),
+    api_key_repository: APIKeyRepository = Injects("api_key_repository"),
+    jwt_repository: JWTRepository = Injects("jwt_repository"),
+) -> None:
+    """
+    Locate objects on frames of a continuous stream. First message (text) is 'StreamBindRequest',
+    which authenticates the client and binds analysis configuration for the whole connection.
+    Every following binary message is an encoded frame (JPEG or PNG), answered with a text
+    message 'StreamFrameLocationResponse'. Frames are dropped when analysis falls behind.
+    """
+    bound_stream = await _bind_stream(
+        websocket=websocket,
+        analyze_object_config_manager=analyze_object_config_manager,
+        api_key_repository=api_key_repository,
+        jwt_repository=jwt_repository
+    )
+    if bound_stream is None:
+        return
+    bind_request, analysis_config = bound_stream
+
+    results = await image_analyzer.locate_objects_stream(
+        receive_frame=partial(_receive_frame, websocket),
+        object_analysis_config=analysis_config,
+        change_threshold=bind_request.change_threshold
+    )
+    await _send_results(websocket=websocket, results=results)
+
+
+
+@router.websocket(path="/object/track")
+async def track_objects(
+    websocket: WebSocket,
+    image_analyzer: AbstractImageAnalyzer = Injects("image_analyzer"),
+    analyze_object_config_manager: AbstractAnalyzeImageConfigManager[ObjectAnalysisConfigRequest, ObjectAnalysisConfigResponse] = Injects("analyze_object_config_manager"),
+    api_key_repository: APIKeyRepository = Injects("api_key_repository"),
+    jwt_repository: JWTRepository = Injects("jwt_repository"),
+) -> None:
+    """
+    Track objects across frames of a continuous stream. Protocol is the same as for counting,
+    frames are answered with 'StreamFrameTrackResponse' carrying persistent track IDs, unique
+    counts and entry/exit events. Detector runs on every 'detectionInterval'-th frame.
+    """
+    bound_stream = await _bind_stream(
+        websocket=websocket,
+        analyze_object_config_manager=analyze_object_config_manager,
+        api_key_repository=api_key_repository,
+        jwt_repository=jwt_repository
+    )
+    if bound_stream is None:
+        return
+    bind_request, analysis_config = bound_stream
+
+    results = await image_analyzer.track_objects_stream(
+        receive_frame=partial(_receive_frame, websocket),
+        object_analysis_config=analysis_config,
+        change_threshold=bind_request.change_threshold,
+        detection_interval=bind_request.detection_interval
+    )
+    await _send_results(websocket=websocket, results=results)
+
+
+async def _bind_stream(
+    websocket: WebSocket,
+    analyze_object_config_manager: AbstractAnalyzeImageConfigManager[ObjectAnalysisConfigRequest, ObjectAnalysisConfigResponse],
+    api_key_repository: APIKeyRepository,
+    jwt_repository: JWTRepository,
+) -> Optional[tuple[StreamBindRequest, ObjectAnalysisConfigResponse]]:
+    # authentication and configuration are resolved once and reused for every frame of the connection
+    await websocket.accept()
+    try:
+        bind_request = StreamBindRequest.model_validate_json(await wait_for(websocket.receive_text(), timeout=BIND_TIMEOUT))
+        account_id = await authenticate_credentials(
+            scopes=[AuthorizationScopeEnum.ANALYZE.value],
+            api_key=bind_request.api_key,
+            token=bind_request.access_token,
+            api_key_repository=api_key_repository,
+            jwt_repository=jwt_repository
+        )
+        analysis_config = await analyze_object_config_manager.get_config(account_id=account_id, config_id=bind_request.analysis_config_id)
+    except WebSocketDisconnect:
+        return None
+    except (TimeoutError, ValidationError, KeyError):  # KeyError: binary message instead of text
+        await websocket.close(code=WS_1008_POLICY_VIOLATION, reason="stream_bind_request_invalid")
+        return None
+    except ConfigureEntityNotFoundException:
+        await websocket.close(code=WS_1008_POLICY_VIOLATION, reason="configuration_entity_not_found")
+        return None
+    except HTTPException as err:
+        await websocket.close(code=WS_1008_POLICY_VIOLATION, reason=str(err.payload.detail))
+        return None
+
+    await websocket.send_text(StreamBoundResponse(analysis_config_id=analysis_config.id).model_dump_json(by_alias=True))
+    return bind_request, analysis_config
+
+
+async def _receive_frame(websocket: WebSocket) -> Optional[bytes]:
+    while True:
+        message = await websocket.receive()
+        if message["type"] == "websocket.disconnect":
+            return None
+        if message.get("bytes") is not None:
+            return message["bytes"]
+        # text messages are not expected after binding and are ignored
+
+
+async def _send_results(websocket: WebSocket, results: AsyncIterator[BaseModel]) -> None:
+    async with aclosing(results):
+        try:
+            async for result in results:
+                await websocket.send_text(result.model_dump_json(by_alias=True))
+        except WebSocketDisconnect:
+            pass
+# endregion: stream
@@ -0,0 +1,118 @@
+from typing import Annotated
+from fastapi import APIRouter, UploadFile, Form, File, Security
+from fastapi.responses import StreamingResponse
+from uuid import UUID
+
+from common import Injects
+
+# local imports
+from ...doc import Tags
+from ...authentication import authenticate
+from ...interface import AbstractImageAnalyzer, AbstractAnalyzeImageConfigManager
+from ...model.enum import AuthorizationScopeEnum
+from ...model.api import ObjectAnalysisConfigResponse, ObjectAnalysisConfigRequest, VideoFrameCountResponse, VideoFrameLocationResponse, VideoFrameTrackResponse
+from ...exception import AnalyzerException, AnalyzeBadRequestException, AnalyzeNotFoundException, ConfigureEntityNotFoundException, AccountUnAuthorizedException
+from .ndjson import to_ndjson
+
+router = APIRouter(tags=[Tags.ANALYZE, Tags.VIDEO], prefix="/v1/analyze/video")
+
+# region: video
+@router.post(
+    path="/object/count",
+    summary="Count objects in video",
+    description="Count number of objects on frames sampled from the provided video (MP4 or MJPEG). "
+        "Results are streamed as NDJSON (one JSON object per line) in order of frames, while the video is still being analyzed.",
+    status_code=200,
+    response_class=StreamingResponse,
+    responses={
+        200: {"model": VideoFrameCountResponse, "content": {"application/x-ndjson": {}}},
+        400: {"model": AnalyzeBadRequestException.model},
+        401: {"model": AccountUnAuthorizedException.model},
+        404: {"model": AnalyzeNotFoundException.model},
+        500: {"model": AnalyzerException.model},
+    },
+)
+async def count_objects(
+    file: Annotated[UploadFile, File(title="Detection video")],
+    account_id: UUID = Security(authenticate, scopes=[AuthorizationScopeEnum.ANALYZE.value]),
+    analysisConfigId: UUID = Form(UUID("3fa85f64-5717-4562-b3fc-2c963f66afa6"), title="Analysis configuration ID"),
+    sampleFps: float = Form(1.0, gt=0, le=60, title="Number of frames per second of video to analyze"),
+    image_analyzer: AbstractImageAnalyzer = Injects("image_analyzer"),
+    analyze_object_config_manager: AbstractAnalyzeImageConfigManager[ObjectAnalysisConfigRequest, ObjectAnalysisConfigResponse] = Injects("analyze_object_config_manager"),
+) -> StreamingResponse:
+    try:
+        analysis_config = await analyze_object_config_manager.get_config(account_id=account_id, config_id=analysisConfigId)
+    except ConfigureEntityNotFoundException:
+        raise AnalyzeNotFoundException(detail="configuration_entity_not_found")
+    results = await image_analyzer.count_objects_video(file=file, object_analysis_config=analysis_config, sample_fps=sampleFps)
+    return StreamingResponse(to_ndjson(results), media_type="application/x-ndjson")
+
+
+@router.post(
+    path="/object/locate",
+    summary="Locate objects in video",
+    description="Locate objects on frames sampled from the provided video (MP4 or MJPEG). "
+        "Results are streamed as NDJSON (one JSON object per line) in order of frames, while the video is still being analyzed.",
+    status_code=200,
+    response_class=StreamingResponse,
+    responses={
+        200: {"model": VideoFrameLocationResponse, "content": {"application/x-ndjson": {}}},
+        400: {"model": AnalyzeBadRequestException.model},
+        401: {"model": AccountUnAuthorizedException.model},
+        404: {"model": AnalyzeNotFoundException.model},
+        500: {"model": AnalyzerException.model},
+    },
+)
+async def locate_objects(
+    file: Annotated[UploadFile, File(title="Detection video")],
+    account_id: UUID = Security(authenticate, scopes=[AuthorizationScopeEnum.ANALYZE.value]),
+    analysisConfigId: UUID = Form(UUID("3fa85f64-5717-4562-b3fc-2c963f66afa6"), title="Analysis configuration ID"),
+    sampleFps: float = Form(1.0, gt=0, le=60, title="Number of frames per second of video to analyze"),
+    image_analyzer: AbstractImageAnalyzer = Injects("image_analyzer"),
+    analyze_object_config_manager: AbstractAnalyzeImageConfigManager[ObjectAnalysisConfigRequest, ObjectAnalysisConfigResponse] = Injects("analyze_object_config_manager"),
+) -> StreamingResponse:
+    try:
+        analysis_config = await analyze_object_config_manager.get_config(account_id=account_id, config_id=analysisConfigId)
+    except ConfigureEntityNotFoundException:
+        raise AnalyzeNotFoundException(detail="configuration_entity_not_found")
+    results = await image_analyzer.locate_objects_video(file=file, object_analysis_config=analysis_config, sample_fps=sampleFps)
+    return StreamingResponse(to_ndjson(results), media_type="application/x-ndjson")
+
+
+@router.post(
+    path="/object/track",
+    summary="Track objects in video",
+    description="Track objects across frames sampled from the provided video (MP4 or MJPEG), objects keep their track ID while visible. "
+        "Detector runs on every 'detectionInterval'-th sampled frame and tracks are propagated on frames in between. "
+        "Results include number of distinct objects seen so far and entry/exit events, streamed as NDJSON in order of frames.",
+    status_code=200,
+    response_class=StreamingResponse,
+    responses={
+        200: {"model": VideoFrameTrackResponse, "content": {"application/x-ndjson": {}}},
+        400: {"model": AnalyzeBadRequestException.model},
+        401: {"model": AccountUnAuthorizedException.model},
+        404: {"model": AnalyzeNotFoundException.model},
+        500: {"model": AnalyzerException.model},
+    },
+)
+async def track_objects(
+    file: Annotated[UploadFile, File(title="Detection video")],
+    account_id: UUID = Security(authenticate, scopes=[AuthorizationScopeEnum.ANALYZE.value]),
+    analysisConfigId: UUID = Form(UUID("3fa85f64-5717-4562-b3fc-2c963f66afa6"), title="Analysis configuration ID"),
+    sampleFps: float = Form(5.0, gt=0, le=60, title="Number of frames per second of video to analyze"),
+    detectionInterval: int = Form(1, ge=1, le=100, title="Detector runs on every N-th sampled frame"),
+    image_analyzer: AbstractImageAnalyzer = Injects("image_analyzer"),
+    analyze_object_config_manager: AbstractAnalyzeImageConfigManager[ObjectAnalysisConfigRequest, ObjectAnalysisConfigResponse] = Injects("analyze_object_config_manager"),
+) -> StreamingResponse:
+    try:
+        analysis_config = await analyze_object_config_manager.get_config(account_id=account_id, config_id=analysisConfigId)
+    except ConfigureEntityNotFoundException:
+        raise AnalyzeNotFoundException(detail="configuration_entity_not_found")
+    results = await image_analyzer.track_objects_video(
+        file=file,
+        object_analysis_config=analysis_config,
+        sample_fps=sampleFps,
+        detection_interval=detectionInterval
+    )
+    return StreamingResponse(to_ndjson(results), media_type="application/x-ndjson")
+# endregion: video
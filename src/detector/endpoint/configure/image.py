@@ -1,6 +1,6 @@
 from typing import Annotated
 from fastapi import APIRouter, Security, Response, UploadFile, File
-from uuid import UUID, uuid4
+from uuid import UUID
 
 from common import Injects
 
@@ -10,7 +10,6 @@ from ...doc import Tags
 from ...model.enum import AuthorizationScopeEnum
 from ...interface import AbstractAnalyzeImageConfigManager, AbstractImageProcessor, AbstractFileStorage
 from ...model.api import ObjectAnalysisConfigRequest, ObjectAnalysisConfigResponse, FileUploadResponse
-from ...model.dto import FileContainerDto
 from ...exception import AnalyzerException, FileNotFound, ConfigureImageNotFoundException, ConfigureBadRequestException, ConfigureEntityNotFoundException, AccountUnAuthorizedException
 
 router = APIRouter(tags=[Tags.CONFIGURE, Tags.IMAGE], prefix="/v1/configure/image")
@@ -139,15 +138,10 @@ async def upload(
     if not image_processor.is_allowed_type(file=file):
         raise ConfigureBadRequestException()
     
-    data = await file.read()
     suffix = image_processor.get_image_type(file=file)
 
-    file_container = FileContainerDto(
-        file_id=uuid4(),
-        data_format=suffix,
-        data=data
-    )
-    stored_file_id = await file_storage.store_file(account_id=account_id, file=file_container)
+    # upload spool is streamed to storage as is, without reading it into memory
+    stored_file_id = await file_storage.store_stream(account_id=account_id, data_format=suffix, stream=file.file)
 
     return FileUploadResponse(file_id=stored_file_id)
 
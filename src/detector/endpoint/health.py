@@ -1,9 +1,27 @@
 from fastapi import APIRouter
 from fastapi.responses import PlainTextResponse
 
+from common import Injects
+
+# local imports
+from ..interface import AbstractDetectorWarmUp
+
 router = APIRouter()
 
 
 @router.get("/health", include_in_schema=False, response_class=PlainTextResponse)
 async def get_health() -> PlainTextResponse:
-    return PlainTextResponse("OK")
\ No newline at end of file
+    return PlainTextResponse("OK")
+
+
+@router.get("/ready", include_in_schema=False, response_class=PlainTextResponse)
+async def get_readiness(
+    detector_warm_up: AbstractDetectorWarmUp = Injects("detector_warm_up"),
+) -> PlainTextResponse:
+    # load balancer should only send traffic to instances with warmed up detector
+    if not detector_warm_up.is_ready:
+        return PlainTextResponse("NOT_READY", status_code=503)
+    # warm-up gave up, instance serves traffic but first requests pay for detector initialization
+    if detector_warm_up.get_metrics().degraded:
+        return PlainTextResponse("DEGRADED")
+    return PlainTextResponse("OK")
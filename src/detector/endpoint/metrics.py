@@ -0,0 +1,30 @@
+from typing import Optional
+from fastapi import APIRouter
+
+from common import Injects
+
+# local imports
+from ..interface import AbstractImageAnalyzer, AbstractDetectionScheduler, AbstractDetectorWarmUp, AbstractMaskCache, AbstractResultCache, AbstractConfigCache
+from ..model.api import ServiceMetricsResponse
+
+router = APIRouter()
+
+
+@router.get("/metrics", include_in_schema=False)
+async def get_metrics(
+    detection_scheduler: AbstractDetectionScheduler = Injects("detection_scheduler"),
+    detector_warm_up: AbstractDetectorWarmUp = Injects("detector_warm_up"),
+    mask_cache: AbstractMaskCache = Injects("mask_cache"),
+    result_cache: Optional[AbstractResultCache] = Injects("result_cache"),
+    config_cache: Optional[AbstractConfigCache] = Injects("config_cache"),
+    image_analyzer: AbstractImageAnalyzer = Injects("image_analyzer"),
+) -> ServiceMetricsResponse:
+    return ServiceMetricsResponse(
+        detection_batching=detection_scheduler.get_metrics(),
+        warm_up=detector_warm_up.get_metrics(),
+        mask_cache=mask_cache.get_metrics(),
+        stream=image_analyzer.get_stream_metrics(),
+        result_cache=result_cache.get_metrics() if result_cache is not None else None,
+        result_disk_cache=result_cache.get_disk_metrics() if result_cache is not None else None,
+        config_cache=config_cache.get_metrics() if config_cache is not None else None,
+    )
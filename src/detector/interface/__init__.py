@@ -1,2 +1,2 @@
-from .service import AbstractImageProcessor, AbstractAnalyzeImageConfigManager, AbstractImageAnalyzer, AbstractBlobStorageClient, AbstractFileStorage
+from .service import AbstractImageProcessor, AbstractAnalyzeImageConfigManager, AbstractImageAnalyzer, AbstractBlobStorageClient, AbstractFileStorage, AbstractDetectionScheduler, AbstractDetectorWarmUp, AbstractMaskCache, AbstractResultCache, AbstractConfigCache
 from .detector import AbstractObjectDetector
\ No newline at end of file
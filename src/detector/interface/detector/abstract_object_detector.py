@@ -12,7 +12,59 @@ class AbstractObjectDetector(ABC):
     @abstractmethod
     def count(self, image: ndarray, objects: list[ObjectEnum], confidence: Optional[int] = None) -> dict[ObjectEnum, int]:
         raise NotImplementedError()
-    
+
     @abstractmethod
     def detect(self, image: ndarray, objects: list[ObjectEnum], confidence: Optional[int] = None) -> dict[ObjectEnum, list[ObjectBoundingBoxDto]]:
-        raise NotImplementedError()
\ No newline at end of file
+        raise NotImplementedError()
+
+    def detect_batch(
+        self,
+        images: list[ndarray],
+        objects: list[list[ObjectEnum]],
+        confidences: list[Optional[int]]
+    ) -> list[dict[ObjectEnum, list[ObjectBoundingBoxDto]]]:
+        """
+        Detect objects on multiple images. Objects and confidence are specified per image and
+        results are returned in the same order as images. Detectors which can run a single
+        batched forward pass should override this, default implementation detects image by image.
+
+        :param images: Images to detect objects on
+        :type images: list[ndarray]
+        :param objects: Objects of interest for each image
+        :type objects: list[list[ObjectEnum]]
+        :param confidences: Confidence level for each image, 'None' to use detector default
+        :type confidences: list[Optional[int]]
+        :return: Detected objects grouped by object type for each image
+        :rtype: list[dict[ObjectEnum, list[ObjectBoundingBoxDto]]]
+        """
+        return [
+            self.detect(image=image, objects=image_objects, confidence=confidence)
+            for image, image_objects, confidence in zip(images, objects, confidences)
+        ]
+
+    def warm_up(
+        self,
+        images: list[ndarray],
+        objects: list[list[ObjectEnum]],
+        confidences: list[Optional[int]]
+    ) -> None:
+        """
+        Run warm-up detection, results are discarded. Detectors which spread work across
+        multiple workers (e.g. processes) should override this so that every worker runs it,
+        default implementation runs a single detection batch.
+
+        :param images: Images to detect objects on
+        :type images: list[ndarray]
+        :param objects: Objects of interest for each image
+        :type objects: list[list[ObjectEnum]]
+        :param confidences: Confidence level for each image, 'None' to use detector default
+        :type confidences: list[Optional[int]]
+        """
+        self.detect_batch(images=images, objects=objects, confidences=confidences)
+
+    def close(self) -> None:
+        """
+        Release resources held by the detector (e.g. worker processes). Detectors which
+        hold no such resources don't need to override this.
+        """
+        pass
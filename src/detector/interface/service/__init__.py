@@ -2,4 +2,9 @@ from .abstract_image_processor import AbstractImageProcessor
 from .abstract_analyzer_image_config_manager import AbstractAnalyzeImageConfigManager
 from .abstract_image_analyzer import AbstractImageAnalyzer
 from .abstract_blob_storage_client import AbstractBlobStorageClient
-from .abstract_file_storage import AbstractFileStorage
\ No newline at end of file
+from .abstract_file_storage import AbstractFileStorage
+from .abstract_detection_scheduler import AbstractDetectionScheduler
+from .abstract_detector_warm_up import AbstractDetectorWarmUp
+from .abstract_mask_cache import AbstractMaskCache
+from .abstract_result_cache import AbstractResultCache
+from .abstract_config_cache import AbstractConfigCache
@@ -1,3 +1,4 @@
+from typing import BinaryIO
 from abc import ABC, abstractmethod
 
 # local imports
@@ -17,6 +18,20 @@ class AbstractBlobStorageClient(ABC):
         """
         raise NotImplementedError()
     
+    @abstractmethod
+    async def upload_stream(self, blob_path: str, stream: BinaryIO) -> None:
+        """
+        Upload file-like object to storage account, content is streamed from the object
+        instead of being read into memory first.
+
+        :param blob_path: Blob file path in storage account
+        :type blob_path: str
+        :param stream: Readable and seekable binary file-like object
+        :type stream: BinaryIO
+        :raises UploadFailed: If any issues with uploading the blob file
+        """
+        raise NotImplementedError()
+
     @abstractmethod
     async def download(self, path: str) -> BlobFileContainerDto:
         """
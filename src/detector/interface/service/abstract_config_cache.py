@@ -0,0 +1,58 @@
+from typing import Optional
+from abc import ABC, abstractmethod
+from uuid import UUID
+
+# local imports
+from ...model.api import ObjectAnalysisConfigResponse, CacheMetricsResponse
+
+
+class AbstractConfigCache(ABC):
+
+    @property
+    @abstractmethod
+    def generation(self) -> int:
+        """
+        Number of invalidations so far, taken before configuration is loaded and passed to 'put',
+        so that configuration loaded before it was changed is never cached.
+        """
+        raise NotImplementedError()
+
+    @abstractmethod
+    def get(self, config_id: UUID) -> Optional[tuple[UUID, ObjectAnalysisConfigResponse]]:
+        """
+        Get cached analysis configuration together with ID of the account owning it.
+
+        :param config_id: Analysis configuration ID
+        :type config_id: UUID
+        :return: Owner account ID and configuration, 'None' if not cached
+        :rtype: Optional[tuple[UUID, ObjectAnalysisConfigResponse]]
+        """
+        raise NotImplementedError()
+
+    @abstractmethod
+    def put(self, account_id: UUID, object_analysis_config: ObjectAnalysisConfigResponse, generation: int) -> None:
+        """
+        Cache analysis configuration loaded from the database.
+
+        :param account_id: ID of the account owning the configuration
+        :type account_id: UUID
+        :param object_analysis_config: Analysis configuration
+        :type object_analysis_config: ObjectAnalysisConfigResponse
+        :param generation: 'generation' taken before configuration was loaded
+        :type generation: int
+        """
+        raise NotImplementedError()
+
+    @abstractmethod
+    def invalidate(self, config_id: UUID) -> None:
+        """
+        Drop cached configuration, must be called when configuration changes.
+
+        :param config_id: Analysis configuration ID
+        :type config_id: UUID
+        """
+        raise NotImplementedError()
+
+    @abstractmethod
+    def get_metrics(self) -> CacheMetricsResponse:
+        raise NotImplementedError()
@@ -0,0 +1,65 @@
+from typing import Optional
+from abc import ABC, abstractmethod
+from numpy import ndarray
+
+# local imports
+from ...model.enum import ObjectEnum
+from ...model.dto import ObjectBoundingBoxDto
+from ...model.api import DetectionBatchMetricsResponse
+
+
+class AbstractDetectionScheduler(ABC):
+
+    @abstractmethod
+    async def count(self, image: ndarray, objects: list[ObjectEnum], confidence: Optional[int] = None) -> dict[ObjectEnum, int]:
+        """
+        Schedule counting of objects on the image.
+
+        :param image: Image to count objects on
+        :type image: ndarray
+        :param objects: Objects of interest
+        :type objects: list[ObjectEnum]
+        :param confidence: Confidence level, defaults to detector default
+        :type confidence: Optional[int], optional
+        :return: Number of objects found per object type
+        :rtype: dict[ObjectEnum, int]
+        """
+        raise NotImplementedError()
+
+    @abstractmethod
+    async def detect(self, image: ndarray, objects: list[ObjectEnum], confidence: Optional[int] = None) -> dict[ObjectEnum, list[ObjectBoundingBoxDto]]:
+        """
+        Schedule detection of objects on the image.
+
+        :param image: Image to detect objects on
+        :type image: ndarray
+        :param objects: Objects of interest
+        :type objects: list[ObjectEnum]
+        :param confidence: Confidence level, defaults to detector default
+        :type confidence: Optional[int], optional
+        :return: Detected objects grouped by object type
+        :rtype: dict[ObjectEnum, list[ObjectBoundingBoxDto]]
+        """
+        raise NotImplementedError()
+
+    @abstractmethod
+    async def detect_batch(self, images: list[ndarray], objects: list[ObjectEnum], confidence: Optional[int] = None) -> list[dict[ObjectEnum, list[ObjectBoundingBoxDto]]]:
+        """
+        Schedule detection of objects on several related images (e.g. tiles of a frame) at once.
+        Images are queued together, so they are run in the same forward pass whenever they fit
+        into a batch.
+
+        :param images: Images to detect objects on
+        :type images: list[ndarray]
+        :param objects: Objects of interest, same for all images
+        :type objects: list[ObjectEnum]
+        :param confidence: Confidence level, defaults to detector default
+        :type confidence: Optional[int], optional
+        :return: Detected objects grouped by object type, in order of images
+        :rtype: list[dict[ObjectEnum, list[ObjectBoundingBoxDto]]]
+        """
+        raise NotImplementedError()
+
+    @abstractmethod
+    def get_metrics(self) -> DetectionBatchMetricsResponse:
+        raise NotImplementedError()
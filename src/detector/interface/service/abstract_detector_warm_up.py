@@ -0,0 +1,27 @@
+from abc import ABC, abstractmethod
+
+# local imports
+from ...model.api import DetectorWarmUpMetricsResponse
+
+
+class AbstractDetectorWarmUp(ABC):
+
+    @property
+    @abstractmethod
+    def is_ready(self) -> bool:
+        """
+        Whether warm-up finished and service should accept traffic. Also true when warm-up
+        gave up after failed attempts and detector is cold.
+        """
+        raise NotImplementedError()
+
+    @abstractmethod
+    async def run(self) -> None:
+        """
+        Run warm-up inferences. Service should report not ready until this finishes.
+        """
+        raise NotImplementedError()
+
+    @abstractmethod
+    def get_metrics(self) -> DetectorWarmUpMetricsResponse:
+        raise NotImplementedError()
@@ -1,4 +1,5 @@
 from uuid import UUID
+from typing import BinaryIO
 from abc import ABC, abstractmethod
 
 from common.exception.repository_exception import NotFoundException
@@ -26,6 +27,24 @@ class AbstractFileStorage():
         """
         raise NotImplementedError()
 
+    @abstractmethod
+    async def store_stream(self, account_id: UUID, data_format: str, stream: BinaryIO) -> UUID:
+        """
+        Persistent storage of a file-like object (e.g. upload spool), content is streamed
+        to storage without being copied into memory first
+
+        :param account_id: Account ID, each file must be related to account
+        :type account_id: UUID
+        :param data_format: Data format (file suffix)
+        :type data_format: str
+        :param stream: Readable and seekable binary file-like object
+        :type stream: BinaryIO
+        :raises FileStoringFailed: If any issues with storing the file
+        :return: File ID in storage, can be used to fetch it later
+        :rtype: UUID
+        """
+        raise NotImplementedError()
+
     @abstractmethod
     async def fetch_file(self, account_id: UUID, file_id: UUID) -> FileContainerDto:
         """
@@ -1,7 +1,10 @@
+from typing import AsyncIterator, Awaitable, Callable, Optional
 from abc import ABC, abstractmethod
 from fastapi import UploadFile
 
-from ...model.api import ObjectCountResponse, ObjectLocationResponse, ObjectAnalysisConfigResponse
+from ...model.enum import ImageFormatEnum
+from ...model.dto import EncodedImageDto
+from ...model.api import ObjectCountResponse, ObjectLocationResponse, ObjectAnalysisResponse, ObjectAnalysisConfigResponse, ObjectCountBatchItemResponse, ObjectLocationBatchItemResponse, VideoFrameCountResponse, VideoFrameLocationResponse, VideoFrameTrackResponse, StreamFrameCountResponse, StreamFrameLocationResponse, StreamFrameTrackResponse, StreamMetricsResponse
 
 
 class AbstractImageAnalyzer(ABC):
@@ -12,4 +15,207 @@ class AbstractImageAnalyzer(ABC):
     
     @abstractmethod
     async def locate_objects(self, file: UploadFile, object_analysis_config: ObjectAnalysisConfigResponse) -> list[ObjectLocationResponse]:
-        raise NotImplementedError()
\ No newline at end of file
+        raise NotImplementedError()
+
+    @abstractmethod
+    async def analyze_objects(self, file: UploadFile, object_analysis_config: ObjectAnalysisConfigResponse) -> ObjectAnalysisResponse:
+        raise NotImplementedError()
+
+    @abstractmethod
+    async def annotate_objects(
+        self,
+        file: UploadFile,
+        object_analysis_config: ObjectAnalysisConfigResponse,
+        image_format: ImageFormatEnum = ImageFormatEnum.JPEG,
+        quality: Optional[int] = None,
+        max_size: Optional[int] = None
+    ) -> EncodedImageDto:
+        """
+        Locate objects in the image and return the image with bounding boxes drawn on it.
+
+        :param file: Uploaded image
+        :type file: UploadFile
+        :param object_analysis_config: Analysis configuration
+        :type object_analysis_config: ObjectAnalysisConfigResponse
+        :param image_format: Format of the annotated image, defaults to JPEG
+        :type image_format: ImageFormatEnum, optional
+        :param quality: Encoding quality (1...100), defaults to service setting
+        :type quality: Optional[int], optional
+        :param max_size: Longer side of annotated image (pixels) for a downscaled preview, capped by
+            service setting which is also the default
+        :type max_size: Optional[int], optional
+        :return: Encoded annotated image
+        :rtype: EncodedImageDto
+        """
+        raise NotImplementedError()
+
+    @abstractmethod
+    async def count_objects_batch(self, files: list[UploadFile], object_analysis_configs: list[ObjectAnalysisConfigResponse]) -> AsyncIterator[ObjectCountBatchItemResponse]:
+        """
+        Count objects on multiple images, each analyzed with its own configuration. Images are
+        decoded before this returns, so uploaded files can be closed while results are iterated.
+
+        :param files: Uploaded images
+        :type files: list[UploadFile]
+        :param object_analysis_configs: Analysis configuration for each image
+        :type object_analysis_configs: list[ObjectAnalysisConfigResponse]
+        :raises AnalyzeBadRequestException: If there are more images than allowed in a batch
+        :return: Result for each image in order of completion
+        :rtype: AsyncIterator[ObjectCountBatchItemResponse]
+        """
+        raise NotImplementedError()
+
+    @abstractmethod
+    async def locate_objects_batch(self, files: list[UploadFile], object_analysis_configs: list[ObjectAnalysisConfigResponse]) -> AsyncIterator[ObjectLocationBatchItemResponse]:
+        """
+        Locate objects on multiple images, each analyzed with its own configuration. Images are
+        decoded before this returns, so uploaded files can be closed while results are iterated.
+
+        :param files: Uploaded images
+        :type files: list[UploadFile]
+        :param object_analysis_configs: Analysis configuration for each image
+        :type object_analysis_configs: list[ObjectAnalysisConfigResponse]
+        :raises AnalyzeBadRequestException: If there are more images than allowed in a batch
+        :return: Result for each image in order of completion
+        :rtype: AsyncIterator[ObjectLocationBatchItemResponse]
+        """
+        raise NotImplementedError()
+
+    @abstractmethod
+    async def count_objects_video(self, file: UploadFile, object_analysis_config: ObjectAnalysisConfigResponse, sample_fps: float) -> AsyncIterator[VideoFrameCountResponse]:
+        """
+        Count objects on frames sampled from the video. Video is validated and opened before
+        this returns, frames are decoded and analyzed while results are iterated.
+
+        :param file: Uploaded video
+        :type file: UploadFile
+        :param object_analysis_config: Analysis configuration applied to every frame
+        :type object_analysis_config: ObjectAnalysisConfigResponse
+        :param sample_fps: Number of frames per second of video to analyze
+        :type sample_fps: float
+        :return: Result for each sampled frame in order of frames
+        :rtype: AsyncIterator[VideoFrameCountResponse]
+        """
+        raise NotImplementedError()
+
+    @abstractmethod
+    async def locate_objects_video(self, file: UploadFile, object_analysis_config: ObjectAnalysisConfigResponse, sample_fps: float) -> AsyncIterator[VideoFrameLocationResponse]:
+        """
+        Locate objects on frames sampled from the video. Video is validated and opened before
+        this returns, frames are decoded and analyzed while results are iterated.
+
+        :param file: Uploaded video
+        :type file: UploadFile
+        :param object_analysis_config: Analysis configuration applied to every frame
+        :type object_analysis_config: ObjectAnalysisConfigResponse
+        :param sample_fps: Number of frames per second of video to analyze
+        :type sample_fps: float
+        :return: Result for each sampled frame in order of frames
+        :rtype: AsyncIterator[VideoFrameLocationResponse]
+        """
+        raise NotImplementedError()
+
+    @abstractmethod
+    async def track_objects_video(
+        self,
+        file: UploadFile,
+        object_analysis_config: ObjectAnalysisConfigResponse,
+        sample_fps: float,
+        detection_interval: int = 1
+    ) -> AsyncIterator[VideoFrameTrackResponse]:
+        """
+        Track objects across frames sampled from the video, assigning persistent track IDs per
+        object type and reporting unique counts and entry/exit events.
+
+        :param file: Uploaded video
+        :type file: UploadFile
+        :param object_analysis_config: Analysis configuration applied to every frame
+        :type object_analysis_config: ObjectAnalysisConfigResponse
+        :param sample_fps: Number of frames per second of video to analyze
+        :type sample_fps: float
+        :param detection_interval: Detector runs on every N-th sampled frame, tracks are propagated on frames in between, defaults to 1
+        :type detection_interval: int, optional
+        :return: Result for each sampled frame in order of frames
+        :rtype: AsyncIterator[VideoFrameTrackResponse]
+        """
+        raise NotImplementedError()
+
+    @abstractmethod
+    async def count_objects_stream(
+        self,
+        receive_frame: Callable[[], Awaitable[Optional[bytes]]],
+        object_analysis_config: ObjectAnalysisConfigResponse,
+        change_threshold: Optional[float] = None
+    ) -> AsyncIterator[StreamFrameCountResponse]:
+        """
+        Count objects on frames of a continuous stream. Frames are received in the background
+        while a frame is analyzed; when analysis falls behind, stale frames are dropped and only
+        the most recent ones are analyzed.
+
+        :param receive_frame: Returns next encoded frame, 'None' when stream has ended
+        :type receive_frame: Callable[[], Awaitable[Optional[bytes]]]
+        :param object_analysis_config: Analysis configuration applied to every frame
+        :type object_analysis_config: ObjectAnalysisConfigResponse
+        :param change_threshold: Smallest change of the visible region since last analyzed frame for which
+            frame is analyzed again, smaller changes reuse previous result. 0 analyzes every frame, defaults
+            to service setting
+        :type change_threshold: Optional[float], optional
+        :return: Result for each analyzed frame
+        :rtype: AsyncIterator[StreamFrameCountResponse]
+        """
+        raise NotImplementedError()
+
+    @abstractmethod
+    async def locate_objects_stream(
+        self,
+        receive_frame: Callable[[], Awaitable[Optional[bytes]]],
+        object_analysis_config: ObjectAnalysisConfigResponse,
+        change_threshold: Optional[float] = None
+    ) -> AsyncIterator[StreamFrameLocationResponse]:
+        """
+        Locate objects on frames of a continuous stream. Frames are received in the background
+        while a frame is analyzed; when analysis falls behind, stale frames are dropped and only
+        the most recent ones are analyzed.
+
+        :param receive_frame: Returns next encoded frame, 'None' when stream has ended
+        :type receive_frame: Callable[[], Awaitable[Optional[bytes]]]
+        :param object_analysis_config: Analysis configuration applied to every frame
+        :type object_analysis_config: ObjectAnalysisConfigResponse
+        :param change_threshold: Smallest change of the visible region since last analyzed frame for which
+            frame is analyzed again, smaller changes reuse previous result. 0 analyzes every frame, defaults
+            to service setting
+        :type change_threshold: Optional[float], optional
+        :return: Result for each analyzed frame
+        :rtype: AsyncIterator[StreamFrameLocationResponse]
+        """
+        raise NotImplementedError()
+
+    @abstractmethod
+    async def track_objects_stream(
+        self,
+        receive_frame: Callable[[], Awaitable[Optional[bytes]]],
+        object_analysis_config: ObjectAnalysisConfigResponse,
+        change_threshold: Optional[float] = None,
+        detection_interval: int = 1
+    ) -> AsyncIterator[StreamFrameTrackResponse]:
+        """
+        Track objects across frames of a continuous stream, assigning persistent track IDs per
+        object type and reporting unique counts and entry/exit events.
+
+        :param receive_frame: Returns next encoded frame, 'None' when stream has ended
+        :type receive_frame: Callable[[], Awaitable[Optional[bytes]]]
+        :param object_analysis_config: Analysis configuration applied to every frame
+        :type object_analysis_config: ObjectAnalysisConfigResponse
+        :param change_threshold: Smallest change of the visible region since last analyzed frame for which
+            frame is analyzed again, tracks are only propagated on other frames. Defaults to service setting
+        :type change_threshold: Optional[float], optional
+        :param detection_interval: Detector runs on every N-th frame, tracks are propagated on frames in between, defaults to 1
+        :type detection_interval: int, optional
+        :return: Result for each frame taken from the stream
+        :rtype: AsyncIterator[StreamFrameTrackResponse]
+        """
+        raise NotImplementedError()
+
+    @abstractmethod
+    def get_stream_metrics(self) -> StreamMetricsResponse:
+        raise NotImplementedError()
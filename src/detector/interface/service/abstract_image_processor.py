@@ -1,9 +1,11 @@
+from typing import Optional
 from abc import ABC, abstractmethod
 from numpy import ndarray
 from fastapi import UploadFile
 
 # local imports
-from ...model.dto import ImageResolutionDto
+from ...model.enum import ImageFormatEnum
+from ...model.dto import DecodedImageDto, EncodedImageDto, MaskRasterDto
 from ...model.api import ObjectLocationResponse
 
 
@@ -24,6 +26,37 @@ class AbstractImageProcessor(ABC):
     async def file_to_image_array(self, file: UploadFile) -> ndarray:
         raise NotImplementedError()
     
+    @abstractmethod
+    async def decode_image(self, file: UploadFile, full_resolution: bool = False) -> DecodedImageDto:
+        """
+        Decode uploaded image for analysis. JPEG images may be decoded at reduced resolution,
+        in which case coordinates on decoded image have to be multiplied by reduction factor.
+
+        :param file: Uploaded image
+        :type file: UploadFile
+        :param full_resolution: always decode at full resolution (e.g. for tiled detection), defaults to False
+        :type full_resolution: bool, optional
+        :return: Decoded image with reduction factor and original resolution
+        :rtype: DecodedImageDto
+        """
+        raise NotImplementedError()
+
+    @abstractmethod
+    async def decode_image_bytes(self, content: bytes, full_resolution: bool = False) -> DecodedImageDto:
+        """
+        Decode encoded image received as bytes (e.g. frame of a stream), same as 'decode_image'
+        but without file type validation based on file name and MIME type. Image is decoded in
+        a worker thread, so that event loop keeps receiving frames of other streams meanwhile.
+
+        :param content: Encoded image (JPEG or PNG)
+        :type content: bytes
+        :param full_resolution: always decode at full resolution (e.g. for tiled detection), defaults to False
+        :type full_resolution: bool, optional
+        :return: Decoded image with reduction factor and original resolution
+        :rtype: DecodedImageDto
+        """
+        raise NotImplementedError()
+
     @abstractmethod
     def draw_bounding_boxes(
         self,
@@ -33,10 +66,69 @@ class AbstractImageProcessor(ABC):
         include_confidence_label: bool = True,
         thickness: int = 3,
         color: tuple[int, ...] = (255, 0, 255),  # red
-        font_scale: int = 1
+        font_scale: float = 1.0,
+        scale: float = 1.0
     ) -> ndarray:
         raise NotImplementedError()
 
     @abstractmethod
-    def draw_blackout_mask(self, image_array: ndarray, resolution: ImageResolutionDto, mask: list[list[float]]) -> ndarray:
-       raise NotImplementedError()
\ No newline at end of file
+    def encode_annotated_image(
+        self,
+        decoded_image: DecodedImageDto,
+        mask_raster: MaskRasterDto,
+        bounding_boxes: list[ObjectLocationResponse],
+        image_format: ImageFormatEnum,
+        quality: int,
+        max_size: int
+    ) -> EncodedImageDto:
+        """
+        Draw bounding boxes on decoded image and encode it. Decoded image is drawn on in place.
+        Masked areas are blacked out, expects the mask to be already applied to the visible region.
+
+        :param decoded_image: Decoded image, boxes are in resolution of the encoded image
+        :type decoded_image: DecodedImageDto
+        :param mask_raster: Mask of the image
+        :type mask_raster: MaskRasterDto
+        :param bounding_boxes: Boxes to draw
+        :type bounding_boxes: list[ObjectLocationResponse]
+        :param image_format: Output image format
+        :type image_format: ImageFormatEnum
+        :param quality: Encoding quality (1...100)
+        :type quality: int
+        :param max_size: Longer side of output image (pixels), larger images are downscaled
+        :type max_size: int
+        :return: Encoded image
+        :rtype: EncodedImageDto
+        """
+        raise NotImplementedError()
+
+    @abstractmethod
+    def rasterize_mask(self, image_shape: tuple[int, ...], mask: Optional[list[ndarray]], reduction: int = 1) -> MaskRasterDto:
+        """
+        Rasterize blackout mask for images of given shape and find bounding rectangle of the
+        area which stays visible after masking. Mask bounds are expected to be validated already.
+
+        :param image_shape: Shape of images the mask is applied to
+        :type image_shape: tuple[int, ...]
+        :param mask: Blackout mask polygons as (vertices, 2) arrays of (width, height), 'None' if there is no mask
+        :type mask: Optional[list[ndarray]]
+        :param reduction: Factor by which images were downscaled while decoding, defaults to 1
+        :type reduction: int, optional
+        :return: Visible region and mask raster cropped to it
+        :rtype: MaskRasterDto
+        """
+        raise NotImplementedError()
+
+    @abstractmethod
+    def apply_mask(self, image_array: ndarray, mask_raster: MaskRasterDto) -> Optional[ndarray]:
+        """
+        Black out masked pixels (in place) and crop image to the visible region.
+
+        :param image_array: Image to apply mask to
+        :type image_array: ndarray
+        :param mask_raster: Rasterized mask
+        :type mask_raster: MaskRasterDto
+        :return: View of the visible region of the image, 'None' if whole image is masked
+        :rtype: Optional[ndarray]
+        """
+        raise NotImplementedError()
@@ -0,0 +1,40 @@
+from abc import ABC, abstractmethod
+from uuid import UUID
+
+# local imports
+from ...model.dto import MaskRasterDto
+from ...model.api import ObjectAnalysisConfigResponse, CacheMetricsResponse
+
+
+class AbstractMaskCache(ABC):
+
+    @abstractmethod
+    def get_mask(self, object_analysis_config: ObjectAnalysisConfigResponse, image_shape: tuple[int, ...], reduction: int = 1) -> MaskRasterDto:
+        """
+        Get rasterized blackout mask of the configuration for images of given shape, mask is
+        rasterized on first use and cached.
+
+        :param object_analysis_config: Analysis configuration with the mask
+        :type object_analysis_config: ObjectAnalysisConfigResponse
+        :param image_shape: Shape of images the mask is applied to
+        :type image_shape: tuple[int, ...]
+        :param reduction: Factor by which images were downscaled while decoding, defaults to 1
+        :type reduction: int, optional
+        :return: Rasterized mask
+        :rtype: MaskRasterDto
+        """
+        raise NotImplementedError()
+
+    @abstractmethod
+    def invalidate(self, config_id: UUID) -> None:
+        """
+        Drop all cached masks of the configuration, must be called when configuration changes.
+
+        :param config_id: Analysis configuration ID
+        :type config_id: UUID
+        """
+        raise NotImplementedError()
+
+    @abstractmethod
+    def get_metrics(self) -> CacheMetricsResponse:
+        raise NotImplementedError()
@@ -0,0 +1,51 @@
+from typing import Optional
+from abc import ABC, abstractmethod
+
+# local imports
+from ...model.enum import ObjectEnum
+from ...model.dto import ObjectBoundingBoxDto
+from ...model.api import ObjectAnalysisConfigResponse, CacheMetricsResponse
+
+
+class AbstractResultCache(ABC):
+
+    @abstractmethod
+    async def get(self, content_hash: str, object_analysis_config: ObjectAnalysisConfigResponse) -> Optional[dict[ObjectEnum, list[ObjectBoundingBoxDto]]]:
+        """
+        Get cached detection results for the image analyzed with the configuration.
+
+        :param content_hash: Hash of the encoded image content
+        :type content_hash: str
+        :param object_analysis_config: Analysis configuration
+        :type object_analysis_config: ObjectAnalysisConfigResponse
+        :return: Detected objects grouped by object type, 'None' if not cached
+        :rtype: Optional[dict[ObjectEnum, list[ObjectBoundingBoxDto]]]
+        """
+        raise NotImplementedError()
+
+    @abstractmethod
+    async def put(
+        self,
+        content_hash: str,
+        object_analysis_config: ObjectAnalysisConfigResponse,
+        grouped_located_objects: dict[ObjectEnum, list[ObjectBoundingBoxDto]]
+    ) -> None:
+        """
+        Cache detection results for the image analyzed with the configuration.
+
+        :param content_hash: Hash of the encoded image content
+        :type content_hash: str
+        :param object_analysis_config: Analysis configuration
+        :type object_analysis_config: ObjectAnalysisConfigResponse
+        :param grouped_located_objects: Detected objects grouped by object type
+        :type grouped_located_objects: dict[ObjectEnum, list[ObjectBoundingBoxDto]]
+        """
+        raise NotImplementedError()
+
+    @abstractmethod
+    def get_metrics(self) -> CacheMetricsResponse:
+        raise NotImplementedError()
+
+    @abstractmethod
+    def get_disk_metrics(self) -> Optional[CacheMetricsResponse]:
+        raise NotImplementedError()
@@ -7,9 +7,16 @@ from .pixel_coordinate import PixelCoordinate
 
 from .object_count import ObjectCountResponse
 from .object_location import ObjectLocationResponse
+from .object_analysis import ObjectAnalysisResponse
+from .batch_analysis import BatchItemErrorResponse, ObjectCountBatchItemResponse, ObjectLocationBatchItemResponse
+from .object_tracking import TrackedObjectResponse, TrackEventResponse, ObjectTrackingResponse
+from .video_analysis import VideoFrameCountResponse, VideoFrameLocationResponse, VideoFrameTrackResponse
+from .stream_analysis import StreamBindRequest, StreamBoundResponse, StreamFrameCountResponse, StreamFrameLocationResponse, StreamFrameTrackResponse
 
 from .account import AccountRequest, AccountResponse
 from .api_key import APIKeyResponse
 from .token import AccessTokenResponse, RefreshTokenRequest
 
-from .file import FileUploadResponse
\ No newline at end of file
+from .file import FileUploadResponse
+
+from .metrics import DetectionBatchMetricsResponse, DetectorWarmUpMetricsResponse, CacheMetricsResponse, StreamMetricsResponse, ServiceMetricsResponse
@@ -0,0 +1,27 @@
+from typing import Optional
+from pydantic import Field
+
+from common.model import ResponseBase
+
+# local imports
+from .object_count import ObjectCountResponse
+from .object_location import ObjectLocationResponse
+
+
+class BatchItemErrorResponse(ResponseBase):
+    status: int = Field(title="HTTP status code the error would have as a single image request")
+    detail: str = Field(title="Error description")
+
+
+class BatchItemResponseBase(ResponseBase):
+    index: int = Field(title="Position of the image in the request")
+    file_name: Optional[str] = Field(title="Name of the uploaded image file", default=None)
+    error: Optional[BatchItemErrorResponse] = Field(title="Error which prevented analysis of the image", default=None)
+
+
+class ObjectCountBatchItemResponse(BatchItemResponseBase):
+    counts: Optional[list[ObjectCountResponse]] = Field(title="Number of objects found in the image per object type", default=None)
+
+
+class ObjectLocationBatchItemResponse(BatchItemResponseBase):
+    locations: Optional[list[ObjectLocationResponse]] = Field(title="Objects located in the image", default=None)
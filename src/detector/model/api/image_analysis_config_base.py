@@ -1,6 +1,9 @@
 from typing import Optional
 from uuid import UUID
-from pydantic import Field
+from datetime import datetime
+from numpy import ndarray
+from pydantic import ConfigDict, Field, computed_field
+from pydantic.json_schema import SkipJsonSchema
 
 from common.model import RequestBase, ResponseBase
 
@@ -13,12 +16,34 @@ class ImageAnalysisConfigBaseRequest(RequestBase):
     config_name: Optional[str] = Field(title="Configuration name", default=None)
     image_resolution: ImageResolution = Field(title="Image resolution", description="Resolution of the images that will be analyzed")
     image_mask: Optional[list[PixelCoordinate]] = Field(title="Image mask", description="Area on the image that will be blacked out before analysis")
+    image_masks: Optional[list[list[PixelCoordinate]]] = Field(title="Image masks", description="Further areas on the image that will be blacked out before analysis", default=None)
     example_image_id: UUID = Field(title="Image ID", description="Example image ID for config")
 
+    def get_mask_polygons(self) -> list[list[PixelCoordinate]]:
+        return [polygon for polygon in [self.image_mask, *(self.image_masks or [])] if polygon]
+
 
 class ImageAnalysisConfigBaseResponse(ResponseBase):
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
     id: UUID = Field(title="Analysis config ID")
     config_name: Optional[str] = Field(title="Configuration name", default=None)
     image_resolution: ImageResolution = Field(title="Image resolution", description="Resolution of the images that will be analyzed")
-    image_mask: Optional[list[PixelCoordinate]] = Field(title="Image mask", description="Area on the image that will be blacked out before analysis")
+    mask_polygons: SkipJsonSchema[Optional[list[ndarray]]] = Field(title="Mask polygons", description="Vertices (width, height) of each blacked out area as int32 arrays, used internally for analysis", default=None, exclude=True)
     example_image_id: UUID = Field(title="Image ID", description="Example image ID for config")
+    version: Optional[datetime] = Field(title="Configuration version", description="Last modification time, used internally to detect configuration changes", default=None, exclude=True)
+
+    # pixel coordinates are only built when configuration is returned to the client, analysis uses the arrays
+    @computed_field(title="Image mask", description="Area on the image that will be blacked out before analysis")
+    @property
+    def image_mask(self) -> Optional[list[PixelCoordinate]]:
+        return self._to_pixel_coordinates(self.mask_polygons[0]) if self.mask_polygons else None
+
+    @computed_field(title="Image masks", description="Further areas on the image that will be blacked out before analysis")
+    @property
+    def image_masks(self) -> Optional[list[list[PixelCoordinate]]]:
+        return [self._to_pixel_coordinates(polygon) for polygon in self.mask_polygons[1:]] if self.mask_polygons and len(self.mask_polygons) > 1 else None
+
+    @staticmethod
+    def _to_pixel_coordinates(polygon: ndarray) -> list[PixelCoordinate]:
+        return [PixelCoordinate(width=width, height=height) for width, height in polygon.tolist()]
@@ -0,0 +1,47 @@
+from typing import Optional
+from pydantic import Field
+
+from common.model import ResponseBase
+
+
+class DetectionBatchMetricsResponse(ResponseBase):
+    batches_processed: int = Field(title="Number of batched forward passes executed")
+    requests_processed: int = Field(title="Number of detection requests served by batched forward passes")
+    average_batch_size: float = Field(title="Average number of images in a batch")
+    max_batch_size: int = Field(title="Largest number of images in a single batch")
+    batch_size_histogram: dict[int, int] = Field(title="Number of batches per batch size")
+    average_wait_time_ms: float = Field(title="Average time a request waited in queue before its batch was dispatched (ms)")
+    max_wait_time_ms: float = Field(title="Longest time a request waited in queue before its batch was dispatched (ms)")
+
+
+class DetectorWarmUpMetricsResponse(ResponseBase):
+    ready: bool = Field(title="Whether warm-up has finished and service accepts traffic")
+    degraded: bool = Field(title="Whether every warm-up attempt failed and service accepts traffic with cold detector")
+    duration_ms: Optional[float] = Field(title="Total warm-up time (ms), not set until warm-up finishes")
+    inference_times_ms: dict[str, list[float]] = Field(title="Warm-up forward pass times per resolution and batch size (ms)")
+    error: Optional[str] = Field(title="Error which caused warm-up to fail")
+
+
+class CacheMetricsResponse(ResponseBase):
+    entries: int = Field(title="Number of cached entries")
+    size_bytes: Optional[int] = Field(title="Memory or disk space used by cached entries (bytes), not set if not tracked", default=None)
+    hits: int = Field(title="Number of lookups served from cache")
+    misses: int = Field(title="Number of lookups not found in cache")
+    hit_rate: float = Field(title="Share of lookups served from cache (0...1.0)")
+    evictions: int = Field(title="Number of entries evicted to stay within size limit")
+
+
+class StreamMetricsResponse(ResponseBase):
+    frames_processed: int = Field(title="Number of stream frames taken for analysis (dropped frames not included)")
+    inference_skipped: int = Field(title="Number of stream frames which reused previous result because they barely changed")
+    skip_rate: float = Field(title="Share of stream frames which reused previous result (0...1.0)")
+
+
+class ServiceMetricsResponse(ResponseBase):
+    detection_batching: DetectionBatchMetricsResponse = Field(title="Detection batch scheduler metrics")
+    warm_up: DetectorWarmUpMetricsResponse = Field(title="Detector warm-up metrics")
+    mask_cache: CacheMetricsResponse = Field(title="Rasterized mask cache metrics")
+    stream: StreamMetricsResponse = Field(title="Stream analysis metrics")
+    result_cache: Optional[CacheMetricsResponse] = Field(title="Analysis result cache (in-memory tier) metrics, not set if cache is disabled", default=None)
+    result_disk_cache: Optional[CacheMetricsResponse] = Field(title="Analysis result cache disk tier metrics, not set if disk tier is disabled", default=None)
+    config_cache: Optional[CacheMetricsResponse] = Field(title="Resolved analysis configuration cache metrics, not set if cache is disabled", default=None)
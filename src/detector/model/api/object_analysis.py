@@ -0,0 +1,12 @@
+from pydantic import Field
+
+from common.model import ResponseBase
+
+# local imports
+from .object_count import ObjectCountResponse
+from .object_location import ObjectLocationResponse
+
+
+class ObjectAnalysisResponse(ResponseBase):
+    counts: list[ObjectCountResponse] = Field(title="Number of objects found in the image per object type")
+    locations: list[ObjectLocationResponse] = Field(title="Objects located in the image")
@@ -1,3 +1,4 @@
+from typing import Optional
 from pydantic import Field
 
 # local imports
@@ -5,13 +6,18 @@ from ..enum import ObjectEnum
 from .image_analysis_config_base import ImageAnalysisConfigBaseRequest, ImageAnalysisConfigBaseResponse
 
 BASE_CONFIDENCE = 0.85
+BASE_TILE_OVERLAP = 0.2
 
 
 class ObjectAnalysisConfigRequest(ImageAnalysisConfigBaseRequest):
     confidence: float = Field(title="Confidence threshold", description="Confidence level above which detected object is trusted to be correct (0...1.0)", default=BASE_CONFIDENCE)
     objects: list[ObjectEnum] = Field(title="Objects of interest on the image")
+    tile_size: Optional[int] = Field(title="Tile size", description="Side (pixels) of overlapping tiles high resolution images are split into for detecting small objects, 'None' analyzes images as a whole", default=None, ge=64)
+    tile_overlap: float = Field(title="Tile overlap", description="Share of tile side overlapping with the neighbouring tile (0...0.5)", default=BASE_TILE_OVERLAP, ge=0, le=0.5)
 
 
 class ObjectAnalysisConfigResponse(ImageAnalysisConfigBaseResponse):
     confidence: float = Field(title="Confidence threshold", description="Confidence level above which detected object is trusted to be correct (0...1.0)", default=BASE_CONFIDENCE)
     objects: list[ObjectEnum] = Field(title="Objects of interest on the image")
+    tile_size: Optional[int] = Field(title="Tile size", description="Side (pixels) of overlapping tiles high resolution images are split into for detecting small objects, 'None' analyzes images as a whole", default=None, ge=64)
+    tile_overlap: float = Field(title="Tile overlap", description="Share of tile side overlapping with the neighbouring tile (0...0.5)", default=BASE_TILE_OVERLAP, ge=0, le=0.5)
@@ -0,0 +1,37 @@
+from pydantic import Field
+
+from common.model import ResponseBase
+
+# local imports
+from ..enum import ObjectEnum, TrackEventEnum
+from ..dto import TrackedObjectDto
+from .object_count import ObjectCountResponse
+from .object_location import ObjectLocationResponse
+from .pixel_coordinate import PixelCoordinate
+
+
+class TrackedObjectResponse(ObjectLocationResponse):
+    track_id: int = Field(title="Track ID, unique per object type within the stream")
+
+    @classmethod
+    def from_tracked_object(cls, dto: TrackedObjectDto) -> 'TrackedObjectResponse':
+        return TrackedObjectResponse(
+            track_id=dto.track_id,
+            object_type=dto.bounding_box.object_type,
+            confidence=dto.bounding_box.confidence,
+            top_left=PixelCoordinate.from_dto(dto.bounding_box.top_left),
+            bottom_right=PixelCoordinate.from_dto(dto.bounding_box.bottom_right)
+        )
+
+
+class TrackEventResponse(ResponseBase):
+    event: TrackEventEnum = Field(title="Event type, 'entry' when track is confirmed and 'exit' when it's lost for good")
+    track_id: int = Field(title="Track ID, unique per object type within the stream")
+    object_type: ObjectEnum = Field(title="Object type")
+
+
+class ObjectTrackingResponse(ResponseBase):
+    detected: bool = Field(title="Whether detector ran on the frame, otherwise tracks are at predicted positions")
+    tracks: list[TrackedObjectResponse] = Field(title="Objects tracked on the frame")
+    events: list[TrackEventResponse] = Field(title="Tracks which entered or exited on the frame")
+    unique_counts: list[ObjectCountResponse] = Field(title="Number of distinct objects per object type since start of the stream")
@@ -0,0 +1,52 @@
+from typing import Optional
+from uuid import UUID
+from pydantic import Field
+
+from common.model import RequestBase, ResponseBase
+
+# local imports
+from .object_count import ObjectCountResponse
+from .object_location import ObjectLocationResponse
+from .batch_analysis import BatchItemErrorResponse
+from .object_tracking import ObjectTrackingResponse
+
+
+class StreamBindRequest(RequestBase):
+    api_key: Optional[str] = Field(title="API key, either API key or access token is required", default=None)
+    access_token: Optional[str] = Field(title="Access token, either API key or access token is required", default=None)
+    analysis_config_id: UUID = Field(title="Analysis configuration ID applied to all frames of the stream")
+    change_threshold: Optional[float] = Field(
+        title="Smallest change (0...1.0) of the visible region since last analyzed frame for which frame is analyzed again, "
+            "smaller changes reuse previous result. 0 analyzes every frame, defaults to service setting",
+        ge=0,
+        le=1,
+        default=None
+    )
+    detection_interval: int = Field(
+        title="Tracking streams only: detector runs on every N-th analyzed frame, tracks are propagated on frames in between",
+        ge=1,
+        default=1
+    )
+
+
+class StreamBoundResponse(ResponseBase):
+    analysis_config_id: UUID = Field(title="Analysis configuration ID applied to all frames of the stream")
+
+
+class StreamFrameResponseBase(ResponseBase):
+    sequence: int = Field(title="Position of the frame in the stream, counted from 0")
+    dropped_frames: int = Field(title="Number of frames dropped so far because analysis fell behind")
+    inference_skipped: bool = Field(title="Whether frame was not analyzed because it barely changed, result of last analyzed frame is returned", default=False)
+    error: Optional[BatchItemErrorResponse] = Field(title="Error which prevented analysis of the frame", default=None)
+
+
+class StreamFrameCountResponse(StreamFrameResponseBase):
+    counts: Optional[list[ObjectCountResponse]] = Field(title="Number of objects found in the frame per object type", default=None)
+
+
+class StreamFrameLocationResponse(StreamFrameResponseBase):
+    locations: Optional[list[ObjectLocationResponse]] = Field(title="Objects located in the frame", default=None)
+
+
+class StreamFrameTrackResponse(StreamFrameResponseBase):
+    tracking: Optional[ObjectTrackingResponse] = Field(title="Objects tracked across frames", default=None)
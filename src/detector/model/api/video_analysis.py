@@ -0,0 +1,25 @@
+from pydantic import Field
+
+from common.model import ResponseBase
+
+# local imports
+from .object_count import ObjectCountResponse
+from .object_location import ObjectLocationResponse
+from .object_tracking import ObjectTrackingResponse
+
+
+class VideoFrameResponseBase(ResponseBase):
+    frame_index: int = Field(title="Position of the frame in the video, counted from 0")
+    timestamp_ms: float = Field(title="Time of the frame from the start of the video in milliseconds")
+
+
+class VideoFrameCountResponse(VideoFrameResponseBase):
+    counts: list[ObjectCountResponse] = Field(title="Number of objects found in the frame per object type")
+
+
+class VideoFrameLocationResponse(VideoFrameResponseBase):
+    locations: list[ObjectLocationResponse] = Field(title="Objects located in the frame")
+
+
+class VideoFrameTrackResponse(VideoFrameResponseBase):
+    tracking: ObjectTrackingResponse = Field(title="Objects tracked across frames")
@@ -2,7 +2,16 @@ from .base_dto import BaseDto
 
 from .pixel_coordinate_dto import PixelCoordinateDto
 from .image_resolution_dto import ImageResolutionDto
+from .decoded_image_dto import DecodedImageDto
+from .encoded_image_dto import EncodedImageDto
+from .mask_raster_dto import MaskRasterDto
+from .image_tile_dto import ImageTileDto
+from .video_frame_dto import VideoFrameDto
+from .stream_frame_dto import StreamFrameDto
 from .object_bounding_box_dto import ObjectBoundingBoxDto
+from .tracked_object_dto import TrackedObjectDto
+from .track_event_dto import TrackEventDto
+from .tracking_result_dto import TrackingResultDto
 from .analyze_object_count_config_dto import AnalyzeObjectCountConfigDto
 from .blob_file_container_dto import BlobFileContainerDto
 from .file_container_dto import FileContainerDto
\ No newline at end of file
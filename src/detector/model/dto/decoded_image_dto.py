@@ -0,0 +1,14 @@
+from numpy import ndarray
+from pydantic import ConfigDict, Field
+
+# local imports
+from . import BaseDto
+from .image_resolution_dto import ImageResolutionDto
+
+
+class DecodedImageDto(BaseDto):
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    image: ndarray = Field(title="Decoded image (BGR)")
+    reduction: int = Field(title="Factor by which image was downscaled while decoding")
+    original_resolution: ImageResolutionDto = Field(title="Resolution of the encoded image")
@@ -0,0 +1,12 @@
+from numpy import ndarray
+from pydantic import ConfigDict, Field
+
+# local imports
+from . import BaseDto
+
+
+class EncodedImageDto(BaseDto):
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    content: ndarray = Field(title="Encoded image bytes (1-D uint8 array)")
+    media_type: str = Field(title="MIME type of the encoded image")
@@ -0,0 +1,12 @@
+from numpy import ndarray
+from pydantic import ConfigDict, Field
+
+# local imports
+from . import BaseDto
+
+
+class ImageTileDto(BaseDto):
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    region: tuple[int, int, int, int] = Field(title="Region (left, top, right, bottom) of the tile on the image")
+    image: ndarray = Field(title="Tile pixels, view into the image (BGR)")
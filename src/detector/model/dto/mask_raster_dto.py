@@ -0,0 +1,13 @@
+from typing import Optional
+from numpy import ndarray
+from pydantic import ConfigDict, Field
+
+# local imports
+from . import BaseDto
+
+
+class MaskRasterDto(BaseDto):
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    visible_region: Optional[tuple[int, int, int, int]] = Field(title="Region (left, top, right, bottom) left visible by the mask, 'None' if whole image is masked")
+    raster: Optional[ndarray] = Field(title="Mask cropped to visible region, 1 for visible and 0 for masked pixels")
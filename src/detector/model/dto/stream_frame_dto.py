@@ -0,0 +1,9 @@
+from pydantic import Field
+
+# local imports
+from . import BaseDto
+
+
+class StreamFrameDto(BaseDto):
+    sequence: int = Field(title="Position of the frame in the stream, counted from 0")
+    content: bytes = Field(title="Encoded frame (JPEG or PNG)")
@@ -0,0 +1,11 @@
+from pydantic import Field
+
+# local imports
+from . import BaseDto
+from ..enum import ObjectEnum, TrackEventEnum
+
+
+class TrackEventDto(BaseDto):
+    event: TrackEventEnum = Field(title="Event type")
+    track_id: int = Field(title="Track ID, unique per object type within the stream")
+    object_type: ObjectEnum = Field(title="Object type")
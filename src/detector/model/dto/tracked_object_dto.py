@@ -0,0 +1,10 @@
+from pydantic import Field
+
+# local imports
+from . import BaseDto
+from .object_bounding_box_dto import ObjectBoundingBoxDto
+
+
+class TrackedObjectDto(BaseDto):
+    track_id: int = Field(title="Track ID, unique per object type within the stream")
+    bounding_box: ObjectBoundingBoxDto = Field(title="Detected or predicted bounding box of the object")
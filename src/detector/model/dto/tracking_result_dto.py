@@ -0,0 +1,13 @@
+from pydantic import Field
+
+# local imports
+from . import BaseDto
+from ..enum import ObjectEnum
+from .tracked_object_dto import TrackedObjectDto
+from .track_event_dto import TrackEventDto
+
+
+class TrackingResultDto(BaseDto):
+    tracks: list[TrackedObjectDto] = Field(title="Objects tracked on the frame")
+    events: list[TrackEventDto] = Field(title="Tracks which entered or exited on the frame")
+    unique_counts: dict[ObjectEnum, int] = Field(title="Number of distinct tracks per object type since start of the stream")
@@ -0,0 +1,13 @@
+from numpy import ndarray
+from pydantic import ConfigDict, Field
+
+# local imports
+from . import BaseDto
+
+
+class VideoFrameDto(BaseDto):
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    frame_index: int = Field(title="Position of the frame in the video, counted from 0")
+    timestamp_ms: float = Field(title="Presentation time of the frame from the start of the video")
+    image: ndarray = Field(title="Decoded frame (BGR)")
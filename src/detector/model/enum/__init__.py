@@ -1,2 +1,4 @@
 from .object_enum import ObjectEnum
-from .authorization_scope_enum import AuthorizationScopeEnum
\ No newline at end of file
+from .authorization_scope_enum import AuthorizationScopeEnum
+from .track_event_enum import TrackEventEnum
+from .image_format_enum import ImageFormatEnum
\ No newline at end of file
@@ -0,0 +1,6 @@
+from enum import Enum
+
+
+class ImageFormatEnum(Enum):
+    JPEG = "jpeg"
+    WEBP = "webp"
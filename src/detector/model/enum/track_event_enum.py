@@ -0,0 +1,6 @@
+from enum import Enum
+
+
+class TrackEventEnum(Enum):
+    ENTRY = "entry"
+    EXIT = "exit"
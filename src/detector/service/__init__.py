@@ -3,4 +3,9 @@ from .image_analyzer import ImageAnalyzer
 from .analyze_object_config_manager import AnalyzeObjectConfigManager
 from .authentication_manager import AuthenticationManager
 from .blob_storage_client import BlobStorageClient
-from .file_storage import FileStorage
\ No newline at end of file
+from .file_storage import FileStorage
+from .detection_batch_scheduler import DetectionBatchScheduler
+from .detector_warm_up import DetectorWarmUp
+from .mask_cache import MaskCache
+from .result_cache import ResultCache
+from .config_cache import ConfigCache
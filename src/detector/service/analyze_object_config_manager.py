@@ -1,219 +1,169 @@
+from typing import Any, Optional
 from uuid import UUID
+from numpy import array, int32
 
 from common.exception.repository_exception import NotFoundException
 
 # local imports
 from ..model.enum import ObjectEnum
-from ..model.api import ObjectAnalysisConfigResponse, ObjectAnalysisConfigRequest, ImageResolution, PixelCoordinate
-from ..exception.api import ConfigureEntityNotFoundException, AccountUnAuthorizedException
-from ..interface import AbstractAnalyzeImageConfigManager
-from ..database import FrameMaskRepository, ObjectRepository, ObjectAnalysisConfigRepository, ObjectAnalysisConfig
+from ..model.api import ObjectAnalysisConfigResponse, ObjectAnalysisConfigRequest, ImageResolution
+from ..exception.api import ConfigureEntityNotFoundException, ConfigureBadRequestException, AccountUnAuthorizedException
+from ..interface import AbstractAnalyzeImageConfigManager, AbstractMaskCache, AbstractConfigCache
+from ..database import ObjectAnalysisConfigRepository, ObjectAnalysisConfig
 
 
 class AnalyzeObjectConfigManager(AbstractAnalyzeImageConfigManager[ObjectAnalysisConfigRequest, ObjectAnalysisConfigResponse]):
 
     def __init__(
         self,
-        frame_mask_repository: FrameMaskRepository,
-        object_repository: ObjectRepository,
-        object_analysis_config_repository: ObjectAnalysisConfigRepository
+        object_analysis_config_repository: ObjectAnalysisConfigRepository,
+        mask_cache: AbstractMaskCache,
+        config_cache: Optional[AbstractConfigCache] = None
     ):
-        self._frame_mask_repository = frame_mask_repository
-        self._object_repository = object_repository
         self._object_analysis_config_repository = object_analysis_config_repository
+        self._mask_cache = mask_cache
+        self._config_cache = config_cache
 
     def _validate_is_users_config(self, account_id: UUID, config: ObjectAnalysisConfig):
         if config.account_id != account_id:
             raise AccountUnAuthorizedException()
 
+    def _validate_image_mask(self, request: ObjectAnalysisConfigRequest):
+        # mask is validated once here so it can be rasterized and applied without checks on analysis
+        for polygon in request.get_mask_polygons():
+            for pixel_coordinate in polygon:
+                if (
+                    pixel_coordinate.width < 0 or pixel_coordinate.height < 0 or
+                    pixel_coordinate.width > request.image_resolution.width or
+                    pixel_coordinate.height > request.image_resolution.height
+                ):
+                    raise ConfigureBadRequestException(detail="frame_mask_has_invalid_values")
+
     async def add_config(self, account_id: UUID, request: ObjectAnalysisConfigRequest) -> ObjectAnalysisConfigResponse:
-        object_analysis_config = await self._object_analysis_config_repository.create(
+        self._validate_image_mask(request)
+
+        # configuration and objects are stored in a single transaction
+        object_analysis_config = await self._object_analysis_config_repository.create_with_children(
             values={
                 "account_id": account_id,
-                "config_name": request.config_name,
-                "image_resolution_width": request.image_resolution.width,
-                "image_resolution_height": request.image_resolution.height,
-                "confidence": request.confidence,
-                "example_image_id": request.example_image_id,
-            }
+                **self._to_config_values(request),
+            },
+            objects=self._to_object_values(request)
         )
 
-        objects: list[ObjectEnum] = []
-        for request_object in request.objects:
-            object = await self._object_repository.create(
-                values={
-                    "value": request_object,
-                    "object_analysis_config": object_analysis_config.id
-                }
-            )
-            objects.append(ObjectEnum(object.value))
-
-        image_mask: list[PixelCoordinate] = []
-        if request.image_mask:
-            for pixel_coordinate in request.image_mask:
-                coordinate = await self._frame_mask_repository.create(
-                    values={
-                        "pixel_width": pixel_coordinate.width,
-                        "pixel_height": pixel_coordinate.height,
-                        "object_analysis_config": object_analysis_config.id
-                    }
-                )
-                image_mask.append(
-                    PixelCoordinate(
-                        width=coordinate.pixel_width,
-                        height=coordinate.pixel_height
-                    )
-                )
-        
-        return ObjectAnalysisConfigResponse(
-            id=object_analysis_config.id,
-            confidence=object_analysis_config.confidence,
-            image_resolution=ImageResolution(
-                width=object_analysis_config.image_resolution_width,
-                height=object_analysis_config.image_resolution_height
-            ),
-            image_mask=image_mask if image_mask else None,
-            objects=objects,
-            example_image_id=object_analysis_config.example_image_id,
-            config_name=object_analysis_config.config_name
-        )
+        return self._to_config_response(object_analysis_config)
     
     async def get_config(self, account_id: UUID, config_id: UUID) -> ObjectAnalysisConfigResponse:
-        frame_mask_points = await self._frame_mask_repository.get_by_object_analysis_id(
-            object_analysis_config_id=config_id
-        )
-        objects = await self._object_repository.get_by_object_analysis_id(
-            object_analysis_config_id=config_id
-        )
+        generation = 0
+        if self._config_cache is not None:
+            # configurations rarely change, analysis requests are served without touching the database
+            cached_config = self._config_cache.get(config_id=config_id)
+            if cached_config is not None:
+                owner_account_id, object_analysis_config = cached_config
+                if owner_account_id != account_id:
+                    raise AccountUnAuthorizedException()
+                return object_analysis_config
+            generation = self._config_cache.generation
+
         try:
-            object_analysis_config = await self._object_analysis_config_repository.get_one(
+            # masks and objects are loaded along with the configuration, in a single session
+            object_analysis_config = await self._object_analysis_config_repository.get_one_with_children(
                 entity_id=config_id
             )
         except NotFoundException as err:
             raise ConfigureEntityNotFoundException(f"entity_{err.entity_id}_not_found_in_{err.table_name}")
         
         self._validate_is_users_config(account_id, object_analysis_config)
+        object_analysis_config_response = self._to_config_response(object_analysis_config)
 
-        return ObjectAnalysisConfigResponse(
-            id=object_analysis_config.id,
-            account_id=object_analysis_config.account_id,
-            confidence=object_analysis_config.confidence,
-            image_resolution=ImageResolution(
-                width=object_analysis_config.image_resolution_width,
-                height=object_analysis_config.image_resolution_height
-            ),
-            image_mask=[
-                PixelCoordinate(width=mask.pixel_width,height=mask.pixel_height) for mask in frame_mask_points
-            ] if frame_mask_points else None,
-            objects=[
-                ObjectEnum(object.value) for object in objects
-            ],
-            example_image_id=object_analysis_config.example_image_id,
-            config_name=object_analysis_config.config_name,
-        )
+        if self._config_cache is not None:
+            self._config_cache.put(
+                account_id=object_analysis_config.account_id,
+                object_analysis_config=object_analysis_config_response,
+                generation=generation
+            )
+
+        return object_analysis_config_response
     
     async def get_all_configs(self, account_id: UUID) -> list[ObjectAnalysisConfigResponse]:
-        object_analysis_configs = await self._object_analysis_config_repository.get_all_for_account_id(
+        # children of all configurations are loaded in batches, not with two queries per configuration
+        object_analysis_configs = await self._object_analysis_config_repository.get_all_for_account_id_with_children(
             account_id=account_id
         )
 
-        configurations: list[ObjectAnalysisConfigResponse] = []
-        for config in object_analysis_configs:
-            frame_mask_points = await self._frame_mask_repository.get_by_object_analysis_id(
-                object_analysis_config_id=config.id
-            )
-            objects = await self._object_repository.get_by_object_analysis_id(
-                object_analysis_config_id=config.id
-            )
-
-            configurations.append(
-                ObjectAnalysisConfigResponse(
-                    id=config.id,
-                    account_id=account_id,
-                    confidence=config.confidence,
-                    image_resolution=ImageResolution(
-                        width=config.image_resolution_width,
-                        height=config.image_resolution_height
-                    ),
-                    image_mask=[
-                        PixelCoordinate(width=mask.pixel_width,height=mask.pixel_height) for mask in frame_mask_points
-                    ] if frame_mask_points else None,
-                    objects=[
-                        ObjectEnum(object.value) for object in objects
-                    ],
-                    example_image_id=config.example_image_id,
-                    config_name=config.config_name
-                )
-            )
-        
-        return configurations
+        return [self._to_config_response(config) for config in object_analysis_configs]
     
     async def update_config(self, account_id: UUID, config_id: UUID, request: ObjectAnalysisConfigRequest) -> ObjectAnalysisConfigResponse:
+        self._validate_image_mask(request)
+
         try:
             object_analysis_config = await self._object_analysis_config_repository.get_one(entity_id=config_id)
 
             self._validate_is_users_config(account_id, object_analysis_config)
 
-            # delete old entities and add new
-            await self._frame_mask_repository.delete_by_object_analysis_id(object_analysis_config_id=config_id)
-            image_mask: list[PixelCoordinate] = []
-            if request.image_mask:
-                for pixel_coordinate in request.image_mask:
-                    coordinate = await self._frame_mask_repository.create(
-                        values={
-                            "pixel_width": pixel_coordinate.width,
-                            "pixel_height": pixel_coordinate.height,
-                            "object_analysis_config": config_id
-                        }
-                    )
-                    image_mask.append(
-                        PixelCoordinate(
-                            width=coordinate.pixel_width,
-                            height=coordinate.pixel_height
-                        )
-                    )
-
-            await self._object_repository.delete_by_object_analysis_id(object_analysis_config_id=config_id)      
-            objects: list[ObjectEnum] = []
-            for request_object in request.objects:
-                object = await self._object_repository.create(
-                    values={
-                        "value": request_object,
-                        "object_analysis_config": config_id
-                    }
-                )
-                objects.append(ObjectEnum(object.value))
-
-            updated_object_analysis_config = await self._object_analysis_config_repository.update(
+            # old objects are replaced in the same transaction, update is never applied half way
+            updated_object_analysis_config = await self._object_analysis_config_repository.replace_with_children(
                 entity_id=config_id,
-                values={
-                    "image_resolution_width": request.image_resolution.width,
-                    "image_resolution_height": request.image_resolution.height,
-                    "confidence": request.confidence,
-                    "example_image_id": request.example_image_id,
-                    "config_name": request.config_name,
-                }
+                values=self._to_config_values(request),
+                objects=self._to_object_values(request)
             )
         except NotFoundException as err:
             raise ConfigureEntityNotFoundException(f"entity_{err.entity_id}_not_found_in_{err.table_name}")
+        finally:
+            self._mask_cache.invalidate(config_id=config_id)
+            if self._config_cache is not None:
+                self._config_cache.invalidate(config_id=config_id)
 
-        return ObjectAnalysisConfigResponse(
-            id=updated_object_analysis_config.id,
-            confidence=updated_object_analysis_config.confidence,
-            image_resolution=ImageResolution(
-                width=updated_object_analysis_config.image_resolution_width,
-                height=updated_object_analysis_config.image_resolution_height
-            ),
-            image_mask=image_mask if image_mask else None,
-            objects=objects,
-            example_image_id=updated_object_analysis_config.example_image_id,
-            config_name=updated_object_analysis_config.config_name,
-        )
+        return self._to_config_response(updated_object_analysis_config)
     
     async def delete_config(self, account_id: UUID, config_id: UUID) -> None:
         try:
             object_analysis_config = await self._object_analysis_config_repository.get_one(entity_id=config_id)
             self._validate_is_users_config(account_id, object_analysis_config)
             await self._object_analysis_config_repository.delete(entity_id=config_id)
+            self._mask_cache.invalidate(config_id=config_id)
+            if self._config_cache is not None:
+                self._config_cache.invalidate(config_id=config_id)
         except NotFoundException as err:
-            raise ConfigureEntityNotFoundException(f"entity_{err.entity_id}_not_found_in_{err.table_name}")
\ No newline at end of file
+            raise ConfigureEntityNotFoundException(f"entity_{err.entity_id}_not_found_in_{err.table_name}")
+
+    @staticmethod
+    def _to_config_values(request: ObjectAnalysisConfigRequest) -> dict[str, Any]:
+        return {
+            "config_name": request.config_name,
+            "image_resolution_width": request.image_resolution.width,
+            "image_resolution_height": request.image_resolution.height,
+            "confidence": request.confidence,
+            "tile_size": request.tile_size,
+            "tile_overlap": request.tile_overlap,
+            "example_image_id": request.example_image_id,
+            "mask_polygons": [
+                array([[pixel_coordinate.width, pixel_coordinate.height] for pixel_coordinate in polygon], dtype=int32)
+                for polygon in request.get_mask_polygons()
+            ] or None,
+        }
+
+    @staticmethod
+    def _to_object_values(request: ObjectAnalysisConfigRequest) -> list[dict[str, Any]]:
+        return [{"value": request_object} for request_object in request.objects]
+
+    @staticmethod
+    def _to_config_response(object_analysis_config: ObjectAnalysisConfig) -> ObjectAnalysisConfigResponse:
+        # 'objects' must be loaded with the configuration
+        return ObjectAnalysisConfigResponse(
+            id=object_analysis_config.id,
+            confidence=object_analysis_config.confidence,
+            tile_size=object_analysis_config.tile_size,
+            tile_overlap=object_analysis_config.tile_overlap,
+            image_resolution=ImageResolution(
+                width=object_analysis_config.image_resolution_width,
+                height=object_analysis_config.image_resolution_height
+            ),
+            mask_polygons=object_analysis_config.mask_polygons,
+            objects=[
+                ObjectEnum(object.value) for object in object_analysis_config.objects
+            ],
+            example_image_id=object_analysis_config.example_image_id,
+            config_name=object_analysis_config.config_name,
+            version=object_analysis_config.updated_at,
+        )
\ No newline at end of file
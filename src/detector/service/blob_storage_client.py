@@ -1,3 +1,5 @@
+from asyncio import to_thread
+from typing import BinaryIO
 import aioboto3
 from botocore.client import Config as BotoConfig
 
@@ -9,6 +11,18 @@ from ..model.dto import BlobFileContainerDto
 from ..exception.service import UploadFailed, DownloadFailed, DeleteFailed
 
 
+class _ThreadedStreamReader:
+    """
+    Async reader of a blocking binary stream, every read runs in a worker thread.
+    """
+
+    def __init__(self, stream: BinaryIO) -> None:
+        self._stream = stream
+
+    async def read(self, size: int = -1) -> bytes:
+        return await to_thread(self._stream.read, size)
+
+
 class BlobStorageClient(AbstractBlobStorageClient):
 
     def __init__(self, config: Config) -> None:
@@ -35,6 +49,23 @@ class BlobStorageClient(AbstractBlobStorageClient):
             except Exception as e:
                 raise UploadFailed("blob_upload_failed") from e
     
+    async def upload_stream(self, blob_path: str, stream: BinaryIO) -> None:
+        async with self._session.client(
+            "s3",
+            endpoint_url=self._config.require_config("SCALEWAY_BLOB_ENDPOINT"),
+            config=BotoConfig(signature_version="s3v4"),
+        ) as s3:
+            try:
+                stream.seek(0)
+                # stream is read in chunks off the event loop, uploads spooled to disk would block it otherwise
+                await s3.upload_fileobj(
+                    Fileobj=_ThreadedStreamReader(stream),
+                    Bucket=self._config.require_config("SCALEWAY_BUCKET"),
+                    Key=blob_path,
+                )
+            except Exception as e:
+                raise UploadFailed("blob_upload_failed") from e
+    
     async def download(self, path: str) -> BlobFileContainerDto:
         async with self._session.client(
             "s3",
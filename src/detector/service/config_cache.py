@@ -0,0 +1,55 @@
+from typing import Optional
+from uuid import UUID
+
+from common.cache import LRUCache
+
+# local imports
+from ..interface import AbstractConfigCache
+from ..model.api import ObjectAnalysisConfigResponse, CacheMetricsResponse
+
+
+class ConfigCache(AbstractConfigCache):
+    """
+    Keeps resolved analysis configurations with their owner, so analysis requests don't load
+    configuration from the database. Configuration manager invalidates changed configurations,
+    TTL bounds how long changes made by other workers stay unnoticed.
+    """
+
+    def __init__(self, max_entries: int = 1000, ttl: float = 60.0):
+        """
+        Initialize configuration cache.
+
+        :param max_entries: maximum number of cached configurations, defaults to 1000
+        :type max_entries: int, optional
+        :param ttl: seconds after which cached configuration expires, defaults to 1 minute
+        :type ttl: float, optional
+        """
+        self._cache: LRUCache[UUID, tuple[UUID, ObjectAnalysisConfigResponse]] = LRUCache(max_size=max_entries, ttl=ttl)
+        self._generation = 0
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    def get(self, config_id: UUID) -> Optional[tuple[UUID, ObjectAnalysisConfigResponse]]:
+        return self._cache.get(config_id)
+
+    def put(self, account_id: UUID, object_analysis_config: ObjectAnalysisConfigResponse, generation: int) -> None:
+        # configuration might have been changed while it was loaded
+        if generation != self._generation:
+            return
+
+        self._cache.put(object_analysis_config.id, (account_id, object_analysis_config))
+
+    def invalidate(self, config_id: UUID) -> None:
+        self._generation += 1
+        self._cache.invalidate(config_id)
+
+    def get_metrics(self) -> CacheMetricsResponse:
+        return CacheMetricsResponse(
+            entries=len(self._cache),
+            hits=self._cache.hits,
+            misses=self._cache.misses,
+            hit_rate=self._cache.hit_rate,
+            evictions=self._cache.evictions,
+        )
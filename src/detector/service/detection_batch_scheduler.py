@@ -0,0 +1,231 @@
+from asyncio import Event, Future, Queue, QueueEmpty, Semaphore, Task, TimeoutError, CancelledError, create_task, gather, get_running_loop, wait_for
+from concurrent.futures import Executor
+from functools import partial
+from time import monotonic
+from typing import Optional
+from numpy import ndarray
+
+# local imports
+from ..interface import AbstractDetectionScheduler
+from ..interface.detector import AbstractObjectDetector
+from ..model.enum import ObjectEnum
+from ..model.dto import ObjectBoundingBoxDto
+from ..model.api import DetectionBatchMetricsResponse
+
+
+class _DetectionRequest:
+    __slots__ = ("image", "objects", "confidence", "future", "enqueued_at")
+
+    def __init__(self, image: ndarray, objects: list[ObjectEnum], confidence: Optional[int], future: Future):
+        self.image = image
+        self.objects = objects
+        self.confidence = confidence
+        self.future = future
+        self.enqueued_at = monotonic()
+
+
+class DetectionBatchScheduler(AbstractDetectionScheduler):
+    """
+    Collects concurrent detection requests and runs them through the detector as a single
+    batched forward pass. A batch is dispatched when it reaches maximum batch size or when
+    the oldest request in it has waited for the maximum wait time.
+
+    Forward passes are run in the provided executor so they never block the event loop. At most
+    'max_concurrent_batches' batches are in flight, new requests keep queueing up meanwhile and
+    are picked up by the next batch.
+    """
+
+    def __init__(
+        self,
+        object_detector: AbstractObjectDetector,
+        executor: Executor,
+        max_batch_size: int = 8,
+        max_wait_time: float = 0.01,
+        max_concurrent_batches: int = 1
+    ):
+        """
+        Initialize detection batch scheduler.
+
+        :param object_detector: Detector used for running batched forward passes
+        :type object_detector: AbstractObjectDetector
+        :param executor: Executor in which forward passes are run
+        :type executor: Executor
+        :param max_batch_size: maximum number of images in single batch, defaults to 8
+        :type max_batch_size: int, optional
+        :param max_wait_time: maximum time (seconds) request waits for batch to fill up, defaults to 10ms
+        :type max_wait_time: float, optional
+        :param max_concurrent_batches: maximum number of batches run at once, should match executor size, defaults to 1
+        :type max_concurrent_batches: int, optional
+        """
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size_must_be_positive")
+
+        if max_concurrent_batches < 1:
+            raise ValueError("max_concurrent_batches_must_be_positive")
+
+        self._object_detector = object_detector
+        self._executor = executor
+        self._max_batch_size = max_batch_size
+        self._max_wait_time = max_wait_time
+
+        self._queue: Queue[_DetectionRequest] = Queue()
+        self._request_added = Event()
+        self._batch_slots = Semaphore(max_concurrent_batches)
+        self._running_batches: set[Task] = set()
+        self._collected_batch: list[_DetectionRequest] = []
+        self._worker: Optional[Task] = None
+
+        # metrics
+        self._batches_processed = 0
+        self._requests_processed = 0
+        self._batch_size_histogram: dict[int, int] = {}
+        self._total_wait_time = 0.0
+        self._max_observed_wait_time = 0.0
+
+    async def start(self) -> None:
+        if self._worker is None:
+            self._worker = create_task(self._process_batches())
+
+    async def stop(self) -> None:
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except CancelledError:
+                pass
+            self._worker = None
+
+        # let batches which are already running in executor finish
+        await gather(*self._running_batches, return_exceptions=True)
+
+        # fail requests which never made it into a running batch
+        pending_requests = self._collected_batch
+        self._collected_batch = []
+        while not self._queue.empty():
+            pending_requests.append(self._queue.get_nowait())
+
+        for request in pending_requests:
+            if not request.future.done():
+                request.future.set_exception(RuntimeError("detection_scheduler_stopped"))
+
+    async def count(self, image: ndarray, objects: list[ObjectEnum], confidence: Optional[int] = None) -> dict[ObjectEnum, int]:
+        detection_results = await self.detect(image=image, objects=objects, confidence=confidence)
+
+        return {object_enum: len(boxes) for object_enum, boxes in detection_results.items()}
+
+    async def detect(self, image: ndarray, objects: list[ObjectEnum], confidence: Optional[int] = None) -> dict[ObjectEnum, list[ObjectBoundingBoxDto]]:
+        if self._worker is None:
+            raise RuntimeError("detection_scheduler_not_started")
+
+        future = get_running_loop().create_future()
+        self._queue.put_nowait(_DetectionRequest(image=image, objects=objects, confidence=confidence, future=future))
+        self._request_added.set()
+
+        return await future
+
+    async def detect_batch(self, images: list[ndarray], objects: list[ObjectEnum], confidence: Optional[int] = None) -> list[dict[ObjectEnum, list[ObjectBoundingBoxDto]]]:
+        if self._worker is None:
+            raise RuntimeError("detection_scheduler_not_started")
+
+        # requests are queued back to back, so worker collects them into the same batch
+        loop = get_running_loop()
+        futures = [loop.create_future() for _ in images]
+        for image, future in zip(images, futures):
+            self._queue.put_nowait(_DetectionRequest(image=image, objects=objects, confidence=confidence, future=future))
+        self._request_added.set()
+
+        return await gather(*futures)
+
+    def get_metrics(self) -> DetectionBatchMetricsResponse:
+        return DetectionBatchMetricsResponse(
+            batches_processed=self._batches_processed,
+            requests_processed=self._requests_processed,
+            average_batch_size=self._requests_processed / self._batches_processed if self._batches_processed else 0.0,
+            max_batch_size=max(self._batch_size_histogram, default=0),
+            batch_size_histogram=dict(sorted(self._batch_size_histogram.items())),
+            average_wait_time_ms=self._total_wait_time * 1000 / self._requests_processed if self._requests_processed else 0.0,
+            max_wait_time_ms=self._max_observed_wait_time * 1000,
+        )
+
+    async def _process_batches(self) -> None:
+        while True:
+            # wait for free executor slot, requests keep queueing up meanwhile
+            await self._batch_slots.acquire()
+            try:
+                batch = await self._collect_batch()
+            except BaseException:
+                self._batch_slots.release()
+                raise
+
+            self._collected_batch = []
+            task = create_task(self._run_batch(batch))
+            self._running_batches.add(task)
+            task.add_done_callback(self._on_batch_done)
+
+    def _on_batch_done(self, task: Task) -> None:
+        self._running_batches.discard(task)
+        self._batch_slots.release()
+
+    async def _collect_batch(self) -> list[_DetectionRequest]:
+        # block until there is at least one request, then wait for batch to fill up
+        batch = self._collected_batch
+        batch.append(await self._queue.get())
+        deadline = batch[0].enqueued_at + self._max_wait_time
+
+        while len(batch) < self._max_batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+                continue
+            except QueueEmpty:
+                pass
+
+            remaining_time = deadline - monotonic()
+            if remaining_time <= 0:
+                break
+
+            self._request_added.clear()
+            try:
+                await wait_for(self._request_added.wait(), timeout=remaining_time)
+            except TimeoutError:
+                break
+
+        return batch
+
+    async def _run_batch(self, batch: list[_DetectionRequest]) -> None:
+        # requests might have been cancelled (e.g. client disconnected) while waiting
+        batch = [request for request in batch if not request.future.done()]
+        if not batch:
+            return
+
+        self._record_batch(batch)
+        try:
+            batch_results = await get_running_loop().run_in_executor(
+                self._executor,
+                partial(
+                    self._object_detector.detect_batch,
+                    images=[request.image for request in batch],
+                    objects=[request.objects for request in batch],
+                    confidences=[request.confidence for request in batch],
+                )
+            )
+        except Exception as err:  # pylint: disable=broad-exception-caught
+            for request in batch:
+                if not request.future.done():
+                    request.future.set_exception(err)
+            return
+
+        for request, results in zip(batch, batch_results):
+            if not request.future.done():
+                request.future.set_result(results)
+
+    def _record_batch(self, batch: list[_DetectionRequest]) -> None:
+        dispatched_at = monotonic()
+        batch_size = len(batch)
+
+        self._batches_processed += 1
+        self._requests_processed += batch_size
+        self._batch_size_histogram[batch_size] = self._batch_size_histogram.get(batch_size, 0) + 1
+        for request in batch:
+            wait_time = dispatched_at - request.enqueued_at
+            self._total_wait_time += wait_time
+            self._max_observed_wait_time = max(self._max_observed_wait_time, wait_time)
@@ -0,0 +1,152 @@
+from asyncio import gather, get_running_loop, sleep
+from concurrent.futures import Executor
+from logging import getLogger
+from threading import Barrier, BrokenBarrierError
+from time import perf_counter
+from typing import Optional
+from numpy.random import default_rng
+
+# local imports
+from ..interface import AbstractDetectorWarmUp
+from ..interface.detector import AbstractObjectDetector
+from ..model.enum import ObjectEnum
+from ..model.api import DetectorWarmUpMetricsResponse
+
+logger = getLogger(__name__)
+
+
+class DetectorWarmUp(AbstractDetectorWarmUp):
+    """
+    Runs detector on synthetic frames before service accepts traffic, so that lazy model
+    initialization, thread pool spin-up and memory allocation are not paid by first requests.
+
+    Every inference thread of the executor runs the warm-up, because detectors may hold
+    per-thread state (e.g. 'YoloDetector' model instances). Detectors running in worker
+    processes warm up each of their workers.
+
+    Failed warm-up is logged and retried. Once all attempts fail, service is reported ready in
+    degraded state, so that it serves traffic with a cold detector instead of never getting any.
+    """
+
+    def __init__(
+        self,
+        object_detector: AbstractObjectDetector,
+        executor: Executor,
+        executor_workers: int,
+        resolutions: list[tuple[int, int]],
+        batch_sizes: list[int],
+        iterations: int = 2,
+        attempts: int = 3,
+        retry_delay: float = 5.0
+    ):
+        """
+        Initialize detector warm-up.
+
+        :param object_detector: Detector to warm up
+        :type object_detector: AbstractObjectDetector
+        :param executor: Executor in which forward passes are run
+        :type executor: Executor
+        :param executor_workers: Number of executor threads
+        :type executor_workers: int
+        :param resolutions: Frame resolutions (width, height) to warm up with
+        :type resolutions: list[tuple[int, int]]
+        :param batch_sizes: Batch sizes to warm up with
+        :type batch_sizes: list[int]
+        :param iterations: Number of forward passes per resolution and batch size, defaults to 2
+        :type iterations: int, optional
+        :param attempts: Number of times warm-up is tried before giving up, defaults to 3
+        :type attempts: int, optional
+        :param retry_delay: Seconds to wait before retrying failed warm-up, defaults to 5
+        :type retry_delay: float, optional
+        """
+        self._object_detector = object_detector
+        self._executor = executor
+        self._executor_workers = executor_workers
+        self._resolutions = resolutions
+        self._batch_sizes = batch_sizes
+        self._iterations = iterations
+        self._attempts = max(1, attempts)
+        self._retry_delay = retry_delay
+
+        self._ready = False
+        self._degraded = False
+        self._duration: Optional[float] = None
+        self._inference_times: dict[str, list[float]] = {}
+        self._error: Optional[str] = None
+
+    @property
+    def is_ready(self) -> bool:
+        return self._ready
+
+    async def run(self) -> None:
+        started_at = perf_counter()
+        for attempt in range(1, self._attempts + 1):
+            self._inference_times.clear()
+            error = await self._run_attempt()
+            if error is None:
+                self._error = None
+                self._duration = perf_counter() - started_at
+                self._ready = True
+                return
+
+            self._error = repr(error)
+            logger.warning("detector_warm_up_failed attempt=%d/%d", attempt, self._attempts, exc_info=error)
+            if attempt < self._attempts:
+                await sleep(self._retry_delay)
+
+        # warm-up only saves first requests from paying for initialization, detector may still work
+        logger.error("detector_warm_up_gave_up, serving traffic with cold detector")
+        self._duration = perf_counter() - started_at
+        self._degraded = True
+        self._ready = True
+
+    def get_metrics(self) -> DetectorWarmUpMetricsResponse:
+        return DetectorWarmUpMetricsResponse(
+            ready=self._ready,
+            degraded=self._degraded,
+            duration_ms=self._duration * 1000 if self._duration is not None else None,
+            inference_times_ms=self._inference_times,
+            error=self._error,
+        )
+
+    async def _run_attempt(self) -> Optional[BaseException]:
+        # barrier makes every warm-up task wait for the others, so each one occupies a different thread
+        barrier = Barrier(self._executor_workers)
+        loop = get_running_loop()
+        # wait for all threads, so that retry never overlaps with threads of failed attempt
+        results = await gather(
+            *(
+                loop.run_in_executor(self._executor, self._warm_up_thread, barrier)
+                for _ in range(self._executor_workers)
+            ),
+            return_exceptions=True
+        )
+
+        return next((result for result in results if isinstance(result, BaseException)), None)
+
+    def _warm_up_thread(self, barrier: Barrier) -> None:
+        random_generator = default_rng(seed=0)
+        objects = list(ObjectEnum)
+        try:
+            for width, height in self._resolutions:
+                # noise makes model produce candidate boxes, so post-processing is warmed up as well
+                frame = random_generator.integers(0, 256, size=(height, width, 3), dtype="uint8")
+                for batch_size in self._batch_sizes:
+                    timings = self._inference_times.setdefault(f"{width}x{height}@{batch_size}", [])
+                    for _ in range(self._iterations):
+                        started_at = perf_counter()
+                        self._object_detector.warm_up(
+                            images=[frame] * batch_size,
+                            objects=[objects] * batch_size,
+                            confidences=[None] * batch_size,
+                        )
+                        timings.append((perf_counter() - started_at) * 1000)
+        except BaseException:
+            # release other threads waiting on the barrier
+            barrier.abort()
+            raise
+
+        try:
+            barrier.wait()
+        except BrokenBarrierError:
+            pass
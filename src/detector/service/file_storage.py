@@ -1,5 +1,5 @@
 from uuid import UUID, uuid4
-from typing import Union
+from typing import BinaryIO, Union
 from fastapi import UploadFile
 
 from common.exception.repository_exception import NotFoundException
@@ -25,14 +25,7 @@ class FileStorage(AbstractFileStorage):
 
     
     async def store_file(self, account_id: UUID, file: FileContainerDto) -> UUID:
-        filename = f"{str(uuid4())}.{file.data_format}"
-        blob_file_path = f"{account_id}/{filename}"
-        try:
-            file_entry = await self._file_register_repository.create(
-                {"account_id": account_id, "file_name": filename, "file_path": blob_file_path, "data_format": file.data_format}
-            )
-        except Exception as err:
-            raise FileStoringFailed("failed_to_store_file") from err
+        file_id, blob_file_path = await self._register_file(account_id=account_id, data_format=file.data_format)
 
         try:
             await self._blob_storage_client.upload(
@@ -44,7 +37,29 @@ class FileStorage(AbstractFileStorage):
         except UploadFailed:
             raise FileStoringFailed("failed_to_store_file")
         
-        return file_entry.id
+        return file_id
+
+    async def store_stream(self, account_id: UUID, data_format: str, stream: BinaryIO) -> UUID:
+        file_id, blob_file_path = await self._register_file(account_id=account_id, data_format=data_format)
+
+        try:
+            await self._blob_storage_client.upload_stream(blob_path=blob_file_path, stream=stream)
+        except UploadFailed:
+            raise FileStoringFailed("failed_to_store_file")
+
+        return file_id
+
+    async def _register_file(self, account_id: UUID, data_format: str) -> tuple[UUID, str]:
+        filename = f"{str(uuid4())}.{data_format}"
+        blob_file_path = f"{account_id}/{filename}"
+        try:
+            file_entry = await self._file_register_repository.create(
+                {"account_id": account_id, "file_name": filename, "file_path": blob_file_path, "data_format": data_format}
+            )
+        except Exception as err:
+            raise FileStoringFailed("failed_to_store_file") from err
+
+        return file_entry.id, blob_file_path
 
 
     async def fetch_file(self, account_id: UUID, file_id: UUID) -> FileContainerDto:
@@ -0,0 +1,73 @@
+from typing import Optional
+from numpy import ndarray
+from cv2 import absdiff, cvtColor, resize, COLOR_BGR2GRAY, INTER_AREA
+
+# local imports
+from ..model.dto import MaskRasterDto
+
+
+class FrameChangeGate:
+    """
+    Decides whether a stream frame differs enough from the last analyzed frame to be worth
+    running detection on. Frames are compared as small grayscale thumbnails of the region left
+    visible by the mask; change is the mean absolute difference of visible pixels (0...1.0).
+
+    Gate keeps state of a single stream and is not thread-safe.
+    """
+
+    def __init__(self, threshold: float, thumbnail_size: int = 64):
+        """
+        Initialize frame change gate.
+
+        :param threshold: smallest change (0...1.0) for which frame is analyzed again
+        :type threshold: float
+        :param thumbnail_size: longer side (pixels) of thumbnails frames are compared on, defaults to 64
+        :type thumbnail_size: int, optional
+        """
+        self._threshold = threshold
+        self._thumbnail_size = thumbnail_size
+        self._reference: Optional[ndarray] = None
+        self._mask_raster: Optional[MaskRasterDto] = None
+        self._visible_share = 1.0
+
+    def has_changed(self, visible_image_array: ndarray, mask_raster: MaskRasterDto) -> bool:
+        """
+        Compare masked visible region of the frame with the last analyzed frame. Frame which has
+        changed becomes the new reference, so slow changes still add up until they pass threshold.
+
+        :param visible_image_array: Visible region of the frame, masked pixels set to 0
+        :type visible_image_array: ndarray
+        :param mask_raster: Mask applied to the frame
+        :type mask_raster: MaskRasterDto
+        :return: 'True' if frame has to be analyzed, 'False' if previous result still applies
+        :rtype: bool
+        """
+        if mask_raster is not self._mask_raster:
+            self._mask_raster = mask_raster
+            self._visible_share = float(mask_raster.raster.mean()) if mask_raster.raster is not None else 1.0
+            self._reference = None
+
+        thumbnail = self._to_thumbnail(visible_image_array)
+        if self._reference is None or self._reference.shape != thumbnail.shape:
+            changed = True
+        else:
+            # masked pixels are 0 on both frames, only visible pixels contribute to the difference
+            change = float(absdiff(thumbnail, self._reference).mean()) / 255 / self._visible_share
+            changed = change >= self._threshold
+
+        if changed:
+            self._reference = thumbnail
+        return changed
+
+    def reset(self) -> None:
+        # next frame is analyzed regardless of change, e.g. after detection of reference frame failed
+        self._reference = None
+
+    def _to_thumbnail(self, image: ndarray) -> ndarray:
+        height, width = image.shape[:2]
+        scale = self._thumbnail_size / max(height, width)
+        if scale < 1:
+            # area interpolation averages pixels, which also smooths out sensor noise of dark scenes
+            image = resize(image, (max(1, round(width * scale)), max(1, round(height * scale))), interpolation=INTER_AREA)
+
+        return cvtColor(image, COLOR_BGR2GRAY)
@@ -0,0 +1,54 @@
+from asyncio import Event
+from collections import deque
+
+# local imports
+from ..model.dto import StreamFrameDto
+
+
+class FrameStreamBuffer:
+    """
+    Frames received from a stream, waiting for analysis. When analysis falls behind, oldest
+    waiting frames are dropped, so analyzed frame is never more than 'max_pending' frames
+    behind the latest received one.
+
+    Buffer is not thread-safe, it's meant to be used from the event loop.
+    """
+
+    def __init__(self, max_pending: int = 1):
+        """
+        Initialize frame stream buffer.
+
+        :param max_pending: maximum number of frames waiting for analysis, defaults to 1 (latest frame only)
+        :type max_pending: int, optional
+        """
+        self._frames: deque[StreamFrameDto] = deque(maxlen=max_pending)
+        self._available = Event()
+        self._closed = False
+        self._sequence = 0
+
+        # metrics
+        self.dropped = 0
+
+    def put(self, content: bytes) -> None:
+        if len(self._frames) == self._frames.maxlen:
+            self.dropped += 1
+        self._frames.append(StreamFrameDto(sequence=self._sequence, content=content))
+        self._sequence += 1
+        self._available.set()
+
+    def close(self) -> None:
+        # frames already waiting are still handed out
+        self._closed = True
+        self._available.set()
+
+    def __aiter__(self) -> "FrameStreamBuffer":
+        return self
+
+    async def __anext__(self) -> StreamFrameDto:
+        while not self._frames:
+            if self._closed:
+                raise StopAsyncIteration
+            self._available.clear()
+            await self._available.wait()
+
+        return self._frames.popleft()
@@ -0,0 +1,173 @@
+from typing import Optional
+from numpy import ndarray, array, argsort, flatnonzero, float64, int64, maximum, minimum, zeros
+
+# local imports
+from ..model.enum import ObjectEnum
+from ..model.dto import ImageTileDto, ObjectBoundingBoxDto, PixelCoordinateDto
+
+# distance (pixels) from a tile seam within which box is considered cut off by it
+_SEAM_MARGIN = 2
+
+
+class FrameTiler:
+    """
+    Splits high resolution frames into overlapping tiles, so that small (distant) objects keep
+    enough pixels after the detector scales its input down, and merges objects detected on the
+    tiles back into frame coordinates.
+
+    Objects crossing a tile seam are detected on several tiles, possibly cut off on some of
+    them. Box touching a seam is merged with a box from another tile into their union when they
+    match by intersection over the smaller box (a fragment is mostly covered by the whole object),
+    all other duplicates are suppressed by IoU, so that distinct adjacent objects are kept apart.
+    Boxes from the same tile were already suppressed by the detector.
+    """
+
+    def __init__(self, tile_size: int, overlap: float = 0.2, match_threshold: float = 0.5, nms_threshold: float = 0.5):
+        """
+        Initialize frame tiler.
+
+        :param tile_size: length of tile side in pixels
+        :type tile_size: int
+        :param overlap: share (0...1.0) of tile side overlapping with the neighbouring tile, defaults to 0.2
+        :type overlap: float, optional
+        :param match_threshold: smallest intersection over smaller box for merging box cut off by a tile seam, defaults to 0.5
+        :type match_threshold: float, optional
+        :param nms_threshold: smallest IoU for suppressing less confident duplicate, defaults to 0.5
+        :type nms_threshold: float, optional
+        """
+        if tile_size < 1:
+            raise ValueError("tile_size_must_be_positive")
+
+        if not 0 <= overlap < 1:
+            raise ValueError("tile_overlap_must_be_below_one")
+
+        self._tile_size = tile_size
+        self._stride = max(1, round(tile_size * (1 - overlap)))
+        self._match_threshold = match_threshold
+        self._nms_threshold = nms_threshold
+
+    def split(self, image_array: ndarray, raster: Optional[ndarray] = None) -> list[ImageTileDto]:
+        """
+        Split image into overlapping tiles, tiles which are fully masked are left out.
+
+        :param image_array: Image to split (visible region of the masked frame)
+        :type image_array: ndarray
+        :param raster: Mask raster of the image, 1 for visible and 0 for masked pixels, defaults to no mask
+        :type raster: Optional[ndarray], optional
+        :return: Tiles as views into the image, empty if image fits into a single tile
+        :rtype: list[ImageTileDto]
+        """
+        height, width = image_array.shape[:2]
+        if height <= self._tile_size and width <= self._tile_size:
+            return []
+
+        tiles: list[ImageTileDto] = []
+        for top in self._get_tile_starts(height):
+            for left in self._get_tile_starts(width):
+                right, bottom = min(left + self._tile_size, width), min(top + self._tile_size, height)
+                if raster is not None and not raster[top:bottom, left:right].any():
+                    continue
+                tiles.append(ImageTileDto(region=(left, top, right, bottom), image=image_array[top:bottom, left:right]))
+
+        return tiles
+
+    def merge(
+        self,
+        regions: list[tuple[int, int, int, int]],
+        grouped_located_objects: list[dict[ObjectEnum, list[ObjectBoundingBoxDto]]]
+    ) -> dict[ObjectEnum, list[ObjectBoundingBoxDto]]:
+        """
+        Move objects detected on tiles into frame coordinates and merge duplicates across tiles.
+
+        :param regions: (left, top, right, bottom) region of each tile on the frame, whole frame can be one of them
+        :type regions: list[tuple[int, int, int, int]]
+        :param grouped_located_objects: Objects detected on each tile grouped by object type
+        :type grouped_located_objects: list[dict[ObjectEnum, list[ObjectBoundingBoxDto]]]
+        :return: Detected objects grouped by object type
+        :rtype: dict[ObjectEnum, list[ObjectBoundingBoxDto]]
+        """
+        frame_right = max(right for _, _, right, _ in regions)
+        frame_bottom = max(bottom for _, _, _, bottom in regions)
+        object_enums = dict.fromkeys(object_enum for tile_objects in grouped_located_objects for object_enum in tile_objects)
+
+        merged: dict[ObjectEnum, list[ObjectBoundingBoxDto]] = {}
+        for object_enum in object_enums:
+            sources, confidences, boxes, cut = [], [], [], []
+            for source, ((left, top, right, bottom), tile_objects) in enumerate(zip(regions, grouped_located_objects)):
+                for box in tile_objects.get(object_enum, []):
+                    sources.append(source)
+                    confidences.append(box.confidence)
+                    boxes.append([
+                        box.top_left.width + left, box.top_left.height + top,
+                        box.bottom_right.width + left, box.bottom_right.height + top
+                    ])
+                    # tile edges inside the frame are seams, frame edges don't cut objects off
+                    cut.append(
+                        (left > 0 and box.top_left.width <= _SEAM_MARGIN)
+                        or (top > 0 and box.top_left.height <= _SEAM_MARGIN)
+                        or (right < frame_right and box.bottom_right.width >= right - left - _SEAM_MARGIN)
+                        or (bottom < frame_bottom and box.bottom_right.height >= bottom - top - _SEAM_MARGIN)
+                    )
+
+            merged[object_enum] = self._merge_boxes(
+                object_enum=object_enum,
+                sources=array(sources, dtype=int64),
+                confidences=confidences,
+                boxes=array(boxes, dtype=float64).reshape(-1, 4),
+                cut=array(cut, dtype=bool)
+            )
+
+        return merged
+
+    def _merge_boxes(self, object_enum: ObjectEnum, sources: ndarray, confidences: list[int], boxes: ndarray, cut: ndarray) -> list[ObjectBoundingBoxDto]:
+        intersection_over_union, intersection_over_smaller = _overlap_matrices(boxes)
+        merged = zeros(len(boxes), dtype=bool)
+
+        merged_boxes: list[ObjectBoundingBoxDto] = []
+        # most confident box of each group is kept, grows into union with fragments and suppresses duplicates
+        for index in argsort([-confidence for confidence in confidences], kind="stable").tolist():
+            if merged[index]:
+                continue
+            merged[index] = True
+            fragments = flatnonzero(
+                (intersection_over_smaller[index] >= self._match_threshold) & (cut | cut[index]) & (sources != sources[index]) & ~merged
+            )
+            merged[fragments] = True
+            duplicates = flatnonzero((intersection_over_union[index] >= self._nms_threshold) & ~merged)
+            merged[duplicates] = True
+
+            group = boxes[[index, *fragments.tolist()]]
+            left, top = group[:, :2].min(axis=0).tolist()
+            right, bottom = group[:, 2:].max(axis=0).tolist()
+            # values are already validated so DTOs are constructed without validation
+            merged_boxes.append(
+                ObjectBoundingBoxDto.model_construct(
+                    object_type=object_enum,
+                    confidence=confidences[index],
+                    top_left=PixelCoordinateDto.model_construct(width=int(left), height=int(top)),
+                    bottom_right=PixelCoordinateDto.model_construct(width=int(right), height=int(bottom))
+                )
+            )
+
+        return merged_boxes
+
+    def _get_tile_starts(self, length: int) -> list[int]:
+        if length <= self._tile_size:
+            return [0]
+
+        starts = list(range(0, length - self._tile_size, self._stride))
+        # last tile is aligned with the image edge instead of reaching past it
+        starts.append(length - self._tile_size)
+        return starts
+
+
+def _overlap_matrices(boxes: ndarray) -> tuple[ndarray, ndarray]:
+    left = maximum(boxes[:, None, 0], boxes[None, :, 0])
+    top = maximum(boxes[:, None, 1], boxes[None, :, 1])
+    right = minimum(boxes[:, None, 2], boxes[None, :, 2])
+    bottom = minimum(boxes[:, None, 3], boxes[None, :, 3])
+    intersection = maximum(right - left, 0) * maximum(bottom - top, 0)
+
+    area = (boxes[:, 2] - boxes[:, 0]) * (boxes[:, 3] - boxes[:, 1])
+    union = area[:, None] + area[None, :] - intersection
+    return intersection / maximum(union, 1e-9), intersection / maximum(minimum(area[:, None], area[None, :]), 1e-9)
@@ -1,36 +1,680 @@
+from asyncio import FIRST_COMPLETED, Future, create_task, ensure_future, gather, get_running_loop, to_thread, wait
+from collections import deque
+from typing import AsyncIterator, Awaitable, Callable, Optional, TypeVar
+from numpy import ndarray
 from fastapi import UploadFile
 
+from common.exception import HTTPException
+
 # local imports
-from ..interface.detector import AbstractObjectDetector
-from ..interface import AbstractImageProcessor, AbstractImageAnalyzer
-from ..model.api import ObjectCountResponse, ObjectLocationResponse, ObjectAnalysisConfigResponse
+from ..interface import AbstractImageProcessor, AbstractImageAnalyzer, AbstractDetectionScheduler, AbstractMaskCache, AbstractResultCache
+from ..model.enum import ObjectEnum, ImageFormatEnum
+from ..model.dto import ObjectBoundingBoxDto, PixelCoordinateDto, ImageResolutionDto, DecodedImageDto, EncodedImageDto, VideoFrameDto, MaskRasterDto
+from ..model.api import StreamMetricsResponse, ObjectTrackingResponse, TrackedObjectResponse, TrackEventResponse, VideoFrameTrackResponse, StreamFrameTrackResponse, ObjectCountResponse, ObjectLocationResponse, ObjectAnalysisResponse, ObjectAnalysisConfigResponse, BatchItemErrorResponse, ObjectCountBatchItemResponse, ObjectLocationBatchItemResponse, VideoFrameCountResponse, VideoFrameLocationResponse, StreamFrameCountResponse, StreamFrameLocationResponse
+from ..exception import AnalyzerException, AnalyzeBadRequestException
+from ..tracker import ObjectTracker
+from .upload_buffer import hash_upload
+from .video_frame_reader import VideoFrameReader
+from .frame_stream_buffer import FrameStreamBuffer
+from .frame_change_gate import FrameChangeGate
+from .frame_tiler import FrameTiler
+
+BATCH_ITEM = TypeVar("BATCH_ITEM", ObjectCountBatchItemResponse, ObjectLocationBatchItemResponse)
+VIDEO_FRAME = TypeVar("VIDEO_FRAME", VideoFrameCountResponse, VideoFrameLocationResponse, VideoFrameTrackResponse)
+STREAM_FRAME = TypeVar("STREAM_FRAME", StreamFrameCountResponse, StreamFrameLocationResponse, StreamFrameTrackResponse)
 
 
 class ImageAnalyzer(AbstractImageAnalyzer):
 
-    def __init__(self, object_detector: AbstractObjectDetector, image_processor: AbstractImageProcessor) -> None:
-        self._object_detector = object_detector
+    def __init__(
+        self,
+        detection_scheduler: AbstractDetectionScheduler,
+        image_processor: AbstractImageProcessor,
+        mask_cache: AbstractMaskCache,
+        result_cache: Optional[AbstractResultCache] = None,
+        batch_max_images: int = 32,
+        batch_max_in_flight_images: int = 16,
+        video_max_in_flight_frames: int = 16,
+        stream_max_pending_frames: int = 1,
+        stream_change_threshold: float = 0.0,
+        track_low_confidence: float = 0.1,
+        track_max_lost: int = 30,
+        annotated_image_quality: int = 85,
+        annotated_image_max_size: int = 1920
+    ) -> None:
+        self._detection_scheduler = detection_scheduler
         self._image_processor = image_processor
+        self._mask_cache = mask_cache
+        self._result_cache = result_cache
+        self._batch_max_images = batch_max_images
+        self._batch_max_in_flight_images = batch_max_in_flight_images
+        self._video_max_in_flight_frames = video_max_in_flight_frames
+        self._stream_max_pending_frames = stream_max_pending_frames
+        self._stream_change_threshold = stream_change_threshold
+        self._track_low_confidence = track_low_confidence
+        self._track_max_lost = track_max_lost
+        self._annotated_image_quality = annotated_image_quality
+        self._annotated_image_max_size = annotated_image_max_size
+
+        # metrics
+        self._stream_frames_processed = 0
+        self._stream_inference_skipped = 0
 
     async def count_objects(self, file: UploadFile, object_analysis_config: ObjectAnalysisConfigResponse) -> list[ObjectCountResponse]:
-        image_array = await self._image_processor.file_to_image_array(file=file)
-        masked_image_array = self._image_processor.draw_blackout_mask(image_array=image_array, resolution=object_analysis_config.image_resolution, mask=object_analysis_config.image_mask)
-        counted_objects = self._object_detector.count(image=masked_image_array, objects=object_analysis_config.objects, confidence=object_analysis_config.confidence)
+        grouped_located_objects = await self._detect_objects(file=file, object_analysis_config=object_analysis_config)
+
+        return self._to_object_counts(grouped_located_objects=grouped_located_objects, objects=object_analysis_config.objects)
+    
+    async def locate_objects(self, file: UploadFile, object_analysis_config: ObjectAnalysisConfigResponse) -> list[ObjectLocationResponse]:
+        grouped_located_objects = await self._detect_objects(file=file, object_analysis_config=object_analysis_config)
+
+        return self._to_object_locations(grouped_located_objects=grouped_located_objects)
+
+    async def analyze_objects(self, file: UploadFile, object_analysis_config: ObjectAnalysisConfigResponse) -> ObjectAnalysisResponse:
+        # counts are derived from located objects so image is decoded and inferred only once
+        grouped_located_objects = await self._detect_objects(file=file, object_analysis_config=object_analysis_config)
+
+        return ObjectAnalysisResponse(
+            counts=self._to_object_counts(grouped_located_objects=grouped_located_objects, objects=object_analysis_config.objects),
+            locations=self._to_object_locations(grouped_located_objects=grouped_located_objects)
+        )
+
+    async def annotate_objects(
+        self,
+        file: UploadFile,
+        object_analysis_config: ObjectAnalysisConfigResponse,
+        image_format: ImageFormatEnum = ImageFormatEnum.JPEG,
+        quality: Optional[int] = None,
+        max_size: Optional[int] = None
+    ) -> EncodedImageDto:
+        # decoded image is needed for drawing, so result cache is not consulted
+        decoded_image = await self._image_processor.decode_image(file=file, full_resolution=object_analysis_config.tile_size is not None)
+        mask_raster = self._mask_cache.get_mask(
+            object_analysis_config=object_analysis_config,
+            image_shape=decoded_image.image.shape,
+            reduction=decoded_image.reduction
+        )
+        grouped_located_objects = await self._submit_detection(
+            decoded_image=decoded_image,
+            mask_raster=mask_raster,
+            object_analysis_config=object_analysis_config,
+            content_hash=None
+        )
+
+        # mask was applied to decoded image in place, so annotated image shows what detector saw
+        return self._image_processor.encode_annotated_image(
+            decoded_image=decoded_image,
+            mask_raster=mask_raster,
+            bounding_boxes=self._to_object_locations(grouped_located_objects=grouped_located_objects),
+            image_format=image_format,
+            quality=quality or self._annotated_image_quality,
+            max_size=min(max_size or self._annotated_image_max_size, self._annotated_image_max_size)
+        )
+
+    async def count_objects_batch(self, files: list[UploadFile], object_analysis_configs: list[ObjectAnalysisConfigResponse]) -> AsyncIterator[ObjectCountBatchItemResponse]:
+        detections = await self._start_detection_batch(files=files, object_analysis_configs=object_analysis_configs)
+
+        return self._stream_batch(
+            detections=detections,
+            to_response=lambda index, grouped_located_objects, error: ObjectCountBatchItemResponse(
+                index=index,
+                file_name=files[index].filename,
+                error=error,
+                counts=self._to_object_counts(
+                    grouped_located_objects=grouped_located_objects,
+                    objects=object_analysis_configs[index].objects
+                ) if error is None else None
+            )
+        )
+
+    async def locate_objects_batch(self, files: list[UploadFile], object_analysis_configs: list[ObjectAnalysisConfigResponse]) -> AsyncIterator[ObjectLocationBatchItemResponse]:
+        detections = await self._start_detection_batch(files=files, object_analysis_configs=object_analysis_configs)
+
+        return self._stream_batch(
+            detections=detections,
+            to_response=lambda index, grouped_located_objects, error: ObjectLocationBatchItemResponse(
+                index=index,
+                file_name=files[index].filename,
+                error=error,
+                locations=self._to_object_locations(grouped_located_objects=grouped_located_objects) if error is None else None
+            )
+        )
+
+    async def count_objects_video(self, file: UploadFile, object_analysis_config: ObjectAnalysisConfigResponse, sample_fps: float) -> AsyncIterator[VideoFrameCountResponse]:
+        video_frame_reader = await VideoFrameReader.open(file=file, sample_fps=sample_fps)
+
+        return self._stream_video(
+            video_frame_reader=video_frame_reader,
+            object_analysis_config=object_analysis_config,
+            to_response=lambda frame_index, timestamp_ms, grouped_located_objects: VideoFrameCountResponse(
+                frame_index=frame_index,
+                timestamp_ms=timestamp_ms,
+                counts=self._to_object_counts(grouped_located_objects=grouped_located_objects, objects=object_analysis_config.objects)
+            )
+        )
+
+    async def locate_objects_video(self, file: UploadFile, object_analysis_config: ObjectAnalysisConfigResponse, sample_fps: float) -> AsyncIterator[VideoFrameLocationResponse]:
+        video_frame_reader = await VideoFrameReader.open(file=file, sample_fps=sample_fps)
+
+        return self._stream_video(
+            video_frame_reader=video_frame_reader,
+            object_analysis_config=object_analysis_config,
+            to_response=lambda frame_index, timestamp_ms, grouped_located_objects: VideoFrameLocationResponse(
+                frame_index=frame_index,
+                timestamp_ms=timestamp_ms,
+                locations=self._to_object_locations(grouped_located_objects=grouped_located_objects)
+            )
+        )
+
+    async def track_objects_video(
+        self,
+        file: UploadFile,
+        object_analysis_config: ObjectAnalysisConfigResponse,
+        sample_fps: float,
+        detection_interval: int = 1
+    ) -> AsyncIterator[VideoFrameTrackResponse]:
+        video_frame_reader = await VideoFrameReader.open(file=file, sample_fps=sample_fps)
+        object_tracker, detection_config = self._create_tracker(object_analysis_config=object_analysis_config)
+
+        return self._stream_video(
+            video_frame_reader=video_frame_reader,
+            object_analysis_config=detection_config,
+            detection_interval=detection_interval,
+            to_response=lambda frame_index, timestamp_ms, grouped_located_objects: VideoFrameTrackResponse(
+                frame_index=frame_index,
+                timestamp_ms=timestamp_ms,
+                tracking=self._track_objects(
+                    object_tracker=object_tracker,
+                    grouped_located_objects=grouped_located_objects,
+                    objects=object_analysis_config.objects
+                )
+            )
+        )
+
+    async def count_objects_stream(
+        self,
+        receive_frame: Callable[[], Awaitable[Optional[bytes]]],
+        object_analysis_config: ObjectAnalysisConfigResponse,
+        change_threshold: Optional[float] = None
+    ) -> AsyncIterator[StreamFrameCountResponse]:
+        return self._stream_frames(
+            receive_frame=receive_frame,
+            object_analysis_config=object_analysis_config,
+            change_threshold=change_threshold,
+            to_response=lambda sequence, dropped_frames, inference_skipped, grouped_located_objects, error: StreamFrameCountResponse(
+                sequence=sequence,
+                dropped_frames=dropped_frames,
+                inference_skipped=inference_skipped,
+                error=error,
+                counts=self._to_object_counts(
+                    grouped_located_objects=grouped_located_objects,
+                    objects=object_analysis_config.objects
+                ) if error is None else None
+            )
+        )
+
+    async def locate_objects_stream(
+        self,
+        receive_frame: Callable[[], Awaitable[Optional[bytes]]],
+        object_analysis_config: ObjectAnalysisConfigResponse,
+        change_threshold: Optional[float] = None
+    ) -> AsyncIterator[StreamFrameLocationResponse]:
+        return self._stream_frames(
+            receive_frame=receive_frame,
+            object_analysis_config=object_analysis_config,
+            change_threshold=change_threshold,
+            to_response=lambda sequence, dropped_frames, inference_skipped, grouped_located_objects, error: StreamFrameLocationResponse(
+                sequence=sequence,
+                dropped_frames=dropped_frames,
+                inference_skipped=inference_skipped,
+                error=error,
+                locations=self._to_object_locations(grouped_located_objects=grouped_located_objects) if error is None else None
+            )
+        )
+
+    async def track_objects_stream(
+        self,
+        receive_frame: Callable[[], Awaitable[Optional[bytes]]],
+        object_analysis_config: ObjectAnalysisConfigResponse,
+        change_threshold: Optional[float] = None,
+        detection_interval: int = 1
+    ) -> AsyncIterator[StreamFrameTrackResponse]:
+        object_tracker, detection_config = self._create_tracker(object_analysis_config=object_analysis_config)
+
+        return self._stream_frames(
+            receive_frame=receive_frame,
+            object_analysis_config=detection_config,
+            change_threshold=change_threshold,
+            detection_interval=detection_interval,
+            to_response=lambda sequence, dropped_frames, inference_skipped, grouped_located_objects, error: StreamFrameTrackResponse(
+                sequence=sequence,
+                dropped_frames=dropped_frames,
+                inference_skipped=inference_skipped,
+                error=error,
+                tracking=self._track_objects(
+                    object_tracker=object_tracker,
+                    # tracks are only propagated on frames which reused previous result
+                    grouped_located_objects=grouped_located_objects if not inference_skipped else None,
+                    objects=object_analysis_config.objects
+                ) if error is None else None
+            )
+        )
+
+    def get_stream_metrics(self) -> StreamMetricsResponse:
+        return StreamMetricsResponse(
+            frames_processed=self._stream_frames_processed,
+            inference_skipped=self._stream_inference_skipped,
+            skip_rate=self._stream_inference_skipped / self._stream_frames_processed if self._stream_frames_processed else 0.0
+        )
+
+    async def _detect_objects(self, file: UploadFile, object_analysis_config: ObjectAnalysisConfigResponse) -> dict[ObjectEnum, list[ObjectBoundingBoxDto]]:
+        detection = await self._start_detection(file=file, object_analysis_config=object_analysis_config)
+
+        return await detection
+
+    async def _start_detection_batch(self, files: list[UploadFile], object_analysis_configs: list[ObjectAnalysisConfigResponse]) -> list[Future]:
+        if len(files) > self._batch_max_images:
+            raise AnalyzeBadRequestException(detail="too_many_images_in_batch")
+
+        # images keep being decoded and submitted while earlier images are inferred, so scheduler
+        # can batch them; number of decoded images in flight is bounded to keep memory usage flat
+        detections: list[Future] = []
+        in_flight: set[Future] = set()
+        try:
+            for file, object_analysis_config in zip(files, object_analysis_configs):
+                if len(in_flight) >= self._batch_max_in_flight_images:
+                    _, in_flight = await wait(in_flight, return_when=FIRST_COMPLETED)
+                try:
+                    detection = await self._start_detection(file=file, object_analysis_config=object_analysis_config)
+                except Exception as err:  # pylint: disable=broad-exception-caught
+                    detection = get_running_loop().create_future()
+                    detection.set_exception(err)
+                detections.append(detection)
+                if not detection.done():
+                    in_flight.add(detection)
+        except BaseException:
+            # request was cancelled (e.g. client disconnected), results won't be delivered
+            for detection in detections:
+                detection.cancel()
+            raise
+
+        return detections
+
+    async def _start_detection(self, file: UploadFile, object_analysis_config: ObjectAnalysisConfigResponse) -> Future:
+        """
+        Decode and mask the image and submit it for detection. Uploaded file is not needed
+        anymore when this returns, detection results are awaited through returned future.
+        """
+        content_hash: Optional[str] = None
+        if self._result_cache is not None:
+            # identical frames (static cameras, retries) skip decoding and inference
+            content_hash = await to_thread(hash_upload, file)
+            grouped_located_objects = await self._result_cache.get(content_hash=content_hash, object_analysis_config=object_analysis_config)
+            if grouped_located_objects is not None:
+                return self._completed_detection(grouped_located_objects)
+
+        decoded_image = await self._image_processor.decode_image(file=file, full_resolution=object_analysis_config.tile_size is not None)
+        mask_raster = self._mask_cache.get_mask(
+            object_analysis_config=object_analysis_config,
+            image_shape=decoded_image.image.shape,
+            reduction=decoded_image.reduction
+        )
 
-        objects_count = [
+        return self._submit_detection(
+            decoded_image=decoded_image,
+            mask_raster=mask_raster,
+            object_analysis_config=object_analysis_config,
+            content_hash=content_hash
+        )
+
+    def _submit_detection(
+        self,
+        decoded_image: DecodedImageDto,
+        mask_raster: MaskRasterDto,
+        object_analysis_config: ObjectAnalysisConfigResponse,
+        content_hash: Optional[str]
+    ) -> Future:
+        # run inference only on the part of the image left visible by the mask
+        visible_image_array = self._image_processor.apply_mask(image_array=decoded_image.image, mask_raster=mask_raster)
+        if visible_image_array is None:
+            return self._completed_detection({object_enum: [] for object_enum in object_analysis_config.objects})
+
+        return ensure_future(
+            self._finish_detection(
+                visible_image_array=visible_image_array,
+                mask_raster=mask_raster,
+                decoded_image=decoded_image,
+                object_analysis_config=object_analysis_config,
+                content_hash=content_hash
+            )
+        )
+
+    async def _finish_detection(
+        self,
+        visible_image_array: ndarray,
+        mask_raster: MaskRasterDto,
+        decoded_image: DecodedImageDto,
+        object_analysis_config: ObjectAnalysisConfigResponse,
+        content_hash: Optional[str]
+    ) -> dict[ObjectEnum, list[ObjectBoundingBoxDto]]:
+        if object_analysis_config.tile_size is not None:
+            grouped_located_objects = await self._detect_tiled(
+                visible_image_array=visible_image_array,
+                mask_raster=mask_raster,
+                object_analysis_config=object_analysis_config
+            )
+        else:
+            grouped_located_objects = await self._detection_scheduler.detect(
+                image=visible_image_array,
+                objects=object_analysis_config.objects,
+                confidence=object_analysis_config.confidence
+            )
+
+        left, top, _, _ = mask_raster.visible_region
+        if decoded_image.reduction != 1 or left != 0 or top != 0:
+            grouped_located_objects = self._to_original_coordinates(
+                grouped_located_objects=grouped_located_objects,
+                offset=(left, top),
+                reduction=decoded_image.reduction,
+                original_resolution=decoded_image.original_resolution
+            )
+
+        if content_hash is not None:
+            await self._result_cache.put(
+                content_hash=content_hash,
+                object_analysis_config=object_analysis_config,
+                grouped_located_objects=grouped_located_objects
+            )
+
+        return grouped_located_objects
+
+    async def _detect_tiled(
+        self,
+        visible_image_array: ndarray,
+        mask_raster: MaskRasterDto,
+        object_analysis_config: ObjectAnalysisConfigResponse
+    ) -> dict[ObjectEnum, list[ObjectBoundingBoxDto]]:
+        frame_tiler = FrameTiler(tile_size=object_analysis_config.tile_size, overlap=object_analysis_config.tile_overlap)
+        tiles = frame_tiler.split(image_array=visible_image_array, raster=mask_raster.raster)
+        if not tiles:
+            return await self._detection_scheduler.detect(
+                image=visible_image_array,
+                objects=object_analysis_config.objects,
+                confidence=object_analysis_config.confidence
+            )
+
+        # whole image is detected together with the tiles, objects larger than a tile are only found whole on it
+        grouped_located_objects = await self._detection_scheduler.detect_batch(
+            images=[visible_image_array, *(tile.image for tile in tiles)],
+            objects=object_analysis_config.objects,
+            confidence=object_analysis_config.confidence
+        )
+
+        return frame_tiler.merge(
+            regions=[(0, 0, visible_image_array.shape[1], visible_image_array.shape[0]), *(tile.region for tile in tiles)],
+            grouped_located_objects=grouped_located_objects
+        )
+
+    async def _stream_video(
+        self,
+        video_frame_reader: VideoFrameReader,
+        object_analysis_config: ObjectAnalysisConfigResponse,
+        to_response: Callable[[int, float, Optional[dict[ObjectEnum, list[ObjectBoundingBoxDto]]]], VIDEO_FRAME],
+        detection_interval: int = 1
+    ) -> AsyncIterator[VIDEO_FRAME]:
+        # frames keep being decoded and submitted while earlier frames are inferred, so scheduler
+        # can batch them; number of frames in flight is bounded to keep memory usage flat
+        detections: deque[tuple[int, float, Future]] = deque()
+        sampled_frames = 0
+        video_frame_reader.start()
+        try:
+            while (frame := await video_frame_reader.read()) is not None:
+                if sampled_frames % detection_interval == 0:
+                    detection = self._start_frame_detection(frame=frame, object_analysis_config=object_analysis_config)
+                else:
+                    # frames between detections have no result, tracks are only propagated on them
+                    detection = self._completed_detection(None)
+                sampled_frames += 1
+                detections.append((frame.frame_index, frame.timestamp_ms, detection))
+                while detections and (len(detections) >= self._video_max_in_flight_frames or detections[0][2].done()):
+                    frame_index, timestamp_ms, detection = detections.popleft()
+                    yield to_response(frame_index, timestamp_ms, await detection)
+
+            while detections:
+                frame_index, timestamp_ms, detection = detections.popleft()
+                yield to_response(frame_index, timestamp_ms, await detection)
+
+            if video_frame_reader.error is not None:
+                # response is already streaming, failing it is the only way to tell client that results are incomplete
+                raise AnalyzerException(detail="video_decoding_failed")
+        finally:
+            for _, _, detection in detections:
+                detection.cancel()
+            await video_frame_reader.close()
+
+    def _start_frame_detection(self, frame: VideoFrameDto, object_analysis_config: ObjectAnalysisConfigResponse) -> Future:
+        # all frames have the same shape, so mask is rasterized once and then served from the cache
+        mask_raster = self._mask_cache.get_mask(object_analysis_config=object_analysis_config, image_shape=frame.image.shape, reduction=1)
+        height, width = frame.image.shape[:2]
+
+        return self._submit_detection(
+            decoded_image=DecodedImageDto(
+                image=frame.image,
+                reduction=1,
+                original_resolution=ImageResolutionDto(width=width, height=height)
+            ),
+            mask_raster=mask_raster,
+            object_analysis_config=object_analysis_config,
+            content_hash=None
+        )
+
+    async def _stream_frames(
+        self,
+        receive_frame: Callable[[], Awaitable[Optional[bytes]]],
+        object_analysis_config: ObjectAnalysisConfigResponse,
+        change_threshold: Optional[float],
+        to_response: Callable[[int, int, bool, Optional[dict[ObjectEnum, list[ObjectBoundingBoxDto]]], Optional[BatchItemErrorResponse]], STREAM_FRAME],
+        detection_interval: int = 1
+    ) -> AsyncIterator[STREAM_FRAME]:
+        # frames keep being received while a frame is analyzed, stale frames are dropped in the buffer
+        frame_stream_buffer = FrameStreamBuffer(max_pending=self._stream_max_pending_frames)
+        receiver = create_task(self._receive_frames(receive_frame=receive_frame, frame_stream_buffer=frame_stream_buffer))
+        # frames of fixed cameras which barely changed since last analyzed frame reuse its result
+        change_threshold = self._stream_change_threshold if change_threshold is None else change_threshold
+        frame_change_gate = FrameChangeGate(threshold=change_threshold) if change_threshold > 0 else None
+        previous_grouped_located_objects: Optional[dict[ObjectEnum, list[ObjectBoundingBoxDto]]] = None
+        # camera resolution doesn't change, so mask is rasterized once and kept for the whole stream
+        mask_raster_key: Optional[tuple[tuple[int, ...], int]] = None
+        mask_raster: Optional[MaskRasterDto] = None
+        received_frames = 0
+        try:
+            async for frame in frame_stream_buffer:
+                received_frames += 1
+                if (received_frames - 1) % detection_interval != 0:
+                    # frames between detections are not even decoded, tracks are only propagated on them
+                    yield to_response(frame.sequence, frame_stream_buffer.dropped, False, None, None)
+                    continue
+
+                self._stream_frames_processed += 1
+                inference_skipped = False
+                try:
+                    decoded_image = await self._image_processor.decode_image_bytes(
+                        content=frame.content,
+                        full_resolution=object_analysis_config.tile_size is not None
+                    )
+                    if mask_raster_key != (decoded_image.image.shape, decoded_image.reduction):
+                        mask_raster_key = (decoded_image.image.shape, decoded_image.reduction)
+                        mask_raster = self._mask_cache.get_mask(
+                            object_analysis_config=object_analysis_config,
+                            image_shape=decoded_image.image.shape,
+                            reduction=decoded_image.reduction
+                        )
+
+                    # masking and frame comparison touch every pixel, they run off the event loop as decoding does
+                    visible_image_array, changed = await to_thread(
+                        self._mask_stream_frame,
+                        decoded_image.image,
+                        mask_raster,
+                        frame_change_gate
+                    )
+                    if visible_image_array is None:
+                        grouped_located_objects = {object_enum: [] for object_enum in object_analysis_config.objects}
+                    # gate has no reference until a frame was analyzed, so it reports first frame as changed
+                    elif not changed and previous_grouped_located_objects is not None:
+                        grouped_located_objects = previous_grouped_located_objects
+                        inference_skipped = True
+                        self._stream_inference_skipped += 1
+                    else:
+                        grouped_located_objects = await self._finish_detection(
+                            visible_image_array=visible_image_array,
+                            mask_raster=mask_raster,
+                            decoded_image=decoded_image,
+                            object_analysis_config=object_analysis_config,
+                            content_hash=None
+                        )
+                    previous_grouped_located_objects = grouped_located_objects
+                except Exception as err:  # pylint: disable=broad-exception-caught
+                    # reference frame might not have a result, next frame is analyzed regardless of change
+                    previous_grouped_located_objects = None
+                    if frame_change_gate is not None:
+                        frame_change_gate.reset()
+                    if isinstance(err, HTTPException):
+                        error = BatchItemErrorResponse(status=err.status.value, detail=str(err.payload.detail))
+                    else:
+                        error = BatchItemErrorResponse(status=AnalyzerException.status.value, detail="image_analysis_failed")
+                    yield to_response(frame.sequence, frame_stream_buffer.dropped, False, None, error)
+                    continue
+
+                yield to_response(frame.sequence, frame_stream_buffer.dropped, inference_skipped, grouped_located_objects, None)
+        finally:
+            receiver.cancel()
+            await gather(receiver, return_exceptions=True)
+
+    def _mask_stream_frame(
+        self,
+        image_array: ndarray,
+        mask_raster: MaskRasterDto,
+        frame_change_gate: Optional[FrameChangeGate]
+    ) -> tuple[Optional[ndarray], bool]:
+        visible_image_array = self._image_processor.apply_mask(image_array=image_array, mask_raster=mask_raster)
+        if visible_image_array is None or frame_change_gate is None:
+            return visible_image_array, True
+
+        return visible_image_array, frame_change_gate.has_changed(visible_image_array=visible_image_array, mask_raster=mask_raster)
+
+    @staticmethod
+    async def _receive_frames(receive_frame: Callable[[], Awaitable[Optional[bytes]]], frame_stream_buffer: FrameStreamBuffer) -> None:
+        try:
+            while (content := await receive_frame()) is not None:
+                frame_stream_buffer.put(content)
+        finally:
+            frame_stream_buffer.close()
+
+    @staticmethod
+    def _completed_detection(grouped_located_objects: Optional[dict[ObjectEnum, list[ObjectBoundingBoxDto]]]) -> Future:
+        detection = get_running_loop().create_future()
+        detection.set_result(grouped_located_objects)
+
+        return detection
+
+    @staticmethod
+    async def _stream_batch(
+        detections: list[Future],
+        to_response: Callable[[int, Optional[dict[ObjectEnum, list[ObjectBoundingBoxDto]]], Optional[BatchItemErrorResponse]], BATCH_ITEM]
+    ) -> AsyncIterator[BATCH_ITEM]:
+        # results are yielded in completion order, not in order of images
+        indices = {detection: index for index, detection in enumerate(detections)}
+        pending = set(detections)
+        try:
+            while pending:
+                done, pending = await wait(pending, return_when=FIRST_COMPLETED)
+                for detection in sorted(done, key=indices.__getitem__):
+                    error = detection.exception()
+                    if error is None:
+                        yield to_response(indices[detection], detection.result(), None)
+                    elif isinstance(error, HTTPException):
+                        yield to_response(indices[detection], None, BatchItemErrorResponse(status=error.status.value, detail=str(error.payload.detail)))
+                    else:
+                        yield to_response(indices[detection], None, BatchItemErrorResponse(status=AnalyzerException.status.value, detail="image_analysis_failed"))
+        finally:
+            # client disconnected, there is no one to deliver remaining results to
+            for detection in pending:
+                detection.cancel()
+
+    def _create_tracker(self, object_analysis_config: ObjectAnalysisConfigResponse) -> tuple[ObjectTracker, ObjectAnalysisConfigResponse]:
+        # detector also returns less confident objects, tracker uses them only to keep existing tracks alive
+        low_confidence = min(self._track_low_confidence, object_analysis_config.confidence)
+        object_tracker = ObjectTracker(
+            objects=object_analysis_config.objects,
+            high_confidence=object_analysis_config.confidence,
+            low_confidence=low_confidence,
+            max_lost=self._track_max_lost
+        )
+
+        return object_tracker, object_analysis_config.model_copy(update={"confidence": low_confidence})
+
+    @staticmethod
+    def _track_objects(
+        object_tracker: ObjectTracker,
+        grouped_located_objects: Optional[dict[ObjectEnum, list[ObjectBoundingBoxDto]]],
+        objects: list[ObjectEnum]
+    ) -> ObjectTrackingResponse:
+        if grouped_located_objects is not None:
+            tracking_result = object_tracker.update(grouped_located_objects=grouped_located_objects)
+        else:
+            tracking_result = object_tracker.propagate()
+
+        return ObjectTrackingResponse(
+            detected=grouped_located_objects is not None,
+            tracks=[TrackedObjectResponse.from_tracked_object(tracked_object) for tracked_object in tracking_result.tracks],
+            events=[
+                TrackEventResponse(event=track_event.event, track_id=track_event.track_id, object_type=track_event.object_type)
+                for track_event in tracking_result.events
+            ],
+            unique_counts=[
+                ObjectCountResponse(object_type=object_enum, object_count=tracking_result.unique_counts.get(object_enum, 0))
+                for object_enum in objects
+            ]
+        )
+
+    @staticmethod
+    def _to_original_coordinates(
+        grouped_located_objects: dict[ObjectEnum, list[ObjectBoundingBoxDto]],
+        offset: tuple[int, int],
+        reduction: int,
+        original_resolution: ImageResolutionDto
+    ) -> dict[ObjectEnum, list[ObjectBoundingBoxDto]]:
+        # move boxes found on cropped image into full image and scale them back to original resolution
+        def to_original(coordinate: PixelCoordinateDto) -> PixelCoordinateDto:
+            return PixelCoordinateDto(
+                width=min((coordinate.width + offset[0]) * reduction, original_resolution.width),
+                height=min((coordinate.height + offset[1]) * reduction, original_resolution.height)
+            )
+
+        return {
+            object_enum: [
+                ObjectBoundingBoxDto(
+                    object_type=box.object_type,
+                    confidence=box.confidence,
+                    top_left=to_original(box.top_left),
+                    bottom_right=to_original(box.bottom_right)
+                )
+                for box in boxes
+            ]
+            for object_enum, boxes in grouped_located_objects.items()
+        }
+
+    @staticmethod
+    def _to_object_counts(grouped_located_objects: dict[ObjectEnum, list[ObjectBoundingBoxDto]], objects: list[ObjectEnum]) -> list[ObjectCountResponse]:
+        return [
             ObjectCountResponse(
                 object_type=object_enum,
-                object_count=counted_objects.get(object_enum, 0))
-                for object_enum in object_analysis_config.objects
+                object_count=len(grouped_located_objects.get(object_enum, [])))
+                for object_enum in objects
         ]
 
-        return objects_count
-    
-    async def locate_objects(self, file: UploadFile, object_analysis_config: ObjectAnalysisConfigResponse) -> list[ObjectLocationResponse]:
-        image_array = await self._image_processor.file_to_image_array(file=file)
-        masked_image_array = self._image_processor.draw_blackout_mask(image_array=image_array, resolution=object_analysis_config.image_resolution, mask=object_analysis_config.image_mask)
-        grouped_located_objects = self._object_detector.detect(image=masked_image_array, objects=object_analysis_config.objects, confidence=object_analysis_config.confidence)
-        
+    @staticmethod
+    def _to_object_locations(grouped_located_objects: dict[ObjectEnum, list[ObjectBoundingBoxDto]]) -> list[ObjectLocationResponse]:
         located_objects = []
         for objects_group in grouped_located_objects.values():
             for object_location in objects_group:
@@ -39,4 +683,3 @@ class ImageAnalyzer(AbstractImageAnalyzer):
                 )
 
         return located_objects
-        
@@ -1,19 +1,45 @@
-from typing import Optional
+from asyncio import to_thread
+from io import BytesIO
+from typing import BinaryIO, Optional
 from cv2 import fillPoly
-from numpy import ndarray, uint8, frombuffer, array, int32
-from cv2 import imdecode, IMREAD_COLOR, rectangle, putText, FONT_HERSHEY_SIMPLEX
+from numpy import ndarray, uint8, frombuffer, array, int32, ones, flatnonzero, multiply
+from cv2 import imdecode, imencode, resize, IMREAD_COLOR, IMREAD_REDUCED_COLOR_2, IMREAD_REDUCED_COLOR_4, IMREAD_REDUCED_COLOR_8, IMWRITE_JPEG_QUALITY, IMWRITE_WEBP_QUALITY, INTER_AREA, polylines, putText, FONT_HERSHEY_SIMPLEX
 from fastapi import UploadFile
+from PIL import Image, UnidentifiedImageError
 
 # local imports
 from ..interface import AbstractImageProcessor
-from ..model.api import ImageResolution, PixelCoordinate, ObjectLocationResponse
-from ..exception import MaskInvalidException, FileInvalidException
+from ..model.api import ObjectLocationResponse
+from ..model.enum import ImageFormatEnum
+from ..model.dto import DecodedImageDto, EncodedImageDto, ImageResolutionDto, MaskRasterDto
+from ..exception import AnalyzerException, FileInvalidException
+from .upload_buffer import open_upload_buffer
+
+# JPEG decoder can downscale by these factors in DCT domain, largest first
+_REDUCED_DECODE_FLAGS = {
+    8: IMREAD_REDUCED_COLOR_8,
+    4: IMREAD_REDUCED_COLOR_4,
+    2: IMREAD_REDUCED_COLOR_2,
+}
+
+# file extension, quality flag and MIME type used for encoding annotated images
+_ENCODE_PARAMETERS = {
+    ImageFormatEnum.JPEG: (".jpg", IMWRITE_JPEG_QUALITY, "image/jpeg"),
+    ImageFormatEnum.WEBP: (".webp", IMWRITE_WEBP_QUALITY, "image/webp"),
+}
 
 
 class ImageProcessor(AbstractImageProcessor):
 
-    def __init__(self):
-        pass
+    def __init__(self, reduced_decode_min_size: Optional[int] = None):
+        """
+        Initialize image processor.
+
+        :param reduced_decode_min_size: smallest allowed longer side (pixels) of JPEG images decoded
+            at reduced resolution, usually model input size. 'None' always decodes at full resolution.
+        :type reduced_decode_min_size: Optional[int], optional
+        """
+        self._reduced_decode_min_size = reduced_decode_min_size
 
     def get_image_type(self, file: UploadFile) -> str:
         return file.filename.lower().rsplit(".", 1)[-1]
@@ -34,16 +60,78 @@ class ImageProcessor(AbstractImageProcessor):
         if not self.is_allowed_type(file=file):
             raise FileInvalidException()
 
-        content = await file.read()
-
-        array = frombuffer(content, uint8)
-        image_array = imdecode(array, IMREAD_COLOR)
-
+        image_array = await to_thread(self._decode_upload_array, file)
         if image_array is None:
             raise FileInvalidException("File is not a valid image.")
         
         return image_array
 
+    async def decode_image(self, file: UploadFile, full_resolution: bool = False) -> DecodedImageDto:
+        # Ensure its image type file
+        if not self.is_allowed_type(file=file):
+            raise FileInvalidException()
+
+        return await to_thread(self._decode_upload, file, full_resolution)
+
+    async def decode_image_bytes(self, content: bytes, full_resolution: bool = False) -> DecodedImageDto:
+        return await to_thread(self._decode_bytes, content, full_resolution)
+
+    @staticmethod
+    def _decode_upload_array(file: UploadFile) -> Optional[ndarray]:
+        # decode straight from the upload spool, without reading it into new bytes object
+        with open_upload_buffer(file=file) as content:
+            return imdecode(frombuffer(content, uint8), IMREAD_COLOR)
+
+    def _decode_upload(self, file: UploadFile, full_resolution: bool) -> DecodedImageDto:
+        reduction, original_size = self._select_reduction(file=file.file) if not full_resolution else (1, None)
+        # decode straight from the upload spool, buffer stays open until decoding in this thread is done
+        with open_upload_buffer(file=file) as content:
+            return self._decode(content=content, reduction=reduction, original_size=original_size)
+
+    def _decode_bytes(self, content: bytes, full_resolution: bool) -> DecodedImageDto:
+        # BytesIO shares the bytes object until written to, header probe doesn't copy the image
+        reduction, original_size = self._select_reduction(file=BytesIO(content)) if not full_resolution else (1, None)
+        return self._decode(content=content, reduction=reduction, original_size=original_size)
+
+    @staticmethod
+    def _decode(content: bytes | memoryview, reduction: int, original_size: Optional[tuple[int, int]]) -> DecodedImageDto:
+        image_array = imdecode(frombuffer(content, uint8), _REDUCED_DECODE_FLAGS.get(reduction, IMREAD_COLOR))
+        if image_array is None:
+            raise FileInvalidException("File is not a valid image.")
+
+        height, width = image_array.shape[:2]
+        if original_size is None:
+            original_size = (width, height)
+        elif (width > height) != (original_size[0] > original_size[1]):
+            # decoder applied EXIF orientation, header size is before rotation
+            original_size = original_size[::-1]
+
+        return DecodedImageDto(
+            image=image_array,
+            reduction=reduction,
+            original_resolution=ImageResolutionDto(width=original_size[0], height=original_size[1])
+        )
+
+    def _select_reduction(self, file: BinaryIO) -> tuple[int, Optional[tuple[int, int]]]:
+        if self._reduced_decode_min_size is None:
+            return 1, None
+
+        # only header is read and parsed here, pixel data is not decoded
+        file.seek(0)
+        try:
+            with Image.open(file) as image:
+                if image.format != "JPEG":
+                    return 1, None
+                size = image.size
+        except UnidentifiedImageError:
+            return 1, None
+
+        # largest reduction which keeps longer side at or above minimal size
+        for reduction in _REDUCED_DECODE_FLAGS:
+            if max(size) // reduction >= self._reduced_decode_min_size:
+                return reduction, size
+
+        return 1, size
 
     def draw_bounding_boxes(
         self,
@@ -53,58 +141,114 @@ class ImageProcessor(AbstractImageProcessor):
         include_confidence_label: bool = True,
         thickness: int = 3,
         color: tuple[int, ...] = (255, 0, 255),  # red
-        font_scale: int = 1
+        font_scale: float = 1.0,
+        scale: float = 1.0
     ) -> ndarray:
         if make_image_copy:
             image_array = image.copy()
         else:
             image_array = image
 
-        for box in bounding_boxes:
-            # Draw the bounding box on the frame
-            rectangle(
-                img=image_array, 
-                pt1=(box.top_left.width, box.top_left.height), 
-                pt2=(box.bottom_right.width, box.bottom_right.height), 
-                color=color, 
-                thickness=thickness
-            )
-
-            if include_confidence_label:
-                text = f"{box.object_type.value}:{box.confidence}"
+        if not bounding_boxes:
+            return image_array
 
+        # box coordinates are in original resolution, scale maps them onto (possibly resized) image
+        corners = (array([
+            [box.top_left.width, box.top_left.height, box.bottom_right.width, box.bottom_right.height]
+            for box in bounding_boxes
+        ]) * scale).round().astype(int32)
+        # all boxes are drawn with a single call instead of one call per box
+        polygons = corners[:, [0, 1, 2, 1, 2, 3, 0, 3]].reshape((-1, 4, 2))
+        polylines(img=image_array, pts=list(polygons), isClosed=True, color=color, thickness=thickness)
+
+        if include_confidence_label:
+            for box, (left, top, _, _) in zip(bounding_boxes, corners.tolist()):
                 putText(
                     img=image_array, 
-                    text=text, 
-                    org=[box.top_left.width, box.top_left.height], 
+                    text=f"{box.object_type.value}:{box.confidence}", 
+                    org=(left, max(top - thickness, 0)), 
                     fontFace=FONT_HERSHEY_SIMPLEX, 
                     fontScale=font_scale, 
                     color=color, 
-                    thickness=thickness
+                    thickness=max(thickness - 1, 1)
                 )
         
         return image_array
 
-    def draw_blackout_mask(self, image_array: ndarray, resolution: ImageResolution, mask: Optional[list[PixelCoordinate]]) -> ndarray:
-        if mask is None:
-            # no mask so nothing to do
-            return image_array
-        
-        # check that blackout mask does not exceed resolution boundary
-        pixels_list = [[pixel.width, pixel.height] for pixel in mask]
-        mask_array = array(pixels_list)
-        min = mask_array.min()
-        max_width = max(mask_array[:, 0])
-        max_height = max(mask_array[:, 1])
-        if min < 0:
-            raise MaskInvalidException()
-        
-        if max_width > resolution.width:
-            raise MaskInvalidException()
-        
-        if max_height > resolution.height:
-            raise MaskInvalidException()
-
-        # draw blackout mask on image
-        pts = mask_array.astype(int32).reshape((-1, 1, 2))
-        return fillPoly(image_array, [pts], color=(0, 0, 0)) 
\ No newline at end of file
+    def encode_annotated_image(
+        self,
+        decoded_image: DecodedImageDto,
+        mask_raster: MaskRasterDto,
+        bounding_boxes: list[ObjectLocationResponse],
+        image_format: ImageFormatEnum,
+        quality: int,
+        max_size: int
+    ) -> EncodedImageDto:
+        image_array = decoded_image.image
+        # inside of the visible region was masked for detection, everything around it is masked by definition
+        if mask_raster.visible_region is None:
+            image_array[:] = 0
+        else:
+            left, top, right, bottom = mask_raster.visible_region
+            image_array[:top] = 0
+            image_array[bottom:] = 0
+            image_array[:, :left] = 0
+            image_array[:, right:] = 0
+
+        height, width = image_array.shape[:2]
+        resize_scale = min(1.0, max_size / max(height, width))
+        if resize_scale < 1.0:
+            # downscale before drawing, so boxes and labels keep their thickness on small previews
+            image_array = resize(image_array, (max(1, round(width * resize_scale)), max(1, round(height * resize_scale))), interpolation=INTER_AREA)
+
+        # decoded image is not used after this, boxes are drawn on it without copying
+        self.draw_bounding_boxes(
+            image=image_array,
+            bounding_boxes=bounding_boxes,
+            thickness=max(1, round(max(image_array.shape[:2]) / 640)),
+            font_scale=max(0.4, max(image_array.shape[:2]) / 1600),
+            scale=resize_scale / decoded_image.reduction
+        )
+
+        extension, quality_flag, media_type = _ENCODE_PARAMETERS[image_format]
+        encoded, content = imencode(extension, image_array, [quality_flag, quality])
+        if not encoded:
+            raise AnalyzerException(detail="image_encoding_failed")
+
+        return EncodedImageDto(content=content.reshape(-1), media_type=media_type)
+
+    def rasterize_mask(self, image_shape: tuple[int, ...], mask: Optional[list[ndarray]], reduction: int = 1) -> MaskRasterDto:
+        height, width = image_shape[:2]
+        if not mask:
+            return MaskRasterDto(visible_region=(0, 0, width, height), raster=None)
+
+        raster = ones((height, width), dtype=uint8)
+        for polygon in mask:
+            # polygons are filled one by one, so that overlapping polygons don't cancel each other out
+            pts = (polygon / reduction).round().astype(int32).reshape((-1, 1, 2))
+            fillPoly(raster, [pts], color=0)
+
+        # rows and columns with at least one pixel left visible after masking
+        visible_rows = flatnonzero(raster.max(axis=1))
+        visible_columns = flatnonzero(raster.max(axis=0))
+        if visible_rows.size == 0:
+            return MaskRasterDto(visible_region=None, raster=None)
+
+        left, top, right, bottom = int(visible_columns[0]), int(visible_rows[0]), int(visible_columns[-1]) + 1, int(visible_rows[-1]) + 1
+        return MaskRasterDto(
+            visible_region=(left, top, right, bottom),
+            # copy so that full size raster is not kept alive by the view
+            raster=raster[top:bottom, left:right, None].copy()
+        )
+
+    def apply_mask(self, image_array: ndarray, mask_raster: MaskRasterDto) -> Optional[ndarray]:
+        if mask_raster.visible_region is None:
+            return None
+
+        left, top, right, bottom = mask_raster.visible_region
+        visible_image_array = image_array[top:bottom, left:right]
+        if mask_raster.raster is not None:
+            # masked pixels are multiplied by 0, in place on the visible region only
+            multiply(visible_image_array, mask_raster.raster, out=visible_image_array)
+
+        return visible_image_array
@@ -0,0 +1,60 @@
+from typing import Optional
+from uuid import UUID
+from datetime import datetime
+
+from common.cache import LRUCache
+
+# local imports
+from ..interface import AbstractMaskCache, AbstractImageProcessor
+from ..model.dto import MaskRasterDto
+from ..model.api import ObjectAnalysisConfigResponse, CacheMetricsResponse
+
+
+class MaskCache(AbstractMaskCache):
+    """
+    Keeps rasterized blackout masks per (configuration version, image shape, decode reduction) so that
+    masks are not rasterized on every request. Cache is bounded by memory used by the rasters.
+    """
+
+    def __init__(self, image_processor: AbstractImageProcessor, max_size_bytes: int = 256 * 1024 * 1024):
+        """
+        Initialize mask cache.
+
+        :param image_processor: Image processor used to rasterize masks
+        :type image_processor: AbstractImageProcessor
+        :param max_size_bytes: maximum memory used by cached rasters, defaults to 256MB
+        :type max_size_bytes: int, optional
+        """
+        self._image_processor = image_processor
+        self._cache: LRUCache[tuple[UUID, Optional[datetime], int, int, int], MaskRasterDto] = LRUCache(
+            max_size=max_size_bytes,
+            # small constant accounts for entries without raster (no mask or fully masked)
+            sizeof=lambda mask_raster: 64 + (mask_raster.raster.nbytes if mask_raster.raster is not None else 0)
+        )
+
+    def get_mask(self, object_analysis_config: ObjectAnalysisConfigResponse, image_shape: tuple[int, ...], reduction: int = 1) -> MaskRasterDto:
+        # version keeps rasters of a changed configuration from being served by instances which missed the invalidation
+        key = (object_analysis_config.id, object_analysis_config.version, image_shape[0], image_shape[1], reduction)
+        mask_raster = self._cache.get(key)
+        if mask_raster is None:
+            mask_raster = self._image_processor.rasterize_mask(
+                image_shape=image_shape,
+                mask=object_analysis_config.mask_polygons,
+                reduction=reduction
+            )
+            self._cache.put(key, mask_raster)
+
+        return mask_raster
+
+    def invalidate(self, config_id: UUID) -> None:
+        self._cache.invalidate_where(lambda key: key[0] == config_id)
+
+    def get_metrics(self) -> CacheMetricsResponse:
+        return CacheMetricsResponse(
+            entries=len(self._cache),
+            size_bytes=self._cache.size,
+            hits=self._cache.hits,
+            misses=self._cache.misses,
+            hit_rate=self._cache.hit_rate,
+            evictions=self._cache.evictions,
+        )
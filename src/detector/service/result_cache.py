@@ -0,0 +1,208 @@
+from asyncio import to_thread
+from hashlib import blake2b
+from json import dumps, loads
+from os import replace
+from pathlib import Path
+from time import time
+from typing import Optional
+from uuid import uuid4
+
+from common.cache import LRUCache
+
+# local imports
+from ..interface import AbstractResultCache
+from ..model.enum import ObjectEnum
+from ..model.dto import ObjectBoundingBoxDto, PixelCoordinateDto
+from ..model.api import ObjectAnalysisConfigResponse, CacheMetricsResponse
+
+# disk tier is pruned (expired and excess entries removed) every N writes
+_DISK_PRUNE_INTERVAL = 256
+
+
+class _DiskResultCache:
+    """
+    Second cache tier keeping serialized results as files, one file per entry. Entries expire
+    based on file modification time, oldest entries are removed when there are too many.
+    """
+
+    def __init__(self, directory: str | Path, ttl: float, max_entries: int):
+        self._directory = Path(directory)
+        self._directory.mkdir(parents=True, exist_ok=True)
+        self._ttl = ttl
+        self._max_entries = max_entries
+        self._writes = 0
+        self._entries = sum(1 for _ in self._directory.glob("*.json"))
+
+        # metrics
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def load(self, key: str) -> Optional[dict]:
+        path = self._directory / f"{key}.json"
+        try:
+            if path.stat().st_mtime + self._ttl < time():
+                self._remove(path)
+                self.misses += 1
+                return None
+            data = loads(path.read_text())
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return data
+
+    def store(self, key: str, data: dict) -> None:
+        # write to temporary file first so readers never see partially written entry
+        temporary_path = self._directory / f".{key}.{uuid4().hex}.tmp"
+        temporary_path.write_text(dumps(data))
+        path = self._directory / f"{key}.json"
+        if not path.exists():
+            self._entries += 1
+        replace(temporary_path, path)
+
+        self._writes += 1
+        if self._writes % _DISK_PRUNE_INTERVAL == 0:
+            self._prune()
+
+    def get_metrics(self) -> CacheMetricsResponse:
+        lookups = self.hits + self.misses
+        return CacheMetricsResponse(
+            # approximate, other processes might share the directory
+            entries=self._entries,
+            hits=self.hits,
+            misses=self.misses,
+            hit_rate=self.hits / lookups if lookups else 0.0,
+            evictions=self.evictions,
+        )
+
+    def _prune(self) -> None:
+        expired_before = time() - self._ttl
+        entries = []
+        for path in self._directory.glob("*.json"):
+            try:
+                modified_at = path.stat().st_mtime
+            except OSError:
+                continue
+            if modified_at < expired_before:
+                self._remove(path)
+            else:
+                entries.append((modified_at, path))
+
+        entries.sort()
+        for _, path in entries[:max(0, len(entries) - self._max_entries)]:
+            self._remove(path)
+            self.evictions += 1
+
+    def _remove(self, path: Path) -> None:
+        try:
+            path.unlink()
+            self._entries -= 1
+        except FileNotFoundError:
+            pass
+
+
+class ResultCache(AbstractResultCache):
+    """
+    Caches detection results by content of the uploaded image, so byte-identical frames (static
+    cameras, client retries) skip decoding and inference. Key consists of image content hash,
+    configuration ID and version and detector model ID, so results are never reused after
+    configuration or model changes.
+
+    Results are kept in memory (LRU with TTL) and optionally in a disk tier shared by workers
+    and restarts of the service.
+    """
+
+    def __init__(
+        self,
+        model_id: str,
+        max_entries: int = 10000,
+        ttl: float = 300.0,
+        disk_directory: Optional[str] = None,
+        max_disk_entries: int = 100000
+    ):
+        """
+        Initialize result cache.
+
+        :param model_id: Identifier of the detector model, results of other models are not reused
+        :type model_id: str
+        :param max_entries: maximum number of results kept in memory, defaults to 10000
+        :type max_entries: int, optional
+        :param ttl: seconds after which cached result expires, defaults to 5 minutes
+        :type ttl: float, optional
+        :param disk_directory: directory for disk tier, defaults to no disk tier
+        :type disk_directory: Optional[str], optional
+        :param max_disk_entries: maximum number of results kept on disk, defaults to 100000
+        :type max_disk_entries: int, optional
+        """
+        self._model_id = model_id
+        self._cache: LRUCache[str, dict[ObjectEnum, list[ObjectBoundingBoxDto]]] = LRUCache(max_size=max_entries, ttl=ttl)
+        self._disk_cache = _DiskResultCache(directory=disk_directory, ttl=ttl, max_entries=max_disk_entries) if disk_directory else None
+
+    async def get(self, content_hash: str, object_analysis_config: ObjectAnalysisConfigResponse) -> Optional[dict[ObjectEnum, list[ObjectBoundingBoxDto]]]:
+        key = self._get_key(content_hash=content_hash, object_analysis_config=object_analysis_config)
+        grouped_located_objects = self._cache.get(key)
+        if grouped_located_objects is not None or self._disk_cache is None:
+            return grouped_located_objects
+
+        data = await to_thread(self._disk_cache.load, key)
+        if data is None:
+            return None
+
+        grouped_located_objects = self._deserialize(data)
+        self._cache.put(key, grouped_located_objects)
+        return grouped_located_objects
+
+    async def put(
+        self,
+        content_hash: str,
+        object_analysis_config: ObjectAnalysisConfigResponse,
+        grouped_located_objects: dict[ObjectEnum, list[ObjectBoundingBoxDto]]
+    ) -> None:
+        key = self._get_key(content_hash=content_hash, object_analysis_config=object_analysis_config)
+        self._cache.put(key, grouped_located_objects)
+        if self._disk_cache is not None:
+            await to_thread(self._disk_cache.store, key, self._serialize(grouped_located_objects))
+
+    def get_metrics(self) -> CacheMetricsResponse:
+        return CacheMetricsResponse(
+            entries=len(self._cache),
+            hits=self._cache.hits,
+            misses=self._cache.misses,
+            hit_rate=self._cache.hit_rate,
+            evictions=self._cache.evictions,
+        )
+
+    def get_disk_metrics(self) -> Optional[CacheMetricsResponse]:
+        return self._disk_cache.get_metrics() if self._disk_cache is not None else None
+
+    def _get_key(self, content_hash: str, object_analysis_config: ObjectAnalysisConfigResponse) -> str:
+        version = object_analysis_config.version.isoformat() if object_analysis_config.version else ""
+        raw_key = f"{content_hash}:{object_analysis_config.id}:{version}:{self._model_id}"
+        return blake2b(raw_key.encode(), digest_size=16).hexdigest()
+
+    @staticmethod
+    def _serialize(grouped_located_objects: dict[ObjectEnum, list[ObjectBoundingBoxDto]]) -> dict:
+        return {
+            object_enum.value: [
+                [box.confidence, box.top_left.width, box.top_left.height, box.bottom_right.width, box.bottom_right.height]
+                for box in boxes
+            ]
+            for object_enum, boxes in grouped_located_objects.items()
+        }
+
+    @staticmethod
+    def _deserialize(data: dict) -> dict[ObjectEnum, list[ObjectBoundingBoxDto]]:
+        return {
+            ObjectEnum(object_type): [
+                ObjectBoundingBoxDto(
+                    object_type=ObjectEnum(object_type),
+                    confidence=confidence,
+                    top_left=PixelCoordinateDto(width=x1, height=y1),
+                    bottom_right=PixelCoordinateDto(width=x2, height=y2)
+                )
+                for confidence, x1, y1, x2, y2 in boxes
+            ]
+            for object_type, boxes in data.items()
+        }
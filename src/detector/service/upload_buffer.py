@@ -0,0 +1,62 @@
+from contextlib import contextmanager
+from hashlib import blake2b
+from io import BytesIO
+from mmap import mmap, ACCESS_READ
+from typing import Iterator
+from fastapi import UploadFile
+
+
+@contextmanager
+def open_upload_buffer(file: UploadFile) -> Iterator[memoryview]:
+    """
+    Expose uploaded file content as read-only buffer without copying it. Uploads spooled to
+    disk are memory mapped, uploads still held in memory are exposed through a memoryview of
+    the spool buffer.
+
+    Buffer is only valid inside the context, arrays created on top of it (e.g. with 'frombuffer')
+    must not be used after the context exits. Spool can't be closed while buffer is exposed.
+
+    :param file: Uploaded file
+    :type file: UploadFile
+    :yield: Read-only view of the file content
+    :rtype: Iterator[memoryview]
+    """
+    spool = file.file
+    # 'fileno' would roll in-memory spool over to disk, so check whether it was rolled already
+    in_memory_file = getattr(spool, "_file", None)
+    if isinstance(in_memory_file, BytesIO):
+        buffer = in_memory_file.getbuffer()
+        read_only_buffer = buffer.toreadonly()
+        try:
+            yield read_only_buffer
+        finally:
+            read_only_buffer.release()
+            buffer.release()
+        return
+
+    spool.flush()
+    try:
+        mapped_file = mmap(spool.fileno(), 0, access=ACCESS_READ)
+    except ValueError:  # empty files can't be mapped
+        yield memoryview(b"")
+        return
+
+    buffer = memoryview(mapped_file)
+    try:
+        yield buffer
+    finally:
+        buffer.release()
+        mapped_file.close()
+
+
+def hash_upload(file: UploadFile) -> str:
+    """
+    Hash uploaded file content without copying it.
+
+    :param file: Uploaded file
+    :type file: UploadFile
+    :return: Hex digest of the content
+    :rtype: str
+    """
+    with open_upload_buffer(file=file) as content:
+        return blake2b(content, digest_size=16).hexdigest()
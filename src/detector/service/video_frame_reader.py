@@ -0,0 +1,145 @@
+from asyncio import AbstractEventLoop, Queue, get_running_loop, run_coroutine_threadsafe, to_thread
+from concurrent.futures import CancelledError as FutureCancelledError
+from os import unlink
+from shutil import copyfileobj
+from tempfile import NamedTemporaryFile
+from threading import Event, Thread
+from typing import Optional
+from weakref import finalize
+from cv2 import VideoCapture, CAP_PROP_FPS, CAP_PROP_POS_MSEC
+from fastapi import UploadFile
+
+# local imports
+from ..model.dto import VideoFrameDto
+from ..exception import FileInvalidException
+
+
+class VideoFrameReader:
+    """
+    Decodes uploaded video in a background thread and hands sampled frames over to the event
+    loop through a bounded queue. Decoder pauses while the queue is full, so only a few frames
+    are held in memory regardless of the video length.
+
+    Capture and temporary file are released by 'close', or when the reader is garbage collected
+    if it never got to be read (e.g. streaming response was dropped before its body was sent).
+    """
+
+    ALLOWED_EXTENSIONS = {".mp4", ".mjpeg", ".mjpg"}
+    ALLOWED_MIME_TYPES = {"video/mp4", "video/x-motion-jpeg", "video/mjpeg"}
+
+    def __init__(self, path: str, sample_fps: float, queue_size: int):
+        self._sample_interval_ms = 1000 / sample_fps
+        self._capture = VideoCapture(path)
+        if not self._capture.isOpened():
+            self._capture.release()
+            raise FileInvalidException("File is not a valid video.")
+        self._release = finalize(self, _release_video, self._capture, path)
+
+        self._source_fps = self._capture.get(CAP_PROP_FPS) or 0.0
+        self._queue: Queue[Optional[VideoFrameDto]] = Queue(maxsize=queue_size)
+        self._stopped = Event()
+        self._loop: Optional[AbstractEventLoop] = None
+        self._thread: Optional[Thread] = None
+        self.error: Optional[Exception] = None
+
+    @classmethod
+    async def open(cls, file: UploadFile, sample_fps: float, queue_size: int = 8) -> "VideoFrameReader":
+        """
+        Open uploaded video for reading. Upload is copied to a temporary file first, since
+        OpenCV can only demux from a path and the upload is closed once the request returns.
+
+        :param file: Uploaded video
+        :type file: UploadFile
+        :param sample_fps: Number of frames per second of video to decode, other frames are skipped
+        :type sample_fps: float
+        :param queue_size: Maximum number of decoded frames waiting to be processed, defaults to 8
+        :type queue_size: int, optional
+        :raises FileInvalidException: If file is not an allowed or readable video
+        :return: Reader, decoding starts with 'start'
+        :rtype: VideoFrameReader
+        """
+        file_extension = f".{file.filename.lower().rsplit('.', 1)[-1]}" if file.filename else ""
+        if file_extension not in cls.ALLOWED_EXTENSIONS or file.content_type not in cls.ALLOWED_MIME_TYPES:
+            raise FileInvalidException()
+
+        path = await to_thread(cls._copy_to_temporary_file, file, file_extension)
+        try:
+            return await to_thread(cls, path, sample_fps, queue_size)
+        except BaseException:
+            unlink(path)
+            raise
+
+    def start(self) -> None:
+        self._loop = get_running_loop()
+        self._thread = Thread(target=self._decode, name="video-frame-reader", daemon=True)
+        self._thread.start()
+
+    async def read(self) -> Optional[VideoFrameDto]:
+        """
+        Get next sampled frame, 'None' once video has ended or decoding failed (see 'error').
+        """
+        return await self._queue.get()
+
+    async def close(self) -> None:
+        self._stopped.set()
+        # unblock decoder waiting for free space in the queue
+        while not self._queue.empty():
+            self._queue.get_nowait()
+
+        if self._thread is not None:
+            await to_thread(self._thread.join)
+        # runs only once, no-op if reader was already closed
+        self._release()
+
+    def _decode(self) -> None:
+        frame_index = -1
+        next_sample_ms = 0.0
+        try:
+            while not self._stopped.is_set():
+                # grab only demuxes the frame, skipped frames are never decoded into BGR image
+                if not self._capture.grab():
+                    break
+                frame_index += 1
+
+                # container timestamps are unreliable for raw MJPEG streams, prefer frame rate
+                if self._source_fps > 0:
+                    timestamp_ms = frame_index * 1000 / self._source_fps
+                else:
+                    timestamp_ms = self._capture.get(CAP_PROP_POS_MSEC)
+                if timestamp_ms < next_sample_ms:
+                    continue
+                next_sample_ms = (timestamp_ms // self._sample_interval_ms + 1) * self._sample_interval_ms
+
+                retrieved, image = self._capture.retrieve()
+                if not retrieved:
+                    break
+                self._put(VideoFrameDto(frame_index=frame_index, timestamp_ms=timestamp_ms, image=image))
+        except Exception as err:  # pylint: disable=broad-exception-caught
+            self.error = err
+        finally:
+            self._capture.release()
+            self._put(None)
+
+    def _put(self, frame: Optional[VideoFrameDto]) -> None:
+        if self._stopped.is_set():
+            return
+        try:
+            # blocks decoder until there is free space in the queue
+            run_coroutine_threadsafe(self._queue.put(frame), self._loop).result()
+        except (FutureCancelledError, RuntimeError):  # event loop is closing
+            self._stopped.set()
+
+    @staticmethod
+    def _copy_to_temporary_file(file: UploadFile, suffix: str) -> str:
+        file.file.seek(0)
+        with NamedTemporaryFile(suffix=suffix, delete=False) as temporary_file:
+            copyfileobj(file.file, temporary_file, length=1024 * 1024)
+        return temporary_file.name
+
+
+def _release_video(capture: VideoCapture, path: str) -> None:
+    capture.release()
+    try:
+        unlink(path)
+    except FileNotFoundError:
+        pass
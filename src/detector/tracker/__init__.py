@@ -0,0 +1 @@
+from .object_tracker import ObjectTracker
@@ -0,0 +1,78 @@
+from numpy import ndarray, eye, zeros, r_, square, diag, maximum
+from scipy.linalg import cho_factor, cho_solve
+
+# process and measurement noise relative to object size, as in SORT/ByteTrack
+_STD_WEIGHT_POSITION = 1 / 20
+_STD_WEIGHT_VELOCITY = 1 / 160
+
+
+class KalmanFilter:
+    """
+    Constant velocity Kalman filter of a bounding box. State is box center, width, height and
+    their velocities (cx, cy, w, h, vcx, vcy, vw, vh), measurement is the box (cx, cy, w, h).
+    Time step is one processed frame.
+    """
+
+    def __init__(self):
+        self._motion_matrix = eye(8)
+        for i in range(4):
+            self._motion_matrix[i, 4 + i] = 1.0
+        self._update_matrix = eye(4, 8)
+
+    def initiate(self, measurement: ndarray) -> tuple[ndarray, ndarray]:
+        """
+        Create track state from unassociated measurement.
+
+        :param measurement: Box (cx, cy, w, h)
+        :type measurement: ndarray
+        :return: Mean and covariance of the new state
+        :rtype: tuple[ndarray, ndarray]
+        """
+        mean = r_[measurement, zeros(4)]
+        width, height = measurement[2], measurement[3]
+        std = [
+            2 * _STD_WEIGHT_POSITION * width,
+            2 * _STD_WEIGHT_POSITION * height,
+            2 * _STD_WEIGHT_POSITION * width,
+            2 * _STD_WEIGHT_POSITION * height,
+            10 * _STD_WEIGHT_VELOCITY * width,
+            10 * _STD_WEIGHT_VELOCITY * height,
+            10 * _STD_WEIGHT_VELOCITY * width,
+            10 * _STD_WEIGHT_VELOCITY * height,
+        ]
+        return mean, diag(square(std))
+
+    def predict(self, mean: ndarray, covariance: ndarray) -> tuple[ndarray, ndarray]:
+        width, height = mean[2], mean[3]
+        std = [
+            _STD_WEIGHT_POSITION * width,
+            _STD_WEIGHT_POSITION * height,
+            _STD_WEIGHT_POSITION * width,
+            _STD_WEIGHT_POSITION * height,
+            _STD_WEIGHT_VELOCITY * width,
+            _STD_WEIGHT_VELOCITY * height,
+            _STD_WEIGHT_VELOCITY * width,
+            _STD_WEIGHT_VELOCITY * height,
+        ]
+        mean = self._motion_matrix @ mean
+        # box must not shrink into nothing while it's only predicted
+        mean[2:4] = maximum(mean[2:4], 1.0)
+        covariance = self._motion_matrix @ covariance @ self._motion_matrix.T + diag(square(std))
+        return mean, covariance
+
+    def update(self, mean: ndarray, covariance: ndarray, measurement: ndarray) -> tuple[ndarray, ndarray]:
+        width, height = mean[2], mean[3]
+        std = [
+            _STD_WEIGHT_POSITION * width,
+            _STD_WEIGHT_POSITION * height,
+            _STD_WEIGHT_POSITION * width,
+            _STD_WEIGHT_POSITION * height,
+        ]
+        projected_mean = self._update_matrix @ mean
+        projected_covariance = self._update_matrix @ covariance @ self._update_matrix.T + diag(square(std))
+
+        # kalman gain K = P H^T S^-1, solved with Cholesky decomposition of S instead of inverting it
+        kalman_gain = cho_solve(cho_factor(projected_covariance, lower=True, check_finite=False), (covariance @ self._update_matrix.T).T, check_finite=False).T
+        mean = mean + kalman_gain @ (measurement - projected_mean)
+        covariance = covariance - kalman_gain @ projected_covariance @ kalman_gain.T
+        return mean, covariance
@@ -0,0 +1,233 @@
+from typing import Optional
+from numpy import ndarray, array, maximum, minimum, float64
+from scipy.optimize import linear_sum_assignment
+
+# local imports
+from ..model.enum import ObjectEnum, TrackEventEnum
+from ..model.dto import ObjectBoundingBoxDto, PixelCoordinateDto, TrackedObjectDto, TrackEventDto, TrackingResultDto
+from .kalman_filter import KalmanFilter
+
+
+class _Track:
+
+    def __init__(self, kalman_filter: KalmanFilter, bounding_box: ObjectBoundingBoxDto):
+        self._kalman_filter = kalman_filter
+        self.mean, self.covariance = kalman_filter.initiate(_to_xywh(bounding_box))
+        self.bounding_box = bounding_box
+        self.track_id: Optional[int] = None  # assigned once track is confirmed
+        self.hits = 1
+        self.lost = 0  # consecutive detection frames without a match
+
+    def predict(self) -> None:
+        self.mean, self.covariance = self._kalman_filter.predict(self.mean, self.covariance)
+
+    def update(self, bounding_box: ObjectBoundingBoxDto) -> None:
+        self.mean, self.covariance = self._kalman_filter.update(self.mean, self.covariance, _to_xywh(bounding_box))
+        self.bounding_box = bounding_box
+        self.hits += 1
+        self.lost = 0
+
+    def predicted_box(self) -> ObjectBoundingBoxDto:
+        center_x, center_y, width, height = self.mean[:4]
+        return ObjectBoundingBoxDto(
+            object_type=self.bounding_box.object_type,
+            confidence=self.bounding_box.confidence,
+            top_left=PixelCoordinateDto(width=max(0, round(center_x - width / 2)), height=max(0, round(center_y - height / 2))),
+            bottom_right=PixelCoordinateDto(width=max(0, round(center_x + width / 2)), height=max(0, round(center_y + height / 2)))
+        )
+
+    def xyxy(self) -> list[float]:
+        center_x, center_y, width, height = self.mean[:4]
+        return [center_x - width / 2, center_y - height / 2, center_x + width / 2, center_y + height / 2]
+
+
+class ObjectTracker:
+    """
+    Multi-object tracker in the style of ByteTrack. Tracks are propagated with a Kalman filter
+    and associated with detections by IoU (Hungarian assignment), confident detections first,
+    then less confident ones which only extend existing tracks. Each object type is tracked
+    separately with its own track IDs.
+
+    Detector doesn't have to run on every frame, frames without detections only propagate
+    tracks. Tracker keeps state of a single stream and is not thread-safe.
+    """
+
+    def __init__(
+        self,
+        objects: list[ObjectEnum],
+        high_confidence: float,
+        low_confidence: float = 0.1,
+        match_iou: float = 0.2,
+        low_confidence_match_iou: float = 0.5,
+        tentative_match_iou: float = 0.3,
+        min_hits: int = 2,
+        max_lost: int = 30
+    ):
+        """
+        Initialize object tracker.
+
+        :param objects: Object types to track
+        :type objects: list[ObjectEnum]
+        :param high_confidence: detections at or above this confidence (0...1.0) can start new tracks
+        :type high_confidence: float
+        :param low_confidence: detections below this confidence (0...1.0) are ignored, defaults to 0.1
+        :type low_confidence: float, optional
+        :param match_iou: smallest IoU for associating track with confident detection, defaults to 0.2
+        :type match_iou: float, optional
+        :param low_confidence_match_iou: smallest IoU for associating track with less confident detection, defaults to 0.5
+        :type low_confidence_match_iou: float, optional
+        :param tentative_match_iou: smallest IoU for associating unconfirmed track with detection, defaults to 0.3
+        :type tentative_match_iou: float, optional
+        :param min_hits: number of detections after which track is confirmed (and counted), defaults to 2
+        :type min_hits: int, optional
+        :param max_lost: number of detection frames without a match after which track exits, defaults to 30
+        :type max_lost: int, optional
+        """
+        # box confidence is in percentage
+        self._high_confidence = high_confidence * 100
+        self._low_confidence = low_confidence * 100
+        self._match_iou = match_iou
+        self._low_confidence_match_iou = low_confidence_match_iou
+        self._tentative_match_iou = tentative_match_iou
+        self._min_hits = min_hits
+        self._max_lost = max_lost
+
+        self._kalman_filter = KalmanFilter()
+        self._tracks: dict[ObjectEnum, list[_Track]] = {object_enum: [] for object_enum in objects}
+        self._unique_counts: dict[ObjectEnum, int] = {object_enum: 0 for object_enum in objects}
+
+    def update(self, grouped_located_objects: dict[ObjectEnum, list[ObjectBoundingBoxDto]]) -> TrackingResultDto:
+        """
+        Advance tracks by one frame and associate them with objects detected on the frame.
+
+        :param grouped_located_objects: Detected objects grouped by object type
+        :type grouped_located_objects: dict[ObjectEnum, list[ObjectBoundingBoxDto]]
+        :return: Tracks matched on the frame, entry and exit events and unique counts
+        :rtype: TrackingResultDto
+        """
+        tracked_objects: list[TrackedObjectDto] = []
+        events: list[TrackEventDto] = []
+        for object_enum, tracks in self._tracks.items():
+            for track in tracks:
+                track.predict()
+            self._update_tracks(
+                object_enum=object_enum,
+                tracks=tracks,
+                bounding_boxes=[box for box in grouped_located_objects.get(object_enum, []) if box.confidence >= self._low_confidence],
+                events=events
+            )
+            tracked_objects.extend(
+                TrackedObjectDto(track_id=track.track_id, bounding_box=track.bounding_box)
+                for track in tracks if track.track_id is not None and track.lost == 0
+            )
+
+        return TrackingResultDto(tracks=tracked_objects, events=events, unique_counts=dict(self._unique_counts))
+
+    def propagate(self) -> TrackingResultDto:
+        """
+        Advance tracks by one frame without detections, tracks are moved to predicted positions.
+
+        :return: Predicted positions of tracks and unique counts
+        :rtype: TrackingResultDto
+        """
+        tracked_objects: list[TrackedObjectDto] = []
+        for tracks in self._tracks.values():
+            for track in tracks:
+                track.predict()
+            tracked_objects.extend(
+                TrackedObjectDto(track_id=track.track_id, bounding_box=track.predicted_box())
+                for track in tracks if track.track_id is not None and track.lost == 0
+            )
+
+        return TrackingResultDto(tracks=tracked_objects, events=[], unique_counts=dict(self._unique_counts))
+
+    def _update_tracks(self, object_enum: ObjectEnum, tracks: list[_Track], bounding_boxes: list[ObjectBoundingBoxDto], events: list[TrackEventDto]) -> None:
+        confident_boxes = [box for box in bounding_boxes if box.confidence >= self._high_confidence]
+        unconfident_boxes = [box for box in bounding_boxes if box.confidence < self._high_confidence]
+        confirmed_tracks = [track for track in tracks if track.track_id is not None]
+        tentative_tracks = [track for track in tracks if track.track_id is None]
+
+        # confident detections first, they can also recover lost tracks
+        matches, unmatched_tracks, confident_boxes = self._associate(confirmed_tracks, confident_boxes, min_iou=self._match_iou)
+        # less confident detections (e.g. occluded objects) only keep tracks seen on previous frame alive
+        still_tracked = [track for track in unmatched_tracks if track.lost == 0]
+        low_matches, unmatched_still_tracked, _ = self._associate(still_tracked, unconfident_boxes, min_iou=self._low_confidence_match_iou)
+        tentative_matches, unmatched_tentative_tracks, confident_boxes = self._associate(tentative_tracks, confident_boxes, min_iou=self._tentative_match_iou)
+
+        for track, bounding_box in matches + low_matches + tentative_matches:
+            track.update(bounding_box)
+
+        missed_tracks = set(map(id, unmatched_still_tracked)) | {id(track) for track in unmatched_tracks if track.lost > 0}
+        unmatched_tentative = set(map(id, unmatched_tentative_tracks))
+        remaining_tracks: list[_Track] = []
+        for track in tracks:
+            if id(track) in unmatched_tentative:
+                # unconfirmed tracks are dropped on first miss, they are likely false positives
+                continue
+            if id(track) in missed_tracks:
+                track.lost += 1
+                if track.lost > self._max_lost:
+                    events.append(TrackEventDto(event=TrackEventEnum.EXIT, track_id=track.track_id, object_type=object_enum))
+                    continue
+            remaining_tracks.append(track)
+
+        remaining_tracks.extend(_Track(kalman_filter=self._kalman_filter, bounding_box=bounding_box) for bounding_box in confident_boxes)
+
+        for track in remaining_tracks:
+            if track.track_id is None and track.hits >= self._min_hits:
+                self._unique_counts[object_enum] += 1
+                track.track_id = self._unique_counts[object_enum]
+                events.append(TrackEventDto(event=TrackEventEnum.ENTRY, track_id=track.track_id, object_type=object_enum))
+
+        tracks[:] = remaining_tracks
+
+    @staticmethod
+    def _associate(
+        tracks: list[_Track],
+        bounding_boxes: list[ObjectBoundingBoxDto],
+        min_iou: float
+    ) -> tuple[list[tuple[_Track, ObjectBoundingBoxDto]], list[_Track], list[ObjectBoundingBoxDto]]:
+        if not tracks or not bounding_boxes:
+            return [], tracks, bounding_boxes
+
+        iou = _iou_matrix(
+            array([track.xyxy() for track in tracks], dtype=float64),
+            array([_to_xyxy(box) for box in bounding_boxes], dtype=float64)
+        )
+        track_indices, box_indices = linear_sum_assignment(1.0 - iou)
+
+        matches = []
+        matched_tracks, matched_boxes = set(), set()
+        for track_index, box_index in zip(track_indices, box_indices):
+            if iou[track_index, box_index] >= min_iou:
+                matches.append((tracks[track_index], bounding_boxes[box_index]))
+                matched_tracks.add(track_index)
+                matched_boxes.add(box_index)
+
+        return (
+            matches,
+            [track for index, track in enumerate(tracks) if index not in matched_tracks],
+            [box for index, box in enumerate(bounding_boxes) if index not in matched_boxes]
+        )
+
+
+def _to_xyxy(bounding_box: ObjectBoundingBoxDto) -> list[float]:
+    return [bounding_box.top_left.width, bounding_box.top_left.height, bounding_box.bottom_right.width, bounding_box.bottom_right.height]
+
+
+def _to_xywh(bounding_box: ObjectBoundingBoxDto) -> ndarray:
+    left, top, right, bottom = _to_xyxy(bounding_box)
+    return array([(left + right) / 2, (top + bottom) / 2, max(right - left, 1.0), max(bottom - top, 1.0)], dtype=float64)
+
+
+def _iou_matrix(boxes_a: ndarray, boxes_b: ndarray) -> ndarray:
+    left = maximum(boxes_a[:, None, 0], boxes_b[None, :, 0])
+    top = maximum(boxes_a[:, None, 1], boxes_b[None, :, 1])
+    right = minimum(boxes_a[:, None, 2], boxes_b[None, :, 2])
+    bottom = minimum(boxes_a[:, None, 3], boxes_b[None, :, 3])
+    intersection = maximum(right - left, 0) * maximum(bottom - top, 0)
+
+    area_a = (boxes_a[:, 2] - boxes_a[:, 0]) * (boxes_a[:, 3] - boxes_a[:, 1])
+    area_b = (boxes_b[:, 2] - boxes_b[:, 0]) * (boxes_b[:, 3] - boxes_b[:, 1])
+    union = area_a[:, None] + area_b[None, :] - intersection
+    return intersection / maximum(union, 1e-9)
@@ -19,4 +19,4 @@ app = create_fastapi_app(
 app.include_router(main_router)
 
 if __name__ == "__main__":
-    uvicorn.run(app, host="0.0.0.0", port=8000, ws="none", reload=False, log_level="debug")
+    uvicorn.run(app, host="0.0.0.0", port=8000, ws="websockets", reload=False, log_level="debug")
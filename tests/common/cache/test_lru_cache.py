@@ -0,0 +1,108 @@
+import pytest
+
+from common.cache import LRUCache
+from common.cache import lru_cache
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(lru_cache, "monotonic", lambda: now[0])
+    return now
+
+
+def test_least_recently_used_entry_is_evicted_first():
+    cache = LRUCache(max_size=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")  # 'b' becomes least recently used
+
+    cache.put("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.evictions == 1
+
+
+def test_entries_are_evicted_until_size_fits():
+    cache = LRUCache(max_size=10, sizeof=len)
+    cache.put("a", "xxxx")
+    cache.put("b", "xxxx")
+
+    cache.put("c", "xxxxxxx")
+
+    assert cache.get("a") is None
+    assert cache.get("b") is None
+    assert cache.get("c") == "xxxxxxx"
+    assert cache.size == 7
+    assert cache.evictions == 2
+
+
+def test_entry_larger_than_cache_is_not_stored():
+    cache = LRUCache(max_size=4, sizeof=len)
+    cache.put("a", "xx")
+
+    cache.put("b", "xxxxx")
+
+    assert cache.get("b") is None
+    assert cache.get("a") == "xx"
+    assert cache.evictions == 0
+
+
+def test_replacing_entry_updates_size():
+    cache = LRUCache(max_size=10, sizeof=len)
+    cache.put("a", "xxxx")
+
+    cache.put("a", "xx")
+
+    assert len(cache) == 1
+    assert cache.size == 2
+
+
+def test_entry_expires_after_ttl(clock):
+    cache = LRUCache(max_size=2, ttl=10.0)
+    cache.put("a", 1)
+
+    clock[0] += 9.0
+    assert cache.get("a") == 1
+
+    clock[0] += 2.0
+    assert cache.get("a") is None
+    assert len(cache) == 0
+    assert cache.size == 0
+
+
+def test_reading_entry_does_not_extend_ttl(clock):
+    cache = LRUCache(max_size=2, ttl=10.0)
+    cache.put("a", 1)
+
+    clock[0] += 6.0
+    cache.get("a")
+    clock[0] += 6.0
+
+    assert cache.get("a") is None
+
+
+def test_invalidate_where_removes_matching_entries():
+    cache = LRUCache(max_size=10)
+    cache.put(("config-1", 1), 1)
+    cache.put(("config-1", 2), 2)
+    cache.put(("config-2", 1), 3)
+
+    cache.invalidate_where(lambda key: key[0] == "config-1")
+
+    assert len(cache) == 1
+    assert cache.get(("config-2", 1)) == 3
+
+
+def test_hit_rate_counts_hits_and_misses():
+    cache = LRUCache(max_size=2)
+    cache.put("a", 1)
+
+    cache.get("a")
+    cache.get("b")
+
+    assert cache.hits == 1
+    assert cache.misses == 1
+    assert cache.hit_rate == 0.5
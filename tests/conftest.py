@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# service modules import each other relative to 'src' (as with PYTHONPATH in Dockerfile)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
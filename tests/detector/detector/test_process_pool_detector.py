@@ -0,0 +1,108 @@
+from os import _exit
+from time import monotonic, sleep
+from typing import Optional
+
+import pytest
+from numpy import ndarray, full, uint8
+
+from detector.detector import ProcessPoolDetector
+from detector.exception import AnalyzerException
+from detector.interface import AbstractObjectDetector
+from detector.model.enum import ObjectEnum
+from detector.model.dto import ObjectBoundingBoxDto, PixelCoordinateDto
+
+# pixel values which make 'FakeDetector' misbehave in worker process
+_HANG_VALUE = 254
+_CRASH_VALUE = 255
+
+
+class FakeDetector(AbstractObjectDetector):
+    """Reports a single box spanning the whole image, with confidence equal to image's first pixel."""
+
+    def count(self, image: ndarray, objects: list[ObjectEnum], confidence: Optional[int] = None) -> dict[ObjectEnum, int]:
+        return {object_enum: len(boxes) for object_enum, boxes in self.detect(image=image, objects=objects).items()}
+
+    def detect(self, image: ndarray, objects: list[ObjectEnum], confidence: Optional[int] = None) -> dict[ObjectEnum, list[ObjectBoundingBoxDto]]:
+        value = int(image[0, 0, 0])
+        if value == _HANG_VALUE:
+            sleep(60)
+        if value == _CRASH_VALUE:
+            _exit(1)
+
+        return {
+            object_enum: [
+                ObjectBoundingBoxDto(
+                    object_type=object_enum,
+                    confidence=value,
+                    top_left=PixelCoordinateDto(width=0, height=0),
+                    bottom_right=PixelCoordinateDto(width=image.shape[1], height=image.shape[0])
+                )
+            ]
+            for object_enum in objects
+        }
+
+
+def _image(value: int, width: int = 32, height: int = 24) -> ndarray:
+    return full((height, width, 3), value, dtype=uint8)
+
+
+@pytest.fixture
+def make_detector():
+    detectors: list[ProcessPoolDetector] = []
+
+    def make(**kwargs) -> ProcessPoolDetector:
+        detector = ProcessPoolDetector(detector_class=FakeDetector, **kwargs)
+        detectors.append(detector)
+        return detector
+
+    yield make
+    for detector in detectors:
+        detector.close()
+
+
+def test_detect_batch_round_trips_frames_through_workers(make_detector) -> None:
+    # 2 slots split the batch into chunks, large frame doesn't fit into slot and is sent pickled
+    detector = make_detector(workers=2, slot_count=2, slot_size=32 * 24 * 3, task_timeout=30)
+    images = [_image(10), _image(20), _image(30, width=64), _image(40), _image(50)]
+    objects = [[ObjectEnum.CAR], [ObjectEnum.CAR, ObjectEnum.TRUCK], [ObjectEnum.CAR], [ObjectEnum.BUS], [ObjectEnum.CAR]]
+
+    results = detector.detect_batch(images=images, objects=objects, confidences=[None] * len(images))
+
+    assert [
+        {object_enum: [box.confidence for box in boxes] for object_enum, boxes in result.items()}
+        for result in results
+    ] == [
+        {ObjectEnum.CAR: [10]},
+        {ObjectEnum.CAR: [20], ObjectEnum.TRUCK: [20]},
+        {ObjectEnum.CAR: [30]},
+        {ObjectEnum.BUS: [40]},
+        {ObjectEnum.CAR: [50]},
+    ]
+    assert results[2][ObjectEnum.CAR][0].bottom_right == PixelCoordinateDto(width=64, height=24)
+
+    detector.warm_up(images=images, objects=objects, confidences=[None] * len(images))
+
+
+def test_timed_out_task_restarts_worker_and_releases_slots(make_detector) -> None:
+    detector = make_detector(workers=1, slot_count=1, task_timeout=5)
+    assert detector.detect(image=_image(1), objects=[ObjectEnum.CAR])[ObjectEnum.CAR][0].confidence == 1
+
+    with pytest.raises(AnalyzerException) as error:
+        detector.detect(image=_image(_HANG_VALUE), objects=[ObjectEnum.CAR])
+    assert error.value.payload.detail == "detector_worker_timeout"
+
+    # the only slot is reused only after stuck worker was replaced, so its frame can't be overwritten
+    assert detector.detect(image=_image(2), objects=[ObjectEnum.CAR])[ObjectEnum.CAR][0].confidence == 2
+
+
+def test_crashed_worker_fails_task_without_waiting_for_timeout(make_detector) -> None:
+    detector = make_detector(workers=1, slot_count=1, task_timeout=30)
+    assert detector.detect(image=_image(1), objects=[ObjectEnum.CAR])[ObjectEnum.CAR][0].confidence == 1
+
+    started_at = monotonic()
+    with pytest.raises(AnalyzerException) as error:
+        detector.detect(image=_image(_CRASH_VALUE), objects=[ObjectEnum.CAR])
+    assert error.value.payload.detail == "detector_worker_failure"
+    assert monotonic() - started_at < 10
+
+    assert detector.detect(image=_image(3), objects=[ObjectEnum.CAR])[ObjectEnum.CAR][0].confidence == 3
@@ -0,0 +1,120 @@
+from asyncio import run
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from detector.database import ObjectAnalysisConfig, Object, ObjectAnalysisConfigRepository
+from detector.service import AnalyzeObjectConfigManager, ImageProcessor, MaskCache
+from detector.model.enum import ObjectEnum
+from detector.model.api import ObjectAnalysisConfigRequest, ImageResolution, PixelCoordinate
+
+
+class _QueryCounter:
+
+    def __init__(self):
+        self.count = 0
+        self.statements: list[str] = []
+
+    def __call__(self, _connection, _cursor, statement: str, *_) -> None:
+        self.count += 1
+        self.statements.append(statement)
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'detector.db'}")
+
+    async def create_tables():
+        async with engine.begin() as connection:
+            await connection.run_sync(ObjectAnalysisConfig.metadata.create_all, tables=[ObjectAnalysisConfig.__table__, Object.__table__])
+
+    run(create_tables())
+    yield engine
+    run(engine.dispose())
+
+
+@pytest.fixture
+def query_counter(engine):
+    query_counter = _QueryCounter()
+    event.listen(engine.sync_engine, "before_cursor_execute", query_counter)
+    yield query_counter
+    event.remove(engine.sync_engine, "before_cursor_execute", query_counter)
+
+
+@pytest.fixture
+def analyze_object_config_manager(engine) -> AnalyzeObjectConfigManager:
+    return AnalyzeObjectConfigManager(
+        object_analysis_config_repository=ObjectAnalysisConfigRepository(engine=engine),
+        mask_cache=MaskCache(image_processor=ImageProcessor())
+    )
+
+
+def _request(index: int) -> ObjectAnalysisConfigRequest:
+    return ObjectAnalysisConfigRequest(
+        config_name=f"camera-{index}",
+        image_resolution=ImageResolution(width=1920, height=1080),
+        image_mask=[PixelCoordinate(width=0, height=0), PixelCoordinate(width=100, height=0), PixelCoordinate(width=100, height=100)],
+        example_image_id=uuid4(),
+        objects=[ObjectEnum.CAR, ObjectEnum.BUS],
+    )
+
+
+def _add_configs(analyze_object_config_manager: AnalyzeObjectConfigManager, account_id, config_count: int) -> None:
+    async def add_configs():
+        for index in range(config_count):
+            await analyze_object_config_manager.add_config(account_id=account_id, request=_request(index))
+
+    run(add_configs())
+
+
+@pytest.mark.parametrize("config_count", [1, 5, 20])
+def test_get_all_configs_query_count_does_not_grow_with_configs(analyze_object_config_manager, query_counter, config_count):
+    account_id = uuid4()
+    _add_configs(analyze_object_config_manager, account_id=account_id, config_count=config_count)
+    query_counter.count = 0
+
+    configs = run(analyze_object_config_manager.get_all_configs(account_id=account_id))
+
+    # configurations and objects of all of them, masks are stored in the configuration row
+    assert query_counter.count == 2
+    assert len(configs) == config_count
+    assert all(config.objects == [ObjectEnum.CAR, ObjectEnum.BUS] for config in configs)
+    assert all(config.image_mask is not None for config in configs)
+
+
+def test_get_all_with_children_query_count_does_not_grow_with_configs(engine, analyze_object_config_manager, query_counter):
+    account_id = uuid4()
+    repository = ObjectAnalysisConfigRepository(engine=engine)
+
+    query_counts = []
+    for config_count in (1, 10):
+        _add_configs(analyze_object_config_manager, account_id=account_id, config_count=config_count)
+        query_counter.count = 0
+        run(repository.get_all_for_account_id_with_children(account_id=account_id))
+        query_counts.append(query_counter.count)
+
+    assert query_counts[0] == query_counts[1]
+
+
+def test_get_config_loads_children_in_single_session(analyze_object_config_manager, query_counter):
+    account_id = uuid4()
+    config = run(analyze_object_config_manager.add_config(account_id=account_id, request=_request(0)))
+    query_counter.count = 0
+
+    loaded_config = run(analyze_object_config_manager.get_config(account_id=account_id, config_id=config.id))
+
+    assert query_counter.count == 2
+    assert loaded_config.objects == [ObjectEnum.CAR, ObjectEnum.BUS]
+
+
+def test_add_config_inserts_objects_in_single_statement_in_request_order(analyze_object_config_manager, query_counter):
+    request = _request(0).model_copy(update={"objects": [ObjectEnum.TRUCK, ObjectEnum.CAR, ObjectEnum.BICYCLE, ObjectEnum.BUS]})
+    query_counter.statements.clear()
+
+    config = run(analyze_object_config_manager.add_config(account_id=uuid4(), request=request))
+
+    object_inserts = [statement for statement in query_counter.statements if statement.startswith("INSERT INTO object ")]
+    assert len(object_inserts) == 1
+    assert config.objects == [ObjectEnum.TRUCK, ObjectEnum.CAR, ObjectEnum.BICYCLE, ObjectEnum.BUS]
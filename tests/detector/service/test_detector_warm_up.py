@@ -0,0 +1,73 @@
+from asyncio import run
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+import pytest
+from numpy import ndarray
+
+from detector.service import DetectorWarmUp
+from detector.interface import AbstractObjectDetector
+from detector.model.enum import ObjectEnum
+from detector.model.dto import ObjectBoundingBoxDto
+
+
+class FlakyDetector(AbstractObjectDetector):
+    """Fails given number of detections before it starts to work."""
+
+    def __init__(self, failures: int):
+        self.failures = failures
+        self.calls = 0
+
+    def count(self, image: ndarray, objects: list[ObjectEnum], confidence: Optional[int] = None) -> dict[ObjectEnum, int]:
+        return {object_enum: 0 for object_enum in objects}
+
+    def detect(self, image: ndarray, objects: list[ObjectEnum], confidence: Optional[int] = None) -> dict[ObjectEnum, list[ObjectBoundingBoxDto]]:
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise RuntimeError("model_not_loaded")
+        return {object_enum: [] for object_enum in objects}
+
+
+@pytest.fixture
+def executor():
+    executor = ThreadPoolExecutor(max_workers=1)
+    yield executor
+    executor.shutdown()
+
+
+def _warm_up(detector: AbstractObjectDetector, executor: ThreadPoolExecutor) -> DetectorWarmUp:
+    return DetectorWarmUp(
+        object_detector=detector,
+        executor=executor,
+        executor_workers=1,
+        resolutions=[(64, 48)],
+        batch_sizes=[1],
+        iterations=1,
+        attempts=3,
+        retry_delay=0,
+    )
+
+
+def test_failed_warm_up_is_retried(executor) -> None:
+    detector_warm_up = _warm_up(FlakyDetector(failures=2), executor)
+
+    run(detector_warm_up.run())
+
+    metrics = detector_warm_up.get_metrics()
+    assert detector_warm_up.is_ready
+    assert not metrics.degraded
+    assert metrics.error is None
+    assert metrics.inference_times_ms.keys() == {"64x48@1"}
+
+
+def test_warm_up_reports_degraded_readiness_after_all_attempts_fail(executor) -> None:
+    detector = FlakyDetector(failures=10)
+    detector_warm_up = _warm_up(detector, executor)
+
+    run(detector_warm_up.run())
+
+    metrics = detector_warm_up.get_metrics()
+    assert detector.calls == 3
+    assert detector_warm_up.is_ready
+    assert metrics.degraded
+    assert "model_not_loaded" in metrics.error
@@ -0,0 +1,103 @@
+from numpy import ones, uint8, zeros
+
+from detector.service.frame_tiler import FrameTiler
+from detector.model.enum import ObjectEnum
+from detector.model.dto import ObjectBoundingBoxDto, PixelCoordinateDto
+
+# two tiles side by side on 200x100 frame, overlapping by 20 pixels
+_WHOLE_FRAME = (0, 0, 200, 100)
+_LEFT_TILE = (0, 0, 110, 100)
+_RIGHT_TILE = (90, 0, 200, 100)
+
+
+def _box(left: int, top: int, right: int, bottom: int, confidence: int = 90) -> ObjectBoundingBoxDto:
+    return ObjectBoundingBoxDto(
+        object_type=ObjectEnum.CAR,
+        confidence=confidence,
+        top_left=PixelCoordinateDto(width=left, height=top),
+        bottom_right=PixelCoordinateDto(width=right, height=bottom)
+    )
+
+
+def _corners(boxes: list[ObjectBoundingBoxDto]) -> list[tuple[int, int, int, int]]:
+    return sorted((box.top_left.width, box.top_left.height, box.bottom_right.width, box.bottom_right.height) for box in boxes)
+
+
+def test_image_fitting_into_tile_is_not_split():
+    assert FrameTiler(tile_size=128).split(image_array=zeros((100, 128, 3), dtype=uint8)) == []
+
+
+def test_tiles_cover_image_and_end_at_its_edge():
+    tiles = FrameTiler(tile_size=100, overlap=0.2).split(image_array=zeros((100, 250, 3), dtype=uint8))
+
+    assert [tile.region for tile in tiles] == [(0, 0, 100, 100), (80, 0, 180, 100), (150, 0, 250, 100)]
+    assert all(tile.image.shape == (100, 100, 3) for tile in tiles)
+
+
+def test_fully_masked_tiles_are_left_out():
+    raster = ones((100, 250), dtype=uint8)
+    raster[:, 100:] = 0
+
+    tiles = FrameTiler(tile_size=100, overlap=0.2).split(image_array=zeros((100, 250, 3), dtype=uint8), raster=raster)
+
+    assert [tile.region for tile in tiles] == [(0, 0, 100, 100), (80, 0, 180, 100)]
+
+
+def test_object_cut_by_tile_seam_is_merged_into_union():
+    frame_tiler = FrameTiler(tile_size=110)
+
+    merged = frame_tiler.merge(
+        regions=[_LEFT_TILE, _RIGHT_TILE],
+        grouped_located_objects=[
+            # object spans 80...130, left tile only sees it up to its right edge
+            {ObjectEnum.CAR: [_box(80, 40, 110, 60, confidence=80)]},
+            {ObjectEnum.CAR: [_box(0, 40, 40, 60, confidence=90)]},
+        ]
+    )
+
+    assert _corners(merged[ObjectEnum.CAR]) == [(80, 40, 130, 60)]
+    assert merged[ObjectEnum.CAR][0].confidence == 90
+
+
+def test_distinct_adjacent_objects_are_not_merged():
+    frame_tiler = FrameTiler(tile_size=110)
+
+    merged = frame_tiler.merge(
+        regions=[_WHOLE_FRAME, _LEFT_TILE],
+        grouped_located_objects=[
+            {ObjectEnum.CAR: [_box(20, 20, 60, 60)]},
+            # smaller object partially overlapping the first one, neither touches a seam
+            {ObjectEnum.CAR: [_box(40, 40, 70, 70), _box(20, 20, 60, 60, confidence=85)]},
+        ]
+    )
+
+    assert _corners(merged[ObjectEnum.CAR]) == [(20, 20, 60, 60), (40, 40, 70, 70)]
+
+
+def test_duplicates_from_overlapping_tiles_are_suppressed():
+    frame_tiler = FrameTiler(tile_size=110)
+
+    merged = frame_tiler.merge(
+        regions=[_LEFT_TILE, _RIGHT_TILE],
+        grouped_located_objects=[
+            {ObjectEnum.CAR: [_box(92, 40, 106, 60, confidence=70)]},
+            {ObjectEnum.CAR: [_box(3, 41, 17, 61, confidence=90)]},
+        ]
+    )
+
+    assert _corners(merged[ObjectEnum.CAR]) == [(93, 41, 107, 61)]
+
+
+def test_frame_edges_do_not_count_as_seams():
+    frame_tiler = FrameTiler(tile_size=110)
+
+    merged = frame_tiler.merge(
+        regions=[_WHOLE_FRAME, _RIGHT_TILE],
+        grouped_located_objects=[
+            {ObjectEnum.CAR: [_box(150, 40, 200, 60)]},
+            # boxes at the right frame edge, object on the tile is a different, smaller one
+            {ObjectEnum.CAR: [_box(80, 30, 110, 70, confidence=85)]},
+        ]
+    )
+
+    assert _corners(merged[ObjectEnum.CAR]) == [(150, 40, 200, 60), (170, 30, 200, 70)]
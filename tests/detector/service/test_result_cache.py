@@ -0,0 +1,87 @@
+from asyncio import run
+from uuid import uuid4
+
+import pytest
+
+from detector.service import ResultCache
+from detector.model.enum import ObjectEnum
+from detector.model.dto import ObjectBoundingBoxDto, PixelCoordinateDto
+from detector.model.api import ObjectAnalysisConfigResponse, ImageResolution
+
+
+@pytest.fixture
+def object_analysis_config() -> ObjectAnalysisConfigResponse:
+    return ObjectAnalysisConfigResponse(
+        id=uuid4(),
+        image_resolution=ImageResolution(width=1920, height=1080),
+        example_image_id=uuid4(),
+        objects=[ObjectEnum.CAR],
+    )
+
+
+@pytest.fixture
+def grouped_located_objects() -> dict[ObjectEnum, list[ObjectBoundingBoxDto]]:
+    return {
+        ObjectEnum.CAR: [
+            ObjectBoundingBoxDto(
+                object_type=ObjectEnum.CAR,
+                confidence=90,
+                top_left=PixelCoordinateDto(width=10, height=20),
+                bottom_right=PixelCoordinateDto(width=110, height=80)
+            )
+        ],
+        ObjectEnum.BUS: [],
+    }
+
+
+def test_results_are_read_from_memory(object_analysis_config, grouped_located_objects):
+    result_cache = ResultCache(model_id="model")
+    run(result_cache.put(content_hash="hash", object_analysis_config=object_analysis_config, grouped_located_objects=grouped_located_objects))
+
+    cached = run(result_cache.get(content_hash="hash", object_analysis_config=object_analysis_config))
+
+    assert cached == grouped_located_objects
+    assert run(result_cache.get(content_hash="other", object_analysis_config=object_analysis_config)) is None
+
+
+def test_results_are_written_through_to_disk(tmp_path, object_analysis_config, grouped_located_objects):
+    result_cache = ResultCache(model_id="model", disk_directory=str(tmp_path))
+
+    run(result_cache.put(content_hash="hash", object_analysis_config=object_analysis_config, grouped_located_objects=grouped_located_objects))
+
+    assert len(list(tmp_path.glob("*.json"))) == 1
+    assert not list(tmp_path.glob("*.tmp"))
+    assert result_cache.get_disk_metrics().entries == 1
+
+
+def test_results_are_read_through_from_disk(tmp_path, object_analysis_config, grouped_located_objects):
+    writer = ResultCache(model_id="model", disk_directory=str(tmp_path))
+    run(writer.put(content_hash="hash", object_analysis_config=object_analysis_config, grouped_located_objects=grouped_located_objects))
+    # another worker (or restarted service) shares only the disk tier
+    reader = ResultCache(model_id="model", disk_directory=str(tmp_path))
+
+    cached = run(reader.get(content_hash="hash", object_analysis_config=object_analysis_config))
+
+    assert cached == grouped_located_objects
+    assert reader.get_disk_metrics().hits == 1
+    # entry read from disk is promoted to memory tier
+    run(reader.get(content_hash="hash", object_analysis_config=object_analysis_config))
+    assert reader.get_disk_metrics().hits == 1
+    assert reader.get_metrics().hits == 1
+
+
+def test_results_of_other_model_are_not_reused(tmp_path, object_analysis_config, grouped_located_objects):
+    writer = ResultCache(model_id="model", disk_directory=str(tmp_path))
+    run(writer.put(content_hash="hash", object_analysis_config=object_analysis_config, grouped_located_objects=grouped_located_objects))
+    reader = ResultCache(model_id="other-model", disk_directory=str(tmp_path))
+
+    assert run(reader.get(content_hash="hash", object_analysis_config=object_analysis_config)) is None
+
+
+def test_expired_disk_entries_are_not_read(tmp_path, object_analysis_config, grouped_located_objects):
+    writer = ResultCache(model_id="model", ttl=-1.0, disk_directory=str(tmp_path))
+    run(writer.put(content_hash="hash", object_analysis_config=object_analysis_config, grouped_located_objects=grouped_located_objects))
+    reader = ResultCache(model_id="model", ttl=-1.0, disk_directory=str(tmp_path))
+
+    assert run(reader.get(content_hash="hash", object_analysis_config=object_analysis_config)) is None
+    assert not list(tmp_path.glob("*.json"))
@@ -0,0 +1,157 @@
+from numpy import array, float64
+from numpy.testing import assert_allclose
+
+from detector.tracker import ObjectTracker
+from detector.tracker.kalman_filter import KalmanFilter
+from detector.model.enum import ObjectEnum, TrackEventEnum
+from detector.model.dto import ObjectBoundingBoxDto, PixelCoordinateDto
+
+
+def _box(left: int, top: int, confidence: int = 90, size: int = 40) -> ObjectBoundingBoxDto:
+    return ObjectBoundingBoxDto(
+        object_type=ObjectEnum.CAR,
+        confidence=confidence,
+        top_left=PixelCoordinateDto(width=left, height=top),
+        bottom_right=PixelCoordinateDto(width=left + size, height=top + size)
+    )
+
+
+def _tracker(**kwargs) -> ObjectTracker:
+    return ObjectTracker(objects=[ObjectEnum.CAR], high_confidence=0.5, **kwargs)
+
+
+def test_track_is_confirmed_after_min_hits():
+    object_tracker = _tracker(min_hits=3)
+
+    first = object_tracker.update({ObjectEnum.CAR: [_box(100, 100)]})
+    second = object_tracker.update({ObjectEnum.CAR: [_box(104, 100)]})
+    third = object_tracker.update({ObjectEnum.CAR: [_box(108, 100)]})
+
+    assert first.tracks == [] and first.events == []
+    assert second.tracks == [] and second.events == []
+    assert [tracked_object.track_id for tracked_object in third.tracks] == [1]
+    assert [(event.event, event.track_id) for event in third.events] == [(TrackEventEnum.ENTRY, 1)]
+    assert third.unique_counts == {ObjectEnum.CAR: 1}
+
+
+def test_track_id_persists_while_object_moves():
+    object_tracker = _tracker(min_hits=1)
+
+    track_ids = [
+        [tracked_object.track_id for tracked_object in object_tracker.update({ObjectEnum.CAR: [_box(100 + 5 * frame, 100)]}).tracks]
+        for frame in range(10)
+    ]
+
+    assert track_ids == [[1]] * 10
+    assert object_tracker.update({ObjectEnum.CAR: []}).unique_counts == {ObjectEnum.CAR: 1}
+
+
+def test_separate_objects_get_separate_track_ids():
+    object_tracker = _tracker(min_hits=1)
+
+    for frame in range(3):
+        result = object_tracker.update({ObjectEnum.CAR: [_box(100 + 5 * frame, 100), _box(400 - 5 * frame, 300)]})
+
+    assert {tracked_object.track_id for tracked_object in result.tracks} == {1, 2}
+    by_position = {tracked_object.bounding_box.top_left.width: tracked_object.track_id for tracked_object in result.tracks}
+    assert by_position == {110: 1, 390: 2}
+
+
+def test_unconfirmed_track_is_dropped_on_first_miss():
+    object_tracker = _tracker(min_hits=2)
+
+    object_tracker.update({ObjectEnum.CAR: [_box(100, 100)]})
+    object_tracker.update({ObjectEnum.CAR: []})
+    result = object_tracker.update({ObjectEnum.CAR: [_box(100, 100)]})
+
+    assert result.events == []
+    assert result.unique_counts == {ObjectEnum.CAR: 0}
+
+
+def test_track_exits_after_max_lost_frames():
+    object_tracker = _tracker(min_hits=1, max_lost=3)
+    object_tracker.update({ObjectEnum.CAR: [_box(100, 100)]})
+
+    results = [object_tracker.update({ObjectEnum.CAR: []}) for _ in range(4)]
+
+    assert [result.events for result in results[:3]] == [[], [], []]
+    assert all(result.tracks == [] for result in results)
+    assert [(event.event, event.track_id) for event in results[3].events] == [(TrackEventEnum.EXIT, 1)]
+
+
+def test_lost_track_is_recovered_by_confident_detection():
+    object_tracker = _tracker(min_hits=1, max_lost=5)
+    object_tracker.update({ObjectEnum.CAR: [_box(100, 100)]})
+    object_tracker.update({ObjectEnum.CAR: []})
+    object_tracker.update({ObjectEnum.CAR: []})
+
+    result = object_tracker.update({ObjectEnum.CAR: [_box(100, 100)]})
+
+    assert [tracked_object.track_id for tracked_object in result.tracks] == [1]
+    assert result.events == []
+    assert result.unique_counts == {ObjectEnum.CAR: 1}
+
+
+def test_low_confidence_detections_extend_existing_track():
+    object_tracker = _tracker(min_hits=1, max_lost=1)
+    object_tracker.update({ObjectEnum.CAR: [_box(100, 100, confidence=90)]})
+
+    # object is occluded, detector is less sure about it for longer than track could be lost
+    results = [object_tracker.update({ObjectEnum.CAR: [_box(100, 100, confidence=30)]}) for _ in range(5)]
+
+    assert [[tracked_object.track_id for tracked_object in result.tracks] for result in results] == [[1]] * 5
+    assert all(result.events == [] for result in results)
+
+
+def test_low_confidence_detections_do_not_start_tracks():
+    object_tracker = _tracker(min_hits=1)
+
+    results = [object_tracker.update({ObjectEnum.CAR: [_box(100, 100, confidence=30)]}) for _ in range(3)]
+
+    assert all(result.tracks == [] and result.events == [] for result in results)
+
+
+def test_detections_below_low_confidence_are_ignored():
+    object_tracker = _tracker(min_hits=1, max_lost=1, low_confidence=0.2)
+    object_tracker.update({ObjectEnum.CAR: [_box(100, 100, confidence=90)]})
+
+    object_tracker.update({ObjectEnum.CAR: [_box(100, 100, confidence=10)]})
+    result = object_tracker.update({ObjectEnum.CAR: [_box(100, 100, confidence=10)]})
+
+    assert [(event.event, event.track_id) for event in result.events] == [(TrackEventEnum.EXIT, 1)]
+
+
+def test_propagate_moves_tracks_to_predicted_position():
+    object_tracker = _tracker(min_hits=1)
+    for frame in range(10):
+        object_tracker.update({ObjectEnum.CAR: [_box(100 + 10 * frame, 100)]})
+
+    result = object_tracker.propagate()
+
+    assert [tracked_object.track_id for tracked_object in result.tracks] == [1]
+    # object kept moving right by 10 pixels per frame
+    assert 195 <= result.tracks[0].bounding_box.top_left.width <= 205
+
+
+def test_kalman_filter_follows_constant_velocity():
+    kalman_filter = KalmanFilter()
+    mean, covariance = kalman_filter.initiate(array([100, 100, 40, 40], dtype=float64))
+    for frame in range(1, 20):
+        mean, covariance = kalman_filter.predict(mean, covariance)
+        mean, covariance = kalman_filter.update(mean, covariance, array([100 + 10 * frame, 100, 40, 40], dtype=float64))
+
+    mean, _ = kalman_filter.predict(mean, covariance)
+
+    # last measurement was at 290, object is expected one step further
+    assert_allclose(mean[:4], [300, 100, 40, 40], atol=1.0)
+    assert_allclose(mean[4:6], [10, 0], atol=0.5)
+
+
+def test_kalman_filter_update_reduces_uncertainty():
+    kalman_filter = KalmanFilter()
+    mean, covariance = kalman_filter.initiate(array([100, 100, 40, 40], dtype=float64))
+    predicted_mean, predicted_covariance = kalman_filter.predict(mean, covariance)
+
+    _, updated_covariance = kalman_filter.update(predicted_mean, predicted_covariance, array([100, 100, 40, 40], dtype=float64))
+
+    assert (updated_covariance.diagonal()[:4] < predicted_covariance.diagonal()[:4]).all()